@@ -0,0 +1,46 @@
+"""add translation memory table
+
+Revision ID: 3c9a7e1d2b64
+Revises: f8455d46f521
+Create Date: 2026-10-19 10:12:41.503117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9a7e1d2b64'
+down_revision: Union[str, Sequence[str], None] = 'f8455d46f521'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'translation_memory',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('source_hash', sa.String(length=64), nullable=False),
+        sa.Column('source_lang', sa.String(length=20), nullable=False),
+        sa.Column('target_lang', sa.String(length=20), nullable=False),
+        sa.Column('source_text', sa.Text(), nullable=False),
+        sa.Column('translated_text', sa.Text(), nullable=False),
+        sa.Column('hit_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_translation_memory_key', 'translation_memory',
+        ['source_hash', 'source_lang', 'target_lang'], unique=True,
+    )
+    op.create_index('ix_translation_memory_hit_count', 'translation_memory', ['hit_count'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_translation_memory_hit_count', table_name='translation_memory')
+    op.drop_index('ix_translation_memory_key', table_name='translation_memory')
+    op.drop_table('translation_memory')
@@ -0,0 +1,51 @@
+"""add dental exams table
+
+Revision ID: 9d2e6f4a1c87
+Revises: 3c9a7e1d2b64
+Create Date: 2026-10-19 14:03:27.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d2e6f4a1c87'
+down_revision: Union[str, Sequence[str], None] = '3c9a7e1d2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'dental_exams',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('patient_id', sa.String(length=100), nullable=False),
+        sa.Column('clinic_id', sa.String(length=100), nullable=True),
+        sa.Column('exam_date', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('pd', sa.ARRAY(sa.SmallInteger()), nullable=False),
+        sa.Column('cal', sa.ARRAY(sa.SmallInteger()), nullable=False),
+        sa.Column('recession', sa.ARRAY(sa.SmallInteger()), nullable=False),
+        sa.Column('bop', sa.ARRAY(sa.SmallInteger()), nullable=False),
+        sa.Column('bop_recorded', sa.ARRAY(sa.SmallInteger()), nullable=False),
+        sa.Column('mobility', sa.ARRAY(sa.SmallInteger()), nullable=False),
+        sa.Column('furcation', sa.ARRAY(sa.SmallInteger()), nullable=False),
+        sa.Column('plaque', sa.ARRAY(sa.SmallInteger()), nullable=False),
+        sa.Column('calculus', sa.ARRAY(sa.SmallInteger()), nullable=False),
+        sa.Column('present', sa.ARRAY(sa.Boolean()), nullable=False),
+        sa.Column('raw_transcription', sa.Text(), server_default='', nullable=False),
+        sa.Column('extraction_notes', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_dental_exams_patient_date', 'dental_exams', ['patient_id', 'exam_date'], unique=False)
+    op.create_index('ix_dental_exams_clinic_date', 'dental_exams', ['clinic_id', 'exam_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_dental_exams_clinic_date', table_name='dental_exams')
+    op.drop_index('ix_dental_exams_patient_date', table_name='dental_exams')
+    op.drop_table('dental_exams')
@@ -0,0 +1,130 @@
+"""
+Benchmark single-request vs chunked LLM extraction on full-mouth dictations.
+
+Generates synthetic full-mouth periodontal dictations (32 teeth, 6 sites, in
+English, German and Czech) with known values, then extracts each one with a
+single LLM request and with concurrent chunked requests. Reports latency and
+the share of dictated values extracted correctly. Rule-based extraction is
+bypassed so that every tooth goes through the LLM.
+
+Usage (requires AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_KEY):
+    python -m scripts.benchmark_dental_extraction
+"""
+
+import asyncio
+import random
+import statistics
+import time
+
+from src.apps.dental.data_models import BUCCAL_SITES, LINGUAL_SITES, VALID_TOOTH_NUMBERS, PeriodontalExam
+from src.apps.dental.services.extraction import chunk_transcription, extract_with_llm_chunked
+
+CHUNK_SIZES = (0, 8, 4)
+RUNS_PER_LANGUAGE = 2
+# First tooth of each quadrant in dictation order
+_QUADRANT_STARTS = (18, 21, 38, 41)
+
+_WORDS = {
+    "en": {
+        "tooth": "Tooth", "depths": "probing depths", "buccal": "buccal", "lingual": "lingual",
+        "bleeding": "bleeding at", "no_bleeding": "no bleeding", "recession": "recession {} millimeters buccal",
+        "mobility": "mobility grade {}", "sites": {"mesio_buccal": "mesio-buccal", "disto_buccal": "disto-buccal",
+                                                   "mesio_lingual": "mesio-lingual", "disto_lingual": "disto-lingual"},
+        "and": "and", "quadrant": "Quadrant {}.",
+    },
+    "de": {
+        "tooth": "Zahn", "depths": "Sondierungstiefen", "buccal": "bukkal", "lingual": "lingual",
+        "bleeding": "Blutung", "no_bleeding": "keine Blutung", "recession": "Rezession {} Millimeter bukkal",
+        "mobility": "Lockerungsgrad {}", "sites": {"mesio_buccal": "mesio-bukkal", "disto_buccal": "disto-bukkal",
+                                                   "mesio_lingual": "mesio-lingual", "disto_lingual": "disto-lingual"},
+        "and": "und", "quadrant": "Quadrant {}.",
+    },
+    "cs": {
+        "tooth": "Zub", "depths": "hloubky sondáže", "buccal": "bukálně", "lingual": "lingválně",
+        "bleeding": "krvácení", "no_bleeding": "bez krvácení",
+        "recession": "recese {} milimetry bukálně", "mobility": "pohyblivost stupeň {}",
+        "sites": {"mesio_buccal": "meziobukálně", "disto_buccal": "distobukálně",
+                  "mesio_lingual": "meziolingválně", "disto_lingual": "distolingválně"},
+        "and": "a", "quadrant": "Kvadrant {}.",
+    },
+}
+
+
+def synthetic_dictation(language: str, rng: random.Random) -> tuple[str, dict]:
+    """Return a full-mouth dictation and the values it dictates, keyed by (tooth, site, field)."""
+    words = _WORDS[language]
+    expected: dict[tuple, object] = {}
+    sentences = []
+    for tooth in VALID_TOOTH_NUMBERS:
+        if tooth in _QUADRANT_STARTS:
+            sentences.append(words["quadrant"].format(tooth // 10))
+        depths = [rng.choice((2, 3, 3, 3, 4, 5, 6)) for _ in range(6)]
+        for site, depth in zip((*BUCCAL_SITES, *LINGUAL_SITES), depths):
+            expected[(tooth, site, "pd")] = depth
+        parts = [
+            f"{words['tooth']} {tooth}",
+            f"{words['depths']} {'-'.join(map(str, depths[:3]))} {words['buccal']}",
+            f"{'-'.join(map(str, depths[3:]))} {words['lingual']}",
+        ]
+        bleeding = [site for site in words["sites"] if rng.random() < 0.25]
+        if bleeding:
+            parts.append(f"{words['bleeding']} " + f" {words['and']} ".join(words["sites"][s] for s in bleeding))
+            for site in (*BUCCAL_SITES, *LINGUAL_SITES):
+                expected[(tooth, site, "bop")] = site in bleeding
+        elif rng.random() < 0.5:
+            parts.append(words["no_bleeding"])
+            for site in (*BUCCAL_SITES, *LINGUAL_SITES):
+                expected[(tooth, site, "bop")] = False
+        if rng.random() < 0.2:
+            recession = rng.randint(1, 3)
+            parts.append(words["recession"].format(recession))
+            for site in BUCCAL_SITES:
+                expected[(tooth, site, "recession")] = recession
+        if rng.random() < 0.15:
+            mobility = rng.randint(1, 2)
+            parts.append(words["mobility"].format(mobility))
+            expected[(tooth, None, "mobility")] = mobility
+        sentences.append(", ".join(parts) + ".")
+    return " ".join(sentences), expected
+
+
+def accuracy(exam: PeriodontalExam, expected: dict) -> float:
+    """Share of dictated values the exam reproduces."""
+    correct = 0
+    for (tooth, site, field), value in expected.items():
+        data = exam.teeth.get(str(tooth))
+        if data is None:
+            continue
+        target = data.sites.get(site) if site else data
+        if target is not None and getattr(target, field) == value:
+            correct += 1
+    return correct / len(expected)
+
+
+async def benchmark() -> None:
+    """Print latency and accuracy per chunk size."""
+    rng = random.Random(42)
+    dictations = [
+        (language, *synthetic_dictation(language, rng))
+        for language in _WORDS
+        for _ in range(RUNS_PER_LANGUAGE)
+    ]
+    print(f"{len(dictations)} dictations, {statistics.mean(len(d[1]) for d in dictations):.0f} chars on average")
+    print(f"{'teeth/chunk':>11} {'requests':>9} {'mean s':>8} {'max s':>8} {'accuracy':>9}")
+
+    for teeth_per_chunk in CHUNK_SIZES:
+        latencies, scores = [], []
+        for _, text, expected in dictations:
+            started = time.perf_counter()
+            exam = await extract_with_llm_chunked(text, teeth_per_chunk)
+            latencies.append(time.perf_counter() - started)
+            scores.append(accuracy(exam, expected))
+        requests = len(chunk_transcription(dictations[0][1], teeth_per_chunk)) if teeth_per_chunk else 1
+        print(
+            f"{teeth_per_chunk or 'all':>11} {requests:>9} {statistics.mean(latencies):>8.2f} "
+            f"{max(latencies):>8.2f} {statistics.mean(scores):>9.1%}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(benchmark())
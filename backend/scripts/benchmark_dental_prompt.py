@@ -0,0 +1,74 @@
+"""
+Compare dental extraction prompt versions on the same dictations.
+
+Runs every dictation (the example dictations of each language plus synthetic
+full-mouth dictations) through each prompt version in a single LLM request and
+reports prompt/completion tokens and latency, plus accuracy on the synthetic
+dictations, whose values are known.
+
+Usage (requires AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_KEY):
+    python -m scripts.benchmark_dental_prompt
+"""
+
+import asyncio
+import random
+import statistics
+import time
+
+from scripts.benchmark_dental_extraction import accuracy, synthetic_dictation
+from src.apps.dental.languages import LANGUAGES
+from src.apps.dental.services.extraction import OUTPUT_TYPES, extraction_messages, parse_extraction_response
+from src.settings import DentalPromptVersion, get_settings
+from src.shared.azure_openai import get_async_openai_client
+from src.shared.structured_output import response_format
+
+FULL_MOUTH_PER_LANGUAGE = 1
+
+
+async def run_version(prompt_version: DentalPromptVersion, dictations: list[tuple[str, dict | None]]) -> dict:
+    """Extract every dictation with one prompt version and collect usage and timing."""
+    client = get_async_openai_client()
+    prompt_tokens, completion_tokens, latencies, scores = [], [], [], []
+    for text, expected in dictations:
+        started = time.perf_counter()
+        response = await client.chat.completions.create(
+            model=get_settings().AZURE_OPENAI_DEPLOYMENT,
+            messages=extraction_messages(text, prompt_version),
+            response_format=response_format(OUTPUT_TYPES[prompt_version]),
+        )
+        latencies.append(time.perf_counter() - started)
+        prompt_tokens.append(response.usage.prompt_tokens)
+        completion_tokens.append(response.usage.completion_tokens)
+        exam = parse_extraction_response(response.choices[0].message.content, text, prompt_version)
+        if expected is not None:
+            scores.append(accuracy(exam, expected))
+    return {
+        "prompt": statistics.mean(prompt_tokens),
+        "completion": statistics.mean(completion_tokens),
+        "mean_s": statistics.mean(latencies),
+        "max_s": max(latencies),
+        "accuracy": statistics.mean(scores) if scores else None,
+    }
+
+
+async def benchmark() -> None:
+    """Print token usage, latency and accuracy per prompt version."""
+    rng = random.Random(7)
+    dictations: list[tuple[str, dict | None]] = [(info["example_dictation"], None) for info in LANGUAGES.values()]
+    dictations += [
+        synthetic_dictation(language, rng)
+        for language in ("en", "de", "cs")
+        for _ in range(FULL_MOUTH_PER_LANGUAGE)
+    ]
+    print(f"{len(dictations)} dictations")
+    print(f"{'version':<8} {'prompt tok':>10} {'output tok':>10} {'mean s':>8} {'max s':>8} {'accuracy':>9}")
+    for prompt_version in DentalPromptVersion:
+        result = await run_version(prompt_version, dictations)
+        print(
+            f"{prompt_version:<8} {result['prompt']:>10.0f} {result['completion']:>10.0f} "
+            f"{result['mean_s']:>8.2f} {result['max_s']:>8.2f} {result['accuracy']:>9.1%}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(benchmark())
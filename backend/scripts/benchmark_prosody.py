@@ -0,0 +1,88 @@
+"""
+Benchmark prosody feature extraction against its budget of 50 ms per minute of audio.
+
+Synthesizes speech-like 16 kHz PCM (harmonic voiced segments with a known
+pitch contour and jitter, separated by pauses of known length), feeds it to
+ProsodyAnalyzer in the chunks the STT pipeline produces, and reports the
+time per minute of audio along with the estimated vs true F0 and pause ratio.
+
+Usage:
+    python -m scripts.benchmark_prosody
+"""
+
+import statistics
+import time
+
+import numpy as np
+
+from src.apps.psychotherapy.services.prosody import MIN_PAUSE_S, ProsodyAnalyzer
+from src.shared.audio import DEFAULT_BLOCK_SIZE, TARGET_SAMPLE_RATE
+
+BUDGET_MS_PER_MINUTE = 50.0
+DURATIONS_MIN = (1, 5)
+RUNS = 5
+HARMONICS = 12
+
+
+def synthetic_speech(minutes: float, f0: float, rng: np.random.Generator) -> tuple[bytes, float, float]:
+    """Return PCM, the true mean F0 and the true pause ratio."""
+    pieces, speech_s, pause_s, f0_values = [], 0.0, 0.0, []
+    total = minutes * 60
+    while speech_s + pause_s < total:
+        length = rng.uniform(1.5, 4.0)
+        t = np.arange(int(length * TARGET_SAMPLE_RATE)) / TARGET_SAMPLE_RATE
+        # Slow intonation, 1% period jitter held for ~one period
+        contour = f0 * (1 + 0.08 * np.sin(2 * np.pi * 0.4 * t + rng.uniform(0, 6)))
+        jitter = np.repeat(rng.normal(1, 0.01, len(t) // 80 + 1), 80)[:len(t)]
+        frequency = contour * jitter
+        phase = 2 * np.pi * np.cumsum(frequency) / TARGET_SAMPLE_RATE
+        voice = sum(np.sin(k * phase) / k for k in range(1, HARMONICS + 1))
+        syllables = 0.6 + 0.4 * np.abs(np.sin(2 * np.pi * 2.2 * t))
+        pieces.append(0.15 * voice * syllables)
+        speech_s += length
+        f0_values.append(frequency)
+
+        pause = rng.uniform(0.3, 1.2)
+        pieces.append(rng.normal(0, 0.0005, int(pause * TARGET_SAMPLE_RATE)))
+        pause_s += pause
+
+    # The trailing pause is outside the speaking time
+    speaking_s = speech_s + pause_s - pause
+    pcm = np.clip(np.concatenate(pieces) * 32768, -32768, 32767).astype("<i2").tobytes()
+    return pcm, float(np.concatenate(f0_values).mean()), (pause_s - pause) / speaking_s
+
+
+def run(pcm: bytes) -> tuple[float, ProsodyAnalyzer]:
+    started = time.perf_counter()
+    analyzer = ProsodyAnalyzer()
+    for start in range(0, len(pcm), DEFAULT_BLOCK_SIZE):
+        analyzer.feed(pcm[start:start + DEFAULT_BLOCK_SIZE])
+    features = analyzer.features(word_count=100)
+    return time.perf_counter() - started, features
+
+
+def benchmark() -> None:
+    """Print time per minute of audio and feature accuracy."""
+    rng = np.random.default_rng(11)
+    print(f"{'audio':>7} {'f0':>5} {'ms/min':>8} {'f0 est':>7} {'pauses':>7} {'est':>7} {'jitter %':>9}")
+    worst = 0.0
+    for minutes in DURATIONS_MIN:
+        for f0 in (110.0, 210.0):
+            pcm, true_f0, true_pauses = synthetic_speech(minutes, f0, rng)
+            timings = []
+            for _ in range(RUNS):
+                elapsed, features = run(pcm)
+                timings.append(elapsed)
+            ms_per_minute = 1000 * statistics.median(timings) / (len(pcm) / 2 / TARGET_SAMPLE_RATE / 60)
+            worst = max(worst, ms_per_minute)
+            print(
+                f"{minutes:>5} m {f0:>5.0f} {ms_per_minute:>8.1f} {features.f0_mean_hz:>7.1f} "
+                f"{true_pauses:>7.3f} {features.pause_ratio:>7.3f} {features.jitter_percent:>9.2f}"
+            )
+    verdict = "within" if worst < BUDGET_MS_PER_MINUTE else "OVER"
+    print(f"worst {worst:.1f} ms per minute of audio: {verdict} the {BUDGET_MS_PER_MINUTE:.0f} ms budget "
+          f"(pauses >= {MIN_PAUSE_S} s)")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,92 @@
+"""
+Compare transport response payloads across TTS formats and delivery modes.
+
+Synthesizes three sentences with Azure TTS in every output format, then
+measures the response size and serialization/deserialization time of
+base64-in-JSON, audio URLs and multipart/mixed binary parts.
+
+Usage (requires AZURE_SPEECH_KEY):
+    python -m scripts.compare_transport_payloads
+"""
+
+import time
+import uuid
+
+import msgspec
+
+from src.apps.transport.schemas import LanguageResult, TranslationResponse
+from src.settings import TTSOutputFormat
+from src.shared.azure_tts import AUDIO_MIME_TYPES, audio_to_base64, synthesize_speech
+
+SENTENCES = [
+    ("en-US", "en-US-JennyNeural", "Next stop: Central Station. Change here for lines A and C."),
+    ("de-DE", "de-DE-KatjaNeural", "Nächste Haltestelle: Hauptbahnhof. Umsteigen zu den Linien A und C."),
+    ("fr-FR", "fr-FR-DeniseNeural", "Prochain arrêt : Gare centrale. Correspondance pour les lignes A et C."),
+]
+KEYS = ("original", "translation_1", "translation_2")
+ROUNDS = 200
+
+
+def _timed(func, rounds: int = ROUNDS) -> float:
+    """Average milliseconds per call."""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - started) * 1000 / rounds
+
+
+def _response(clips: list[bytes], mime_type: str, mode: str) -> TranslationResponse:
+    return TranslationResponse(**{
+        key: LanguageResult(
+            locale=locale,
+            text=text,
+            audio_base64=audio_to_base64(audio) if mode == "base64" else None,
+            audio_url=f"/api/transport/audio/x/{uuid.uuid4().hex * 2}" if mode == "url" else None,
+            audio_mime_type=mime_type,
+        )
+        for key, (locale, _, text), audio in zip(KEYS, SENTENCES, clips)
+    })
+
+
+def _multipart(clips: list[bytes], mime_type: str) -> bytes:
+    boundary = uuid.uuid4().hex
+    parts = [
+        f"--{boundary}\r\nContent-Type: application/json\r\n\r\n".encode(),
+        msgspec.json.encode(_response(clips, mime_type, "multipart")),
+    ]
+    for key, audio in zip(KEYS, clips):
+        parts.append(
+            f"\r\n--{boundary}\r\nContent-Type: {mime_type}\r\n"
+            f"Content-ID: <{key}>\r\nContent-Length: {len(audio)}\r\n\r\n".encode()
+        )
+        parts.append(audio)
+    parts.append(f"\r\n--{boundary}--\r\n".encode())
+    return b"".join(parts)
+
+
+def compare_payloads() -> None:
+    """Print payload size and encode/decode time per format and delivery mode."""
+    print(f"{'format':<6} {'mode':<10} {'audio KB':>9} {'payload KB':>11} {'encode ms':>10} {'decode ms':>10}")
+    for output_format in TTSOutputFormat:
+        clips = [synthesize_speech(text, voice, output_format) for _, voice, text in SENTENCES]
+        mime_type = AUDIO_MIME_TYPES[output_format]
+        audio_kb = sum(map(len, clips)) / 1024
+
+        for mode in ("base64", "url"):
+            encode = lambda: msgspec.json.encode(_response(clips, mime_type, mode))
+            payload = encode()
+            decode = lambda: msgspec.json.decode(payload, type=TranslationResponse)
+            print(
+                f"{output_format:<6} {mode:<10} {audio_kb:>9.1f} {len(payload) / 1024:>11.1f} "
+                f"{_timed(encode):>10.3f} {_timed(decode):>10.3f}"
+            )
+
+        payload = _multipart(clips, mime_type)
+        print(
+            f"{output_format:<6} {'multipart':<10} {audio_kb:>9.1f} {len(payload) / 1024:>11.1f} "
+            f"{_timed(lambda: _multipart(clips, mime_type)):>10.3f} {'-':>10}"
+        )
+
+
+if __name__ == "__main__":
+    compare_payloads()
@@ -11,10 +11,16 @@ from src.apps.mcdonalds.routes.audio_ws import AudioWSListener
 from src.apps.mcdonalds.routes.menu import MenuController
 from src.apps.mcdonalds.services.embeddings import get_embedding_model
 from src.apps.mcdonalds.services.reranker import get_reranker_model
+from src.apps.transport.routes.interpreter_ws import InterpreterWSListener
 from src.apps.transport.routes.translate import TranslateController
 from src.apps.dental.routes.dictation import DictationController
+from src.apps.dental.routes.exams import ExamController
 from src.apps.psychotherapy.routes.analysis import AnalysisController
 from src.settings import get_settings
+from src.shared.azure_translator import close_translator_client
+from src.shared.jobs import close_job_queue
+from src.shared.translation_memory import flush_translation_memory, preload_translation_memory
+from src.shared.stt import close_streaming_resources
 
 logger = logging.getLogger(__name__)
 
@@ -61,8 +67,10 @@ app = Litestar(
         AudioWSListener,
         # Transport
         TranslateController,
+        InterpreterWSListener,
         # Dental
         DictationController,
+        ExamController,
         # Psychotherapy
         AnalysisController,
     ],
@@ -73,6 +81,7 @@ app = Litestar(
             path="/static",
         )
     ],
-    on_startup=[preload_models],
+    on_startup=[preload_models, preload_translation_memory],
+    on_shutdown=[close_streaming_resources, close_translator_client, flush_translation_memory, close_job_queue],
     debug=True,
 )
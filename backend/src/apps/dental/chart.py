@@ -0,0 +1,291 @@
+"""
+Array-backed periodontal chart with vectorized clinical statistics.
+
+An exam becomes a fixed grid of 32 teeth (VALID_TOOTH_NUMBERS order, i.e. four
+quadrants of eight) by 6 sites (SITE_ORDER), so statistics are computed with
+NumPy instead of loops over ToothData and SiteMeasurement Structs.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.apps.dental.data_models import (
+    SITE_ORDER,
+    VALID_TOOTH_NUMBERS,
+    PeriodontalExam,
+    SiteMeasurement,
+    ToothData,
+)
+
+MISSING = -1
+TOOTH_INDEX = {tooth: index for index, tooth in enumerate(VALID_TOOTH_NUMBERS)}
+N_TEETH = len(VALID_TOOTH_NUMBERS)
+N_SITES = len(SITE_ORDER)
+N_QUADRANTS = 4
+
+_SITE_BITS = (1 << np.arange(N_SITES)).astype(np.uint8)
+# Mesial and distal sites; staging uses interdental attachment loss
+_INTERDENTAL = np.array([not site.startswith("mid") for site in SITE_ORDER])
+_SITE_FIELDS = ("pd", "cal", "recession")
+_TOOTH_FIELDS = ("mobility", "furcation", "plaque", "calculus")
+_BOOL_FIELDS = ("plaque", "calculus")
+# Array fields in storage order (see DentalExamRecord)
+ARRAY_FIELDS = (
+    "pd", "cal", "recession", "bop", "bop_recorded",
+    "mobility", "furcation", "plaque", "calculus", "present",
+)
+# PD or CAL increase (mm) at a site that counts as progression
+PROGRESSION_MM = 2
+
+
+@dataclass
+class PeriodontalChart:
+    """Compact PeriodontalExam: int8 arrays with MISSING (-1) for values not recorded.
+
+    pd, cal and recession are (32, 6). bop and bop_recorded are per-tooth
+    bitmasks with bit i for site i of SITE_ORDER: bleeding, and a BOP value
+    recorded at all (so False and None stay distinct). mobility, furcation,
+    plaque and calculus are (32,); present marks the teeth in the exam.
+    """
+
+    pd: np.ndarray
+    cal: np.ndarray
+    recession: np.ndarray
+    bop: np.ndarray
+    bop_recorded: np.ndarray
+    mobility: np.ndarray
+    furcation: np.ndarray
+    plaque: np.ndarray
+    calculus: np.ndarray
+    present: np.ndarray
+    raw_transcription: str = ""
+    extraction_notes: str | None = None
+
+    @classmethod
+    def empty(cls, raw_transcription: str = "", extraction_notes: str | None = None) -> "PeriodontalChart":
+        def grid() -> np.ndarray:
+            return np.full((N_TEETH, N_SITES), MISSING, dtype=np.int8)
+
+        def per_tooth() -> np.ndarray:
+            return np.full(N_TEETH, MISSING, dtype=np.int8)
+
+        return cls(
+            pd=grid(),
+            cal=grid(),
+            recession=grid(),
+            bop=np.zeros(N_TEETH, dtype=np.uint8),
+            bop_recorded=np.zeros(N_TEETH, dtype=np.uint8),
+            mobility=per_tooth(),
+            furcation=per_tooth(),
+            plaque=per_tooth(),
+            calculus=per_tooth(),
+            present=np.zeros(N_TEETH, dtype=bool),
+            raw_transcription=raw_transcription,
+            extraction_notes=extraction_notes,
+        )
+
+    @classmethod
+    def from_exam(cls, exam: PeriodontalExam) -> "PeriodontalChart":
+        """
+        Build a chart from a PeriodontalExam.
+
+        Raises:
+            ValueError: If the exam has a tooth outside the 32-tooth permanent dentition
+        """
+        chart = cls.empty(exam.raw_transcription, exam.extraction_notes)
+        for tooth in exam.teeth.values():
+            index = TOOTH_INDEX.get(tooth.tooth_number)
+            if index is None:
+                raise ValueError(f"Tooth {tooth.tooth_number} is not part of the periodontal chart")
+            chart.present[index] = True
+            for site_index, site_name in enumerate(SITE_ORDER):
+                site = tooth.sites.get(site_name)
+                if site is None:
+                    continue
+                for name in _SITE_FIELDS:
+                    value = getattr(site, name)
+                    if value is not None:
+                        getattr(chart, name)[index, site_index] = value
+                if site.bop is not None:
+                    chart.bop_recorded[index] |= _SITE_BITS[site_index]
+                    if site.bop:
+                        chart.bop[index] |= _SITE_BITS[site_index]
+            for name in _TOOTH_FIELDS:
+                value = getattr(tooth, name)
+                if value is not None:
+                    getattr(chart, name)[index] = int(value)
+        return chart
+
+    @classmethod
+    def from_columns(
+        cls,
+        columns: dict[str, list],
+        raw_transcription: str = "",
+        extraction_notes: str | None = None,
+    ) -> "PeriodontalChart":
+        """Rebuild a chart from the flat lists produced by to_columns."""
+        chart = cls.empty(raw_transcription, extraction_notes)
+        for name in ARRAY_FIELDS:
+            template = getattr(chart, name)
+            setattr(chart, name, np.asarray(columns[name], dtype=template.dtype).reshape(template.shape))
+        return chart
+
+    def to_columns(self) -> dict[str, list]:
+        """Flat (row-major) lists of every array field, for storage."""
+        return {name: getattr(self, name).ravel().tolist() for name in ARRAY_FIELDS}
+
+    def to_exam(self) -> PeriodontalExam:
+        """Convert back to a PeriodontalExam (the inverse of from_exam)."""
+        bleeding, bop_recorded = self.bleeding_sites, self.bop_recorded_sites
+        teeth = {}
+        for index in np.flatnonzero(self.present):
+            sites = {}
+            for site_index, site_name in enumerate(SITE_ORDER):
+                values = {
+                    name: _optional(getattr(self, name)[index, site_index]) for name in _SITE_FIELDS
+                }
+                bop = bool(bleeding[index, site_index]) if bop_recorded[index, site_index] else None
+                sites[site_name] = SiteMeasurement(**values, bop=bop)
+            tooth_values = {name: _optional(getattr(self, name)[index]) for name in _TOOTH_FIELDS}
+            for name in _BOOL_FIELDS:
+                if tooth_values[name] is not None:
+                    tooth_values[name] = bool(tooth_values[name])
+            tooth_number = VALID_TOOTH_NUMBERS[index]
+            teeth[str(tooth_number)] = ToothData(tooth_number=tooth_number, sites=sites, **tooth_values)
+
+        return PeriodontalExam(
+            raw_transcription=self.raw_transcription,
+            teeth=teeth,
+            extraction_notes=self.extraction_notes,
+        )
+
+    @property
+    def bleeding_sites(self) -> np.ndarray:
+        """(32, 6) bool: bleeding on probing recorded as positive."""
+        return (self.bop[:, None] & _SITE_BITS) != 0
+
+    @property
+    def bop_recorded_sites(self) -> np.ndarray:
+        """(32, 6) bool: a BOP value (positive or negative) was recorded."""
+        return (self.bop_recorded[:, None] & _SITE_BITS) != 0
+
+
+def _optional(value: np.integer) -> int | None:
+    return None if value == MISSING else int(value)
+
+
+def periodontitis_stage(interdental_cal: np.ndarray, mobility: np.ndarray) -> np.ndarray:
+    """
+    Stage (0 = none, 1-4 = I-IV) from the greatest interdental CAL, element-wise.
+
+    Follows the 2017 AAP/EFP CAL thresholds: 1-2 mm stage I, 3-4 mm stage II,
+    5 mm or more stage III. Tooth loss is not dictated, so stage IV is only
+    assigned from its mobility criterion (grade 2 or more with CAL >= 5 mm).
+    MISSING CAL gives MISSING.
+    """
+    stage = np.select(
+        [interdental_cal < 0, interdental_cal >= 5, interdental_cal >= 3, interdental_cal >= 1],
+        [MISSING, 3, 2, 1],
+        default=0,
+    )
+    return np.where((stage == 3) & (mobility >= 2), 4, stage)
+
+
+_STAGE_NAMES = {1: "I", 2: "II", 3: "III", 4: "IV"}
+
+
+def clinical_summary(chart: PeriodontalChart) -> dict:
+    """
+    Chart-level statistics: BOP %, mean PD, sites >= 5 mm and staging per quadrant.
+
+    Returns:
+        Dict matching the ClinicalSummary response schema
+    """
+    pd_recorded = chart.pd != MISSING
+    bop_recorded = chart.bop_recorded_sites
+    bop_count = int(bop_recorded.sum())
+
+    # Worst interdental CAL and mobility per quadrant: the 32 teeth are 4 quadrants of 8
+    interdental_cal = np.where(_INTERDENTAL, chart.cal, MISSING).max(axis=1)
+    quadrant_cal = interdental_cal.reshape(N_QUADRANTS, -1).max(axis=1)
+    quadrant_mobility = chart.mobility.reshape(N_QUADRANTS, -1).max(axis=1)
+    stages = periodontitis_stage(quadrant_cal, quadrant_mobility)
+    worst = int(stages.max())
+
+    return {
+        "teeth_recorded": int(chart.present.sum()),
+        "sites_recorded": int(pd_recorded.sum()),
+        "bop_percent": round(100 * int(chart.bleeding_sites.sum()) / bop_count, 1) if bop_count else None,
+        "mean_pd": round(float(chart.pd[pd_recorded].mean()), 2) if pd_recorded.any() else None,
+        "sites_pd_5_plus": int((chart.pd >= 5).sum()),
+        "stage": _STAGE_NAMES.get(worst),
+        "quadrants": [
+            {
+                "quadrant": VALID_TOOTH_NUMBERS[index * (N_TEETH // N_QUADRANTS)] // 10,
+                "max_interdental_cal": _optional(quadrant_cal[index]),
+                "stage": _STAGE_NAMES.get(int(stages[index])),
+            }
+            for index in range(N_QUADRANTS)
+        ],
+    }
+
+
+def compare_charts(
+    current: PeriodontalChart,
+    previous: list[PeriodontalChart],
+    threshold: int = PROGRESSION_MM,
+) -> list[dict]:
+    """
+    Per-site PD changes of *current* against each of *previous*, computed for all of them at once.
+
+    A site is compared when both exams recorded its PD. It is progressing when
+    PD or CAL increased by *threshold* mm or more, and improving when PD
+    decreased by that much.
+
+    Returns:
+        One dict per previous chart, in the same order, matching the ExamDelta response schema
+    """
+    if not previous:
+        return []
+    pd_before = np.stack([chart.pd for chart in previous]).astype(np.int16)
+    cal_before = np.stack([chart.cal for chart in previous]).astype(np.int16)
+
+    pd_compared = (pd_before != MISSING) & (current.pd != MISSING)
+    cal_compared = (cal_before != MISSING) & (current.cal != MISSING)
+    pd_delta = np.where(pd_compared, current.pd - pd_before, 0)
+    cal_delta = np.where(cal_compared, current.cal - cal_before, 0)
+    progressing = (pd_compared & (pd_delta >= threshold)) | (cal_compared & (cal_delta >= threshold))
+    improving = pd_compared & (pd_delta <= -threshold)
+
+    sites_compared = pd_compared.sum(axis=(1, 2))
+    mean_change = pd_delta.sum(axis=(1, 2)) / np.maximum(sites_compared, 1)
+    sites_progressing = progressing.sum(axis=(1, 2))
+    sites_improving = improving.sum(axis=(1, 2))
+
+    results = []
+    for index in range(len(previous)):
+        compared, delta = pd_compared[index], pd_delta[index]
+        results.append({
+            "sites_compared": int(sites_compared[index]),
+            "mean_pd_change": round(float(mean_change[index]), 2) if sites_compared[index] else None,
+            "sites_progressing": int(sites_progressing[index]),
+            "sites_improving": int(sites_improving[index]),
+            "pd_delta": {
+                str(VALID_TOOTH_NUMBERS[tooth]): [
+                    int(value) if recorded else None for value, recorded in zip(delta[tooth], compared[tooth])
+                ]
+                for tooth in np.flatnonzero(compared.any(axis=1))
+            },
+            "progressing_sites": [
+                {
+                    "tooth": VALID_TOOTH_NUMBERS[tooth],
+                    "site": SITE_ORDER[site],
+                    "previous_pd": _optional(pd_before[index, tooth, site]),
+                    "current_pd": _optional(current.pd[tooth, site]),
+                    "cal_change": int(cal_delta[index, tooth, site]) if cal_compared[index, tooth, site] else None,
+                }
+                for tooth, site in np.argwhere(progressing[index])
+            ],
+        })
+    return results
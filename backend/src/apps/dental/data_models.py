@@ -63,6 +63,7 @@ SITE_NAMES = {
 
 BUCCAL_SITES = ["mesio_buccal", "mid_buccal", "disto_buccal"]
 LINGUAL_SITES = ["mesio_lingual", "mid_lingual", "disto_lingual"]
+SITE_ORDER = BUCCAL_SITES + LINGUAL_SITES
 
 
 def get_max_pd(tooth: ToothData) -> int | None:
@@ -92,3 +93,33 @@ def get_severity_color(pd: int | None) -> str:
 def has_bleeding(tooth: ToothData) -> bool:
     """Check if any site on the tooth has bleeding on probing."""
     return any(site.bop is True for site in tooth.sites.values())
+
+
+def merge_teeth(teeth: dict[str, ToothData], other: dict[str, ToothData], source: str) -> list[str]:
+    """
+    Merge *other* into *teeth* in place; values already set in *teeth* win.
+
+    Returns a note for every field where *other* disagreed, naming *source*.
+    """
+    conflicts = []
+    for key, incoming in other.items():
+        tooth = teeth.get(key)
+        if tooth is None:
+            teeth[key] = incoming
+            continue
+        pairs = [(None, tooth, incoming, ("mobility", "furcation", "plaque", "calculus"))]
+        pairs += [
+            (name, tooth.sites[name], incoming.sites[name], SiteMeasurement.__struct_fields__)
+            for name in SITE_NAMES if name in incoming.sites and name in tooth.sites
+        ]
+        for site, current, new, fields in pairs:
+            for attr in fields:
+                value, new_value = getattr(current, attr), getattr(new, attr)
+                if new_value is None:
+                    continue
+                if value is None:
+                    setattr(current, attr, new_value)
+                elif value != new_value:
+                    where = f"tooth {key} {site}" if site else f"tooth {key}"
+                    conflicts.append(f"{where} {attr}: kept {value}, {source} gave {new_value}")
+    return conflicts
@@ -6,39 +6,182 @@ import base64
 
 import msgspec
 from litestar import Controller, get, post
+from litestar.exceptions import NotFoundException, ServiceUnavailableException
+from litestar.response import ServerSentEvent
+from litestar.status_codes import HTTP_202_ACCEPTED
 
-from src.shared.azure_stt import transcribe_audio_continuous
+from src.settings import get_settings
+from src.shared.audio import TARGET_FORMAT
+from src.database import TRANSIENT_ERRORS as DB_TRANSIENT_ERRORS
+from src.shared.azure_openai import TRANSIENT_ERRORS as LLM_TRANSIENT_ERRORS
+from src.shared.azure_stt import AzureTransientError, transcribe_audio_continuous
+from src.shared.jobs import Job, JobPriority, JobQueueFullError, Stage, get_job_queue
+from src.shared.transcription_cache import get_transcription_cache, transcribe_cached
 from src.apps.dental.phrase_hints import get_dental_phrases
+from src.apps.dental.chart import PeriodontalChart, clinical_summary
+from src.apps.dental.data_models import PeriodontalExam
 from src.apps.dental.schemas import (
+    ClinicalSummary,
+    DictationJobResponse,
     DictationRequest,
     DictationResponse,
     LanguageInfo,
     LanguagesResponse,
 )
-from src.apps.dental.services.extraction import extract_periodontal_data
+from src.apps.dental.services.exam_store import save_exam
+from src.apps.dental.services.extraction import extract_periodontal_data_async
+from src.apps.dental.services.rule_extraction import extract_with_rules
 from src.apps.dental.languages import LANGUAGES
 
 
+JOB_KIND = "dental_dictation"
+# Name of the cached extraction in the transcription cache
+CACHE_EXTRACTION = "dental_extraction"
+
+
+async def transcribe_dictation(data: DictationRequest) -> tuple[str, str]:
+    """Transcribe a dictation with continuous recognition and dental phrase hints.
+
+    Returns the audio cache key and the transcription (cached for repeated uploads).
+    """
+    audio_data = base64.b64decode(data.audio_base64)
+    phrases = get_dental_phrases(data.locale)
+    return await transcribe_cached(
+        audio_data,
+        data.locale,
+        lambda pcm: transcribe_audio_continuous(pcm, data.locale, phrase_hints=phrases, audio_format=TARGET_FORMAT),
+        phrase_hints=phrases,
+    )
+
+
+async def extract_dictation(
+    data: DictationRequest, transcription: str, audio_key: str | None = None
+) -> tuple[PeriodontalExam, DictationResponse]:
+    """Extract and summarize the exam of a transcribed dictation.
+
+    With the *audio_key* of the recording, the extraction is cached alongside its transcription.
+    Returns the exam and the response (without exam_id, see store_dictation).
+    """
+    async def extract():
+        # Extract structured periodontal data (rules first, LLM for the remainder)
+        rules = extract_with_rules(transcription) if get_settings().DENTAL_RULE_EXTRACTION else None
+        exam = await extract_periodontal_data_async(transcription, rules)
+        return exam, rules.coverage if rules else None
+
+    if audio_key and get_settings().TRANSCRIPTION_CACHE_RESULTS:
+        exam, rule_coverage = await get_transcription_cache().get_or_compute(audio_key, CACHE_EXTRACTION, extract)
+    else:
+        exam, rule_coverage = await extract()
+
+    notes = [exam.extraction_notes] if exam.extraction_notes else []
+    try:
+        summary = msgspec.convert(clinical_summary(PeriodontalChart.from_exam(exam)), ClinicalSummary)
+    except ValueError as e:
+        summary = None
+        notes.append(f"No clinical summary: {e}.")
+
+    return exam, DictationResponse(
+        transcription=transcription,
+        exam_data=msgspec.to_builtins(exam),
+        extraction_notes=" ".join(notes) or None,
+        rule_coverage=rule_coverage,
+        clinical_summary=summary,
+    )
+
+
+async def store_dictation(
+    data: DictationRequest, extracted: tuple[PeriodontalExam, DictationResponse]
+) -> DictationResponse:
+    """Store the extracted exam if the dictation names a patient; returns the response with its exam_id."""
+    exam, response = extracted
+    if not data.patient_id:
+        return response
+    if response.clinical_summary is None:
+        # The chart rejected the exam (see the clinical summary note)
+        note = f"Exam not stored for patient {data.patient_id}."
+        notes = f"{response.extraction_notes} {note}" if response.extraction_notes else note
+        return msgspec.structs.replace(response, extraction_notes=notes)
+    stored = await save_exam(data.patient_id, exam, data.clinic_id)
+    return msgspec.structs.replace(response, exam_id=stored.id)
+
+
+async def build_dictation_response(
+    data: DictationRequest, transcription: str, audio_key: str | None = None
+) -> DictationResponse:
+    """Extract, summarize and (with a patient_id) store the exam of a transcribed dictation."""
+    return await store_dictation(data, await extract_dictation(data, transcription, audio_key))
+
+
+def _job_response(job: Job) -> DictationJobResponse:
+    return DictationJobResponse(
+        job_id=job.id,
+        status=job.status,
+        stage=job.stage,
+        attempts=job.attempts,
+        error=job.error,
+        result=job.result,
+    )
+
+
+def _get_job(job_id: str) -> Job:
+    job = get_job_queue().get(job_id, JOB_KIND)
+    if job is None:
+        raise NotFoundException("Job not found or expired")
+    return job
+
+
 class DictationController(Controller):
     path = "/api/dental"
 
     @post("/process")
     async def process_dictation(self, data: DictationRequest) -> DictationResponse:
         """Process audio dictation: transcribe and extract periodontal data."""
-        audio_data = base64.b64decode(data.audio_base64)
-
         # Continuous recognition for longer dictations
-        phrases = get_dental_phrases(data.locale)
-        transcription = transcribe_audio_continuous(audio_data, data.locale, phrase_hints=phrases)
+        audio_key, transcription = await transcribe_dictation(data)
+        return await build_dictation_response(data, transcription, audio_key)
 
-        # Extract structured periodontal data
-        exam = extract_periodontal_data(transcription)
+    @post("/jobs", status_code=HTTP_202_ACCEPTED)
+    async def submit_dictation_job(
+        self, data: DictationRequest, priority: JobPriority = JobPriority.NORMAL
+    ) -> DictationJobResponse:
+        """Queue a dictation for background processing and return its job id."""
+        async def transcribe(_):
+            return await transcribe_dictation(data)
 
-        return DictationResponse(
-            transcription=transcription,
-            exam_data=msgspec.to_builtins(exam),
-            extraction_notes=exam.extraction_notes,
-        )
+        async def extract(transcribed: tuple[str, str]):
+            audio_key, transcription = transcribed
+            return await extract_dictation(data, transcription, audio_key)
+
+        async def store(extracted: tuple[PeriodontalExam, DictationResponse]):
+            return await store_dictation(data, extracted)
+
+        # Each stage retries only its own transient failures, so a DB error does not repeat the extraction
+        stages = [
+            Stage("transcribe", transcribe, retry_on=(AzureTransientError,)),
+            Stage("extract", extract, retry_on=LLM_TRANSIENT_ERRORS),
+            Stage("store", store, retry_on=DB_TRANSIENT_ERRORS),
+        ]
+        try:
+            job = get_job_queue().submit(JOB_KIND, stages, priority)
+        except JobQueueFullError as e:
+            raise ServiceUnavailableException(str(e)) from e
+        return _job_response(job)
+
+    @get("/jobs/{job_id:str}")
+    async def get_dictation_job(self, job_id: str) -> DictationJobResponse:
+        """Get the status (and, once finished, the result) of a dictation job."""
+        return _job_response(_get_job(job_id))
+
+    @get("/jobs/{job_id:str}/events")
+    async def stream_dictation_job(self, job_id: str) -> ServerSentEvent:
+        """Stream dictation job updates as server-sent events until it finishes."""
+        job = _get_job(job_id)
+
+        async def updates():
+            async for update in get_job_queue().watch(job):
+                yield msgspec.json.encode(_job_response(update)).decode()
+
+        return ServerSentEvent(updates(), event_type="job")
 
     @get("/languages")
     async def get_languages(self) -> LanguagesResponse:
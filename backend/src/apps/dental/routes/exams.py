@@ -0,0 +1,81 @@
+"""
+Stored dental exam API routes.
+"""
+
+from datetime import datetime
+
+import msgspec
+from litestar import Controller, get, post
+from litestar.exceptions import NotFoundException, ValidationException
+
+from src.models import DentalExamRecord
+from src.settings import get_settings
+from src.apps.dental.chart import clinical_summary, compare_charts
+from src.apps.dental.data_models import PeriodontalExam
+from src.apps.dental.schemas import (
+    ClinicalSummary,
+    ExamComparison,
+    ExamDelta,
+    SaveExamRequest,
+    StoredExam,
+)
+from src.apps.dental.services.exam_store import (
+    load_clinic_history,
+    load_patient_history,
+    record_chart,
+    save_exam,
+)
+
+
+def stored_exam(record: DentalExamRecord) -> StoredExam:
+    return StoredExam(
+        id=record.id,
+        patient_id=record.patient_id,
+        clinic_id=record.clinic_id,
+        exam_date=record.exam_date,
+        clinical_summary=msgspec.convert(clinical_summary(record_chart(record)), ClinicalSummary),
+    )
+
+
+class ExamController(Controller):
+    path = "/api/dental/exams"
+
+    @post("/")
+    async def create_exam(self, data: SaveExamRequest) -> StoredExam:
+        """Store an exam for a patient."""
+        try:
+            exam = msgspec.convert(data.exam_data, PeriodontalExam)
+            record = await save_exam(data.patient_id, exam, data.clinic_id, data.exam_date)
+        except (msgspec.ValidationError, ValueError) as e:
+            raise ValidationException(f"Invalid exam data: {e}") from e
+        return stored_exam(record)
+
+    @get("/patients/{patient_id:str}")
+    async def get_patient_exams(self, patient_id: str) -> list[StoredExam]:
+        """List a patient's exams, newest first."""
+        return [stored_exam(record) for record in await load_patient_history(patient_id)]
+
+    @get("/patients/{patient_id:str}/compare")
+    async def compare_patient_exams(self, patient_id: str, previous: int | None = None) -> ExamComparison:
+        """Compare a patient's latest exam to the previous ones."""
+        limit = get_settings().DENTAL_COMPARE_PREVIOUS if previous is None else previous
+        if limit < 1:
+            raise ValidationException("previous must be at least 1")
+        records = await load_patient_history(patient_id, limit + 1)
+        if not records:
+            raise NotFoundException(f"No exams for patient {patient_id}")
+
+        current, *earlier = records
+        deltas = compare_charts(record_chart(current), [record_chart(record) for record in earlier])
+        return ExamComparison(
+            current=stored_exam(current),
+            previous=[
+                msgspec.convert({"exam_id": record.id, "exam_date": record.exam_date, **delta}, ExamDelta)
+                for record, delta in zip(earlier, deltas)
+            ],
+        )
+
+    @get("/clinics/{clinic_id:str}")
+    async def get_clinic_exams(self, clinic_id: str, since: datetime | None = None) -> list[StoredExam]:
+        """List all exams of a clinic by patient and date."""
+        return [stored_exam(record) for record in await load_clinic_history(clinic_id, since)]
@@ -2,6 +2,7 @@
 Request/response schemas for the dental dictation app.
 """
 
+from datetime import datetime
 from typing import Annotated
 
 import msgspec
@@ -12,6 +13,26 @@ class DictationRequest(msgspec.Struct):
     """Audio dictation request."""
     audio_base64: Annotated[str, Meta(min_length=1, description="Base64-encoded audio data")]
     locale: Annotated[str, Meta(description="Speech recognition locale code")] = "en-US"
+    patient_id: Annotated[str, Meta(max_length=100, description="Store the exam for this patient")] | None = None
+    clinic_id: Annotated[str, Meta(max_length=100, description="Clinic of the stored exam")] | None = None
+
+
+class QuadrantSummary(msgspec.Struct):
+    """CAL-based staging for one quadrant."""
+    quadrant: Annotated[int, Meta(ge=1, le=4, description="FDI quadrant")]
+    max_interdental_cal: Annotated[int | None, Meta(description="Greatest interdental CAL in mm")] = None
+    stage: Annotated[str | None, Meta(description="Periodontitis stage (I-IV) from interdental CAL")] = None
+
+
+class ClinicalSummary(msgspec.Struct):
+    """Chart-level clinical statistics."""
+    teeth_recorded: Annotated[int, Meta(ge=0, description="Teeth with any data")]
+    sites_recorded: Annotated[int, Meta(ge=0, description="Sites with a probing depth")]
+    bop_percent: Annotated[float | None, Meta(description="Share of sites with bleeding on probing (%)")]
+    mean_pd: Annotated[float | None, Meta(description="Mean probing depth in mm")]
+    sites_pd_5_plus: Annotated[int, Meta(ge=0, description="Sites with probing depth of 5 mm or more")]
+    stage: Annotated[str | None, Meta(description="Worst quadrant stage (I-IV)")]
+    quadrants: Annotated[list[QuadrantSummary], Meta(description="Staging per quadrant")]
 
 
 class DictationResponse(msgspec.Struct):
@@ -19,6 +40,69 @@ class DictationResponse(msgspec.Struct):
     transcription: Annotated[str, Meta(description="Speech-to-text transcription")]
     exam_data: Annotated[dict, Meta(description="Extracted periodontal exam data")]
     extraction_notes: Annotated[str | None, Meta(description="Notes about extraction ambiguities")] = None
+    rule_coverage: Annotated[
+        float | None, Meta(description="Share of the transcription parsed without the LLM (0-1)")
+    ] = None
+    clinical_summary: Annotated[
+        ClinicalSummary | None, Meta(description="Vectorized chart statistics")
+    ] = None
+    exam_id: Annotated[int | None, Meta(description="Stored exam ID (when a patient_id was given)")] = None
+
+
+class DictationJobResponse(msgspec.Struct):
+    """Status of a background dictation job."""
+    job_id: Annotated[str, Meta(description="Job ID")]
+    status: Annotated[str, Meta(description="queued, running, succeeded or failed")]
+    stage: Annotated[str | None, Meta(description="Current or last stage")] = None
+    attempts: Annotated[int, Meta(ge=0, description="Attempts of the current stage")] = 0
+    error: Annotated[str | None, Meta(description="Error of the failed stage")] = None
+    result: Annotated[DictationResponse | None, Meta(description="Result once succeeded")] = None
+
+
+class SaveExamRequest(msgspec.Struct):
+    """Exam to store for a patient."""
+    patient_id: Annotated[str, Meta(min_length=1, max_length=100, description="Patient identifier")]
+    exam_data: Annotated[dict, Meta(description="Periodontal exam data as returned by /process")]
+    clinic_id: Annotated[str, Meta(max_length=100, description="Clinic identifier")] | None = None
+    exam_date: Annotated[datetime | None, Meta(description="Exam date (defaults to now)")] = None
+
+
+class StoredExam(msgspec.Struct):
+    """Stored exam with its clinical summary."""
+    id: Annotated[int, Meta(description="Exam ID")]
+    patient_id: Annotated[str, Meta(description="Patient identifier")]
+    clinic_id: Annotated[str | None, Meta(description="Clinic identifier")]
+    exam_date: Annotated[datetime, Meta(description="Exam date")]
+    clinical_summary: Annotated[ClinicalSummary, Meta(description="Chart statistics")]
+
+
+class SiteChange(msgspec.Struct):
+    """A site whose attachment worsened since a previous exam."""
+    tooth: Annotated[int, Meta(description="FDI tooth number")]
+    site: Annotated[str, Meta(description="Site name")]
+    previous_pd: Annotated[int | None, Meta(description="Previous probing depth in mm")]
+    current_pd: Annotated[int | None, Meta(description="Current probing depth in mm")]
+    cal_change: Annotated[int | None, Meta(description="CAL change in mm, if recorded in both exams")]
+
+
+class ExamDelta(msgspec.Struct):
+    """Changes of the current exam against one previous exam."""
+    exam_id: Annotated[int, Meta(description="Previous exam ID")]
+    exam_date: Annotated[datetime, Meta(description="Previous exam date")]
+    sites_compared: Annotated[int, Meta(ge=0, description="Sites with PD in both exams")]
+    mean_pd_change: Annotated[float | None, Meta(description="Mean PD change in mm")]
+    sites_progressing: Annotated[int, Meta(ge=0, description="Sites with PD or CAL up by the threshold or more")]
+    sites_improving: Annotated[int, Meta(ge=0, description="Sites with PD down by the threshold or more")]
+    pd_delta: Annotated[
+        dict[str, list[int | None]], Meta(description="Per-tooth PD change for the 6 sites (null = not compared)")
+    ]
+    progressing_sites: Annotated[list[SiteChange], Meta(description="Progressing sites")]
+
+
+class ExamComparison(msgspec.Struct):
+    """Latest exam of a patient compared to previous ones."""
+    current: Annotated[StoredExam, Meta(description="Latest exam")]
+    previous: Annotated[list[ExamDelta], Meta(description="Changes against previous exams, newest first")]
 
 
 class LanguageInfo(msgspec.Struct):
@@ -0,0 +1,83 @@
+"""
+Persisted periodontal exams per patient, stored as PeriodontalChart arrays.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import select
+
+from src.apps.dental.chart import ARRAY_FIELDS, PeriodontalChart
+from src.apps.dental.data_models import PeriodontalExam
+from src.database import async_session
+from src.models import DentalExamRecord
+
+
+def record_chart(record: DentalExamRecord) -> PeriodontalChart:
+    """Rebuild the PeriodontalChart of a stored exam."""
+    return PeriodontalChart.from_columns(
+        {name: getattr(record, name) for name in ARRAY_FIELDS},
+        record.raw_transcription,
+        record.extraction_notes,
+    )
+
+
+async def save_exam(
+    patient_id: str,
+    exam: PeriodontalExam,
+    clinic_id: str | None = None,
+    exam_date: datetime | None = None,
+) -> DentalExamRecord:
+    """
+    Store an exam for a patient.
+
+    Args:
+        patient_id: Patient identifier
+        exam: Extracted exam
+        clinic_id: Optional clinic identifier
+        exam_date: Exam date (defaults to now)
+
+    Returns:
+        The stored record
+
+    Raises:
+        ValueError: If the exam has a tooth outside the periodontal chart
+    """
+    chart = PeriodontalChart.from_exam(exam)
+    record = DentalExamRecord(
+        patient_id=patient_id,
+        clinic_id=clinic_id,
+        raw_transcription=chart.raw_transcription,
+        extraction_notes=chart.extraction_notes,
+        **chart.to_columns(),
+    )
+    if exam_date is not None:
+        record.exam_date = exam_date
+    async with async_session() as db:
+        db.add(record)
+        await db.commit()
+        await db.refresh(record)
+    return record
+
+
+async def load_patient_history(patient_id: str, limit: int | None = None) -> list[DentalExamRecord]:
+    """Return a patient's exams, newest first (at most *limit*)."""
+    query = (
+        select(DentalExamRecord)
+        .where(DentalExamRecord.patient_id == patient_id)
+        .order_by(DentalExamRecord.exam_date.desc(), DentalExamRecord.id.desc())
+        .limit(limit)
+    )
+    async with async_session() as db:
+        result = await db.execute(query)
+        return list(result.scalars().all())
+
+
+async def load_clinic_history(clinic_id: str, since: datetime | None = None) -> list[DentalExamRecord]:
+    """Return all exams of a clinic (optionally since a date), grouped by patient, oldest first."""
+    query = select(DentalExamRecord).where(DentalExamRecord.clinic_id == clinic_id)
+    if since is not None:
+        query = query.where(DentalExamRecord.exam_date >= since)
+    query = query.order_by(DentalExamRecord.patient_id, DentalExamRecord.exam_date)
+    async with async_session() as db:
+        result = await db.execute(query)
+        return list(result.scalars().all())
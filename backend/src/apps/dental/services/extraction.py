@@ -2,11 +2,30 @@
 Azure OpenAI service for extracting periodontal data from transcribed text.
 """
 
-import json
-
-from src.shared.azure_openai import get_openai_client
-from src.settings import get_settings
-from src.apps.dental.data_models import PeriodontalExam, ToothData, SiteMeasurement
+import asyncio
+import logging
+from typing import Annotated
+
+import msgspec
+from msgspec import Meta
+
+from src.shared.structured_output import (
+    StructuredOutputError,
+    complete_structured,
+    complete_structured_sync,
+    decode_structured,
+)
+from src.settings import DentalPromptVersion, get_settings
+from src.apps.dental.data_models import (
+    SITE_ORDER,
+    PeriodontalExam,
+    SiteMeasurement,
+    ToothData,
+    merge_teeth,
+)
+from src.apps.dental.services.rule_extraction import RuleExtraction, extract_with_rules, split_at_teeth
+
+logger = logging.getLogger(__name__)
 
 
 class ExtractionError(Exception):
@@ -83,13 +102,95 @@ SYSTEM_PROMPT = """You are a dental data extraction assistant. Extract periodont
 
 Now extract data from the following transcription. Return ONLY valid JSON, no additional text."""
 
+# Prompt v2: sparse wire format. Site values are arrays in SITE_ORDER and only
+# fields that were dictated are emitted, so the model spends output tokens on
+# values instead of nulls. Decoded into CompactExtraction.
+SYSTEM_PROMPT_COMPACT = """You are a dental data extraction assistant. Extract periodontal examination data from dictated notes as compact JSON.
+
+## Rules
+1. Tooth numbers use FDI/ISO notation (11-48)
+2. Site arrays always have 6 values in this order: mesio-buccal, mid-buccal, disto-buccal, mesio-lingual, mid-lingual, disto-lingual
+3. pd (probing depth): 1-12 mm; cal (clinical attachment level): 0-15 mm; rec (recession): 0-10 mm
+4. bop (bleeding on probing): 1 = bleeding, 0 = no bleeding
+5. mob (mobility): 0-3; fur (furcation): 0-3, only for molars 16-18, 26-28, 36-38, 46-48
+6. pl (plaque), ca (calculus): 1 = present, 0 = absent
+7. Use null inside an array for sites that were not dictated
+8. Omit every field that was not dictated; omit teeth with no data
+9. Put warnings or clarifications in "n", otherwise null
+
+## Format
+{"t": {"<tooth_number>": {"pd": [6 values], "cal": [6 values], "rec": [6 values], "bop": [6 values], "mob": <int>, "fur": <int>, "pl": <0|1>, "ca": <0|1>}}, "n": <string|null>}
+
+## Examples
+Input: "Tooth 11, probing depths 2-2-3 buccal, 2-2-2 lingual. Bleeding at disto-buccal."
+Output: {"t": {"11": {"pd": [2, 2, 3, 2, 2, 2], "bop": [0, 0, 1, 0, 0, 0]}}, "n": null}
+
+Input: "Zahn 16, Sondierungstiefen bukkal 3-4-5, lingual 3-3-4. Furkation Grad 2. Blutung mesio-bukkal und disto-bukkal."
+Output: {"t": {"16": {"pd": [3, 4, 5, 3, 3, 4], "bop": [1, 0, 1, 0, 0, 0], "fur": 2}}, "n": null}
+
+Input: "Zub 36, hloubky sondáže 4-5-6 bukálně, 3-4-4 lingválně. Recese 2mm vestibulárně. Pohyblivost stupeň 1."
+Output: {"t": {"36": {"pd": [4, 5, 6, 3, 4, 4], "rec": [2, 2, 2, null, null, null], "mob": 1}}, "n": "Recession applied to all buccal sites as 'vestibulárně' indicates buccal surface."}
+
+Input: "Upper right quadrant. Tooth 17, depths 3-3-3-3-3-3, no bleeding. Tooth 16, depths 4-5-5-3-3-4, bleeding mesial and distal. Mobility grade 1."
+Output: {"t": {"17": {"pd": [3, 3, 3, 3, 3, 3], "bop": [0, 0, 0, 0, 0, 0]}, "16": {"pd": [4, 5, 5, 3, 3, 4], "bop": [1, 0, 1, 1, 0, 1], "mob": 1}}, "n": "Bleeding 'mesial and distal' interpreted as mesio-buccal, disto-buccal, mesio-lingual, disto-lingual sites."}
+
+Now extract data from the following transcription. Return ONLY valid JSON, no additional text."""
+
+PROMPTS = {
+    DentalPromptVersion.V1: SYSTEM_PROMPT,
+    DentalPromptVersion.V2: SYSTEM_PROMPT_COMPACT,
+}
+
+_Flag = bool | Annotated[int, Meta(ge=0, le=1)]
+_Grade = Annotated[int, Meta(ge=0, le=3)]
+
+
+def _site_values(item_type) -> type:
+    return Annotated[list[item_type | None], Meta(min_length=len(SITE_ORDER), max_length=len(SITE_ORDER))]
+
+
+class FullExtraction(msgspec.Struct):
+    """Prompt v1 output: every tooth with all six sites."""
+    teeth: dict[str, ToothData] = {}
+    extraction_notes: str | None = None
+
+
+class CompactTooth(msgspec.Struct):
+    """Prompt v2 tooth: site arrays in SITE_ORDER, only the dictated fields."""
+    pd: _site_values(Annotated[int, Meta(ge=1, le=12)]) | None = None
+    cal: _site_values(Annotated[int, Meta(ge=0, le=15)]) | None = None
+    rec: _site_values(Annotated[int, Meta(ge=0, le=10)]) | None = None
+    bop: _site_values(_Flag) | None = None
+    mob: _Grade | None = None
+    fur: _Grade | None = None
+    pl: _Flag | None = None
+    ca: _Flag | None = None
+
+
+class CompactExtraction(msgspec.Struct):
+    """Prompt v2 output: teeth keyed by FDI number, notes in n."""
+    t: dict[Annotated[int, Meta(ge=11, le=48)], CompactTooth] = {}
+    n: str | None = None
+
 
-def extract_periodontal_data(transcription: str) -> PeriodontalExam:
+OUTPUT_TYPES = {
+    DentalPromptVersion.V1: FullExtraction,
+    DentalPromptVersion.V2: CompactExtraction,
+}
+
+
+def extract_periodontal_data(transcription: str, rules: RuleExtraction | None = None) -> PeriodontalExam:
     """
-    Extract structured periodontal data from transcribed text using Azure OpenAI.
+    Extract structured periodontal data from transcribed text.
+
+    Clauses the rule-based extractor can parse are filled in directly; only the
+    remainder is sent to Azure OpenAI and its result is merged in, with rule
+    values taking precedence.
 
     Args:
         transcription: The transcribed text from speech recognition
+        rules: Rule extraction already run on the transcription (computed here
+            when omitted and DENTAL_RULE_EXTRACTION is enabled)
 
     Returns:
         PeriodontalExam object with structured data
@@ -97,70 +198,234 @@ def extract_periodontal_data(transcription: str) -> PeriodontalExam:
     Raises:
         ExtractionError: If extraction fails
     """
-    if not transcription.strip():
-        raise ExtractionError("No transcription provided")
+    rules = _rule_extraction(transcription, rules)
+    if rules is None:
+        return _extract_with_llm(transcription)
+    if not rules.remainder:
+        return PeriodontalExam(raw_transcription=transcription, teeth=rules.teeth)
+    return _merge_with_rules(transcription, rules, _extract_with_llm(rules.remainder))
+
+
+async def extract_periodontal_data_async(
+    transcription: str, rules: RuleExtraction | None = None
+) -> PeriodontalExam:
+    """
+    Async variant of extract_periodontal_data that extracts long dictations in chunks.
+
+    The text left after rule-based extraction is split into chunks of
+    DENTAL_EXTRACTION_CHUNK_TEETH teeth, which are extracted concurrently.
+
+    Args:
+        transcription: The transcribed text from speech recognition
+        rules: Rule extraction already run on the transcription
+
+    Returns:
+        PeriodontalExam object with structured data
+
+    Raises:
+        ExtractionError: If extraction fails
+    """
+    rules = _rule_extraction(transcription, rules)
+    if rules is None:
+        return await extract_with_llm_chunked(transcription)
+    if not rules.remainder:
+        return PeriodontalExam(raw_transcription=transcription, teeth=rules.teeth)
+    return _merge_with_rules(transcription, rules, await extract_with_llm_chunked(rules.remainder))
+
+
+def chunk_transcription(transcription: str, teeth_per_chunk: int) -> list[str]:
+    """
+    Split a dictation into chunks of at most *teeth_per_chunk* teeth.
+
+    Chunks break only at tooth markers, and a new chunk starts whenever the
+    quadrant changes so no request spans two quadrants. Text before the first
+    tooth goes with the first chunk.
+    """
+    chunks: list[list[str]] = [[]]
+    teeth: list[int] = []
+    for tooth_number, text in split_at_teeth(transcription):
+        if tooth_number is not None and tooth_number not in teeth:
+            if len(teeth) >= teeth_per_chunk or (teeth and teeth[-1] // 10 != tooth_number // 10):
+                chunks.append([])
+                teeth = []
+            teeth.append(tooth_number)
+        chunks[-1].append(text)
+    return [" ".join(chunk) for chunk in chunks if chunk]
+
+
+async def extract_with_llm_chunked(
+    transcription: str,
+    teeth_per_chunk: int | None = None,
+    prompt_version: DentalPromptVersion | None = None,
+) -> PeriodontalExam:
+    """
+    Extract periodontal data with concurrent LLM requests, one per chunk of teeth.
+
+    Output generation time grows with the size of the JSON answer, so several
+    small answers generated in parallel return sooner than one full-mouth
+    answer. Teeth reported by more than one chunk are merged; disagreements
+    are listed in extraction_notes (the earlier chunk's value is kept).
+
+    Args:
+        transcription: Text to extract from
+        teeth_per_chunk: Teeth per request (default DENTAL_EXTRACTION_CHUNK_TEETH;
+            0 sends one request)
+        prompt_version: Prompt and output format (default DENTAL_PROMPT_VERSION)
+
+    Returns:
+        PeriodontalExam with raw_transcription set to *transcription*
 
+    Raises:
+        ExtractionError: If any chunk fails
+    """
     settings = get_settings()
+    if teeth_per_chunk is None:
+        teeth_per_chunk = settings.DENTAL_EXTRACTION_CHUNK_TEETH
+    chunks = chunk_transcription(transcription, teeth_per_chunk) if teeth_per_chunk > 0 else []
+    if len(chunks) <= 1:
+        return await _extract_with_llm_async(transcription, prompt_version)
 
-    try:
-        client = get_openai_client()
-
-        response = client.chat.completions.create(
-            model=settings.AZURE_OPENAI_DEPLOYMENT,
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": transcription},
-            ],
-            response_format={"type": "json_object"},
+    semaphore = asyncio.Semaphore(settings.DENTAL_EXTRACTION_CONCURRENCY)
+
+    async def extract(chunk: str) -> PeriodontalExam:
+        async with semaphore:
+            return await _extract_with_llm_async(chunk, prompt_version)
+
+    exams = await asyncio.gather(*(extract(chunk) for chunk in chunks))
+
+    teeth: dict[str, ToothData] = {}
+    notes = [exam.extraction_notes for exam in exams if exam.extraction_notes]
+    conflicts = []
+    for index, exam in enumerate(exams, start=1):
+        conflicts += merge_teeth(teeth, exam.teeth, source=f"chunk {index}")
+    if conflicts:
+        notes.append("Conflicting values across chunks (first value kept): " + "; ".join(conflicts))
+    logger.info("Dental extraction: %d chunks, %d teeth, %d conflicts", len(chunks), len(teeth), len(conflicts))
+
+    return PeriodontalExam(
+        raw_transcription=transcription,
+        teeth=teeth,
+        extraction_notes=" ".join(notes) or None,
+    )
+
+
+def _rule_extraction(transcription: str, rules: RuleExtraction | None) -> RuleExtraction | None:
+    if not transcription.strip():
+        raise ExtractionError("No transcription provided")
+    if rules is None and get_settings().DENTAL_RULE_EXTRACTION:
+        rules = extract_with_rules(transcription)
+    if rules is not None:
+        logger.info(
+            "Dental rule extraction: %.0f%% coverage, %d teeth, %d chars left for the LLM",
+            rules.coverage * 100, len(rules.teeth), len(rules.remainder),
         )
+    return rules
 
-        result_text = response.choices[0].message.content
-        if not result_text:
-            raise ExtractionError("Empty response from LLM")
 
-        result_data = json.loads(result_text)
-        result_data["raw_transcription"] = transcription
+def _merge_with_rules(transcription: str, rules: RuleExtraction, llm_exam: PeriodontalExam) -> PeriodontalExam:
+    """Merge the LLM result for the remainder into the rule-based teeth (rule values win)."""
+    teeth = dict(rules.teeth)
+    notes = [llm_exam.extraction_notes] if llm_exam.extraction_notes else []
+    conflicts = merge_teeth(teeth, llm_exam.teeth, source="LLM")
+    if conflicts:
+        notes.append("Conflicting values (rule-based value kept): " + "; ".join(conflicts))
+
+    return PeriodontalExam(
+        raw_transcription=transcription,
+        teeth=teeth,
+        extraction_notes=" ".join(notes) or None,
+    )
+
+
+def extraction_messages(transcription: str, prompt_version: DentalPromptVersion | None = None) -> list[dict]:
+    """Chat messages asking for extraction with the given (default: configured) prompt version."""
+    prompt_version = prompt_version or get_settings().DENTAL_PROMPT_VERSION
+    return [
+        {"role": "system", "content": PROMPTS[prompt_version]},
+        {"role": "user", "content": transcription},
+    ]
+
+
+def parse_extraction_response(
+    result_text: str | None, transcription: str, prompt_version: DentalPromptVersion | None = None
+) -> PeriodontalExam:
+    """
+    Decode an LLM response written in the given prompt version's output format.
+
+    Raises:
+        ExtractionError: If the response is empty, not JSON or fails validation
+    """
+    prompt_version = prompt_version or get_settings().DENTAL_PROMPT_VERSION
+    try:
+        result = decode_structured(result_text, OUTPUT_TYPES[prompt_version])
+    except StructuredOutputError as e:
+        raise ExtractionError(f"Invalid extraction from LLM: {str(e)}")
+    return _to_exam(result, transcription)
 
-        return _parse_extraction_result(result_data)
 
-    except json.JSONDecodeError as e:
-        raise ExtractionError(f"Failed to parse LLM response as JSON: {str(e)}")
-    except ExtractionError:
-        raise
+def _extract_with_llm(transcription: str) -> PeriodontalExam:
+    """Extract periodontal data from text using Azure OpenAI."""
+    prompt_version = get_settings().DENTAL_PROMPT_VERSION
+    try:
+        result = complete_structured_sync(
+            extraction_messages(transcription, prompt_version), OUTPUT_TYPES[prompt_version]
+        )
+    except StructuredOutputError as e:
+        raise ExtractionError(f"Invalid extraction from LLM: {str(e)}")
     except Exception as e:
         raise ExtractionError(f"Extraction failed: {str(e)}")
+    return _to_exam(result, transcription)
 
 
-def _parse_extraction_result(data: dict) -> PeriodontalExam:
-    """Parse the LLM extraction result into a PeriodontalExam object."""
-    teeth_data = {}
+async def _extract_with_llm_async(
+    transcription: str, prompt_version: DentalPromptVersion | None = None
+) -> PeriodontalExam:
+    """Extract periodontal data from text using the shared async Azure OpenAI client."""
+    prompt_version = prompt_version or get_settings().DENTAL_PROMPT_VERSION
+    try:
+        result = await complete_structured(
+            extraction_messages(transcription, prompt_version), OUTPUT_TYPES[prompt_version]
+        )
+    except StructuredOutputError as e:
+        raise ExtractionError(f"Invalid extraction from LLM: {str(e)}")
+    except Exception as e:
+        raise ExtractionError(f"Extraction failed: {str(e)}")
+    return _to_exam(result, transcription)
+
+
+def _to_exam(result: FullExtraction | CompactExtraction, transcription: str) -> PeriodontalExam:
+    """Build a PeriodontalExam from a decoded LLM result of either prompt version."""
+    if isinstance(result, FullExtraction):
+        for tooth in result.teeth.values():
+            tooth.sites = {name: tooth.sites.get(name) or SiteMeasurement() for name in SITE_ORDER}
+        return PeriodontalExam(
+            teeth=result.teeth,
+            raw_transcription=transcription,
+            extraction_notes=result.extraction_notes,
+        )
 
-    for tooth_key, tooth_value in data.get("teeth", {}).items():
+    teeth_data = {}
+    for tooth_number, compact in result.t.items():
         sites = {}
-        for site_name, site_data in tooth_value.get("sites", {}).items():
+        for index, site_name in enumerate(SITE_ORDER):
+            bop = compact.bop[index] if compact.bop else None
             sites[site_name] = SiteMeasurement(
-                pd=site_data.get("pd"),
-                cal=site_data.get("cal"),
-                recession=site_data.get("recession"),
-                bop=site_data.get("bop"),
+                pd=compact.pd[index] if compact.pd else None,
+                cal=compact.cal[index] if compact.cal else None,
+                recession=compact.rec[index] if compact.rec else None,
+                bop=bool(bop) if bop is not None else None,
             )
-
-        for site_name in ["mesio_buccal", "mid_buccal", "disto_buccal",
-                          "mesio_lingual", "mid_lingual", "disto_lingual"]:
-            if site_name not in sites:
-                sites[site_name] = SiteMeasurement()
-
-        teeth_data[tooth_key] = ToothData(
-            tooth_number=tooth_value.get("tooth_number", int(tooth_key)),
+        teeth_data[str(tooth_number)] = ToothData(
+            tooth_number=tooth_number,
             sites=sites,
-            mobility=tooth_value.get("mobility"),
-            furcation=tooth_value.get("furcation"),
-            plaque=tooth_value.get("plaque"),
-            calculus=tooth_value.get("calculus"),
+            mobility=compact.mob,
+            furcation=compact.fur,
+            plaque=bool(compact.pl) if compact.pl is not None else None,
+            calculus=bool(compact.ca) if compact.ca is not None else None,
         )
 
     return PeriodontalExam(
         teeth=teeth_data,
-        raw_transcription=data.get("raw_transcription", ""),
-        extraction_notes=data.get("extraction_notes"),
+        raw_transcription=transcription,
+        extraction_notes=result.n,
     )
@@ -0,0 +1,344 @@
+"""
+Deterministic extraction of regular periodontal dictation (English, German, Czech).
+
+Clauses the grammar fully understands ("Tooth 16, depths 4-5-5-3-3-4, bleeding
+mesial and distal, mobility grade 1") are written straight into ToothData; every
+other clause is returned as a remainder for the LLM, prefixed with its tooth.
+Teeth with a spoken correction or dictated more than once go to the LLM whole.
+"""
+
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+
+from src.apps.dental.data_models import (
+    BUCCAL_SITES,
+    LINGUAL_SITES,
+    MOLAR_TEETH,
+    VALID_TOOTH_NUMBERS,
+    ToothData,
+)
+
+ALL_SITES = (*BUCCAL_SITES, *LINGUAL_SITES)
+_BUCCAL = tuple(BUCCAL_SITES)
+_LINGUAL = tuple(LINGUAL_SITES)
+_MESIAL = ("mesio_buccal", "mesio_lingual")
+_DISTAL = ("disto_buccal", "disto_lingual")
+
+_MEASURE_RANGES = {"pd": (1, 12), "cal": (0, 15), "recession": (0, 10)}
+_GRADE_RANGE = (0, 3)
+
+_NUMBER_WORDS = {
+    # English
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+    # German (after diacritics are stripped)
+    "null": 0, "eins": 1, "ein": 1, "eine": 1, "zwei": 2, "drei": 3, "vier": 4, "funf": 5,
+    "sechs": 6, "sieben": 7, "acht": 8, "neun": 9, "zehn": 10, "elf": 11, "zwolf": 12,
+    # Czech (after diacritics are stripped)
+    "nula": 0, "jedna": 1, "jeden": 1, "jedno": 1, "dva": 2, "dve": 2, "tri": 3, "ctyri": 4,
+    "pet": 5, "sest": 6, "sedm": 7, "osm": 8, "devet": 9, "deset": 10, "jedenact": 11, "dvanact": 12,
+}
+
+_BUCCAL_WORDS = r"buccal(?:ly)?|bukkal|bukaln[eiy]|vestibular(?:ly)?|vestibulaer|vestibularn[eiy]|facial(?:ly)?"
+_LINGUAL_WORDS = r"lingual(?:ly)?|lingvaln[eiy]|palatal(?:ly)?|palatinal|palatinaln[eiy]"
+
+# (kind, value, pattern) over lower-cased text without diacritics. Kinds:
+# measure/event name what a clause reports, sites the sites it applies to,
+# neg negates it, context marks quadrant announcements, None is filler.
+_LEXICON: list[tuple[str | None, object, str]] = [
+    ("sites", ("mesio_buccal",), rf"me[sz]io[\s-]?(?:{_BUCCAL_WORDS})"),
+    ("sites", ("disto_buccal",), rf"disto[\s-]?(?:{_BUCCAL_WORDS})"),
+    ("sites", ("mid_buccal",), rf"mid[\s-]?(?:{_BUCCAL_WORDS})"),
+    ("sites", ("mesio_lingual",), rf"me[sz]io[\s-]?(?:{_LINGUAL_WORDS})"),
+    ("sites", ("disto_lingual",), rf"disto[\s-]?(?:{_LINGUAL_WORDS})"),
+    ("sites", ("mid_lingual",), rf"mid[\s-]?(?:{_LINGUAL_WORDS})"),
+    ("sites", _BUCCAL, _BUCCAL_WORDS),
+    ("sites", _LINGUAL, _LINGUAL_WORDS),
+    ("sites", _MESIAL, r"me[sz]ial(?:ly)?|me[sz]ialn[eiy]"),
+    ("sites", _DISTAL, r"distal(?:ly)?|distaln[eiy]"),
+    ("measure", "pd", (
+        r"(?:probing|pocket)\s+depths?|depths?|pd|pockets?|sondierungstiefen?|taschentiefen?"
+        r"|hloubk[ay]\s+(?:sondaze|kapsy|kapes)|hloubk[ay]"
+    )),
+    ("measure", "cal", (
+        r"(?:clinical\s+)?attachment\s+(?:level|loss)|cal|klinische[sr]?\s+attachment[\s-]?(?:level|verlust)"
+        r"|attachment[\s-]?(?:level|verlust)|(?:klinicka\s+)?ztrata\s+(?:prilnavosti|upojeni)"
+    )),
+    ("measure", "recession", r"(?:gingival\s+)?recessions?|rezession(?:en)?|recese"),
+    ("event", "bop", (
+        r"bleeding(?:\s+on\s+probing)?|bop|blutung(?:\s+(?:bei|auf)\s+(?:der\s+)?sondierung)?"
+        r"|krvaceni(?:\s+pri\s+sondazi)?"
+    )),
+    ("event", "mobility", r"mobility|(?:zahn)?beweglichkeit|lockerung(?:sgrad)?|pohyblivost|viklavost"),
+    ("event", "furcation", r"furcation(?:\s+involvement)?|furkation(?:sbefall)?|furkace"),
+    ("event", "plaque", r"plaque|plak"),
+    ("event", "calculus", r"calculus|tartar|zahnstein|(?:zubni\s+)?kamen"),
+    ("neg", True, r"no|not|none|without|keine?|ohne|bez|zadn[eya]|ne"),
+    ("context", None, (
+        r"quadrants?|kvadrant|upper|lower|left|right|maxillary|mandibular|oberkiefer|unterkiefer"
+        r"|links|rechts|horni|dolni|prav[yao]|lev[yao]"
+    )),
+    (None, None, (
+        r"on\s+the|on|the|at|of|in|and|side|surfaces?|sites?|grade|class|degree|present|with|is"
+        r"|millimet(?:er|re)s?|mm|und|an|der|die|das|bei|seite|grad|klasse|vorhanden|mit|ist"
+        r"|a|i|na|ve|v|s|se|strana|strane|stupen|stupne|trida|tridy|pritom(?:en|na|ny)|milimetr[uy]?"
+    )),
+    ("number", None, r"(?<!\d)\d{1,2}(?:\s*[-/]\s*\d{1,2}|\s+\d{1,2})*(?!\d)"),
+    ("number", "word", "|".join(_NUMBER_WORDS)),
+]
+
+_LEXER = re.compile(
+    "|".join(
+        f"(?P<t{i}>{pattern})" if kind == "number" and value is None
+        else f"(?P<t{i}>(?<![a-z])(?:{pattern})(?![a-z]))"
+        for i, (kind, value, pattern) in enumerate(_LEXICON)
+    )
+)
+_TOOTH_MARKER = re.compile(r"(?<![a-z])(?:tooth|zahn|zub)\s*(?:number|nummer|cislo)?\s*(\d{2})(?!\d)")
+# Spoken corrections ("2-3-4, I mean 2-3-5"); a bare no/ne only right before a number or a pause
+_CORRECTION = re.compile(
+    r"(?<![a-z])(?:i\s+mean|correction|corrected|scratch\s+that|sorry|actually|rather"
+    r"|ich\s+meine|korrektur|korrigiere|nein|pardon|oprava|opravuji|spis|vlastne"
+    r"|(?:no|ne)(?=\s*(?:[,;:.!?]|\d)))(?![a-z])"
+)
+_CLAUSE = re.compile(r"[^,.;:!?\n]+")
+_GAP = re.compile(r"[\s\-/()'\"]*")
+
+
+@dataclass
+class RuleExtraction:
+    """Result of rule-based extraction.
+
+    teeth holds the data parsed deterministically, remainder the clauses left
+    for the LLM (empty when everything was parsed) and coverage the share of
+    transcription characters that were parsed.
+    """
+
+    teeth: dict[str, ToothData] = field(default_factory=dict)
+    remainder: str = ""
+    coverage: float = 0.0
+
+
+@dataclass
+class _Segment:
+    """Running state while parsing the clauses of one tooth."""
+
+    tooth: ToothData
+    measure: str | None = None
+    sites: tuple[str, ...] = ()
+
+
+def _fold(text: str) -> str:
+    """Lower-case and strip diacritics, keeping one output character per input character."""
+    folded = []
+    for char in text.lower():
+        base = "".join(c for c in unicodedata.normalize("NFKD", char) if not unicodedata.combining(c))
+        folded.append(base[:1] or char)
+    return "".join(folded)
+
+
+def _tokenize(clause: str) -> list[tuple[str, object]] | None:
+    """Split a folded clause into lexicon tokens, or None if any word is unknown."""
+    tokens: list[tuple[str, object]] = []
+    pos = 0
+    for match in _LEXER.finditer(clause):
+        if not _GAP.fullmatch(clause, pos, match.start()):
+            return None
+        kind, value, _ = _LEXICON[int(match.lastgroup[1:])]
+        if kind == "number":
+            text = match.group()
+            value = [_NUMBER_WORDS[text]] if value == "word" else [int(n) for n in re.findall(r"\d+", text)]
+        if kind is not None:
+            tokens.append((kind, value))
+        pos = match.end()
+    if not _GAP.fullmatch(clause, pos, len(clause)):
+        return None
+    return tokens
+
+
+def _interpret(
+    tokens: list[tuple[str, object]], segment: _Segment
+) -> list[tuple[str | None, str, object]] | None:
+    """Turn one clause's tokens into (site, field, value) assignments (site None = tooth level).
+
+    Returns None when the clause is ambiguous for the grammar; it is then left to the LLM.
+    """
+    by_kind: dict[str, list] = {}
+    for kind, value in tokens:
+        by_kind.setdefault(kind, []).append(value)
+    measures = by_kind.get("measure", [])
+    events = by_kind.get("event", [])
+    numbers = by_kind.get("number", [])
+    negated = "neg" in by_kind
+    sites = tuple(dict.fromkeys(site for group in by_kind.get("sites", []) for site in group))
+
+    if "context" in by_kind:
+        # Quadrant announcements carry no per-tooth data
+        return [] if not (measures or events or sites or negated) else None
+    if len(measures) + len(events) > 1:
+        return None
+
+    if events:
+        event = events[0]
+        if event == "bop":
+            if numbers:
+                return None
+            if negated:
+                return [(site, "bop", False) for site in sites or ALL_SITES]
+            bleeding = sites or segment.sites or ALL_SITES
+            # Bleeding reported for some sites implies none at the others
+            return [
+                (site, "bop", False) for site in ALL_SITES
+                if site not in bleeding and segment.tooth.sites[site].bop is None
+            ] + [(site, "bop", True) for site in bleeding]
+        if event in ("mobility", "furcation"):
+            if sites or (event == "furcation" and segment.tooth.tooth_number not in MOLAR_TEETH):
+                return None
+            if negated and not numbers:
+                return [(None, event, 0)]
+            if negated or len(numbers) != 1 or len(numbers[0]) != 1:
+                return None
+            grade = numbers[0][0]
+            return [(None, event, grade)] if _GRADE_RANGE[0] <= grade <= _GRADE_RANGE[1] else None
+        if sites or numbers:
+            return None
+        return [(None, event, not negated)]
+
+    if measures and not (numbers or sites or negated):
+        # A heading such as "Probing depths:" applies to the clauses that follow
+        segment.measure = measures[0]
+        return []
+    measure = measures[0] if measures else segment.measure
+    if measure is None or not numbers:
+        return [] if not (sites or numbers or negated) else None
+    if negated or len(numbers) != 1:
+        return None
+    values = numbers[0]
+    if len(values) == 6 and not sites:
+        targets = ALL_SITES
+    elif len(values) == 3 and sites in (_BUCCAL, _LINGUAL):
+        targets = sites
+    elif len(values) == 1 and sites:
+        targets, values = sites, values * len(sites)
+    else:
+        return None
+    low, high = _MEASURE_RANGES[measure]
+    if not all(low <= value <= high for value in values):
+        return None
+
+    segment.measure, segment.sites = measure, targets
+    return [(site, measure, value) for site, value in zip(targets, values)]
+
+
+def _apply(tooth: ToothData, assignments: list[tuple[str | None, str, object]]) -> None:
+    for site, name, value in assignments:
+        setattr(tooth.sites[site] if site else tooth, name, value)
+
+
+def _tooth_segments(folded: str) -> list[tuple[re.Match | None, int, int]]:
+    """(tooth marker or None for the preamble, body start, body end) for each segment."""
+    markers = list(_TOOTH_MARKER.finditer(folded))
+    segments = [(None, 0, markers[0].start() if markers else len(folded))]
+    for i, marker in enumerate(markers):
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(folded)
+        segments.append((marker, marker.end(), end))
+    return segments
+
+
+def split_at_teeth(transcription: str) -> list[tuple[int | None, str]]:
+    """Split a dictation at its tooth markers into (tooth number, text) pairs.
+
+    Text before the first marker is returned with tooth number None.
+    """
+    segments = []
+    for marker, start, end in _tooth_segments(_fold(transcription)):
+        text = transcription[marker.start() if marker else start:end].strip()
+        if text:
+            segments.append((int(marker.group(1)) if marker else None, text))
+    return segments
+
+
+def extract_with_rules(transcription: str) -> RuleExtraction:
+    """
+    Parse the regular parts of a periodontal dictation without the LLM.
+
+    The transcription is split at tooth markers ("Tooth 16", "Zahn 16", "Zub 16")
+    and each tooth's text into clauses. A clause is parsed only when every word
+    is known to the grammar and its meaning is unambiguous: six probing depths,
+    a triplet with a side ("2-2-3 buccal"), a single value with sites
+    ("4 millimeters on the mesial"), bleeding, mobility, furcation, plaque or
+    calculus. Everything else goes into the remainder, prefixed with its tooth
+    marker so the LLM keeps the context.
+
+    A tooth whose text contains a spoken correction ("I mean", "sorry", "nein",
+    "oprava", ...) or that is dictated more than once is not parsed at all, so
+    the LLM sees every value and decides which one stands.
+
+    Args:
+        transcription: The transcribed dictation
+
+    Returns:
+        RuleExtraction with the parsed teeth, remainder text and coverage
+    """
+    folded = _fold(transcription)
+    result = RuleExtraction()
+    remainder: list[str] = []
+    parsed_chars = total_chars = 0
+    segments = _tooth_segments(folded)
+    dictated = Counter(int(marker.group(1)) for marker, _, _ in segments if marker)
+
+    for marker, start, end in segments:
+        clauses = [
+            m.span()
+            for m in _CLAUSE.finditer(folded, start, end)
+            if m.group().strip()
+        ]
+        tooth_number = int(marker.group(1)) if marker else None
+        segment = None
+        if (
+            tooth_number in VALID_TOOTH_NUMBERS
+            and dictated[tooth_number] == 1
+            and not _CORRECTION.search(folded, start, end)
+        ):
+            tooth = ToothData(tooth_number=tooth_number)
+            segment = _Segment(tooth=tooth)
+
+        unparsed = []
+        for clause_start, clause_end in clauses:
+            size = len(folded[clause_start:clause_end].strip())
+            total_chars += size
+            tokens = _tokenize(folded[clause_start:clause_end])
+            if segment is None and marker is None and tokens is not None:
+                # Preamble: only quadrant announcements and filler are understood
+                assignments = [] if all(kind in ("context", "number") for kind, _ in tokens) else None
+            elif segment is None or tokens is None:
+                assignments = None
+            else:
+                assignments = _interpret(tokens, segment)
+
+            if assignments is None:
+                unparsed.append(transcription[clause_start:clause_end].strip())
+            else:
+                parsed_chars += size
+                if segment is not None:
+                    _apply(segment.tooth, assignments)
+
+        if segment is not None and len(unparsed) < len(clauses):
+            result.teeth[str(tooth_number)] = segment.tooth
+        if marker is not None:
+            total_chars += len(marker.group())
+            if unparsed or segment is None:
+                unparsed.insert(0, transcription[marker.start():marker.end()])
+            else:
+                parsed_chars += len(marker.group())
+        if unparsed:
+            remainder.append(", ".join(unparsed) + ".")
+
+    result.coverage = parsed_chars / total_chars if total_chars else 0.0
+    if parsed_chars == 0:
+        result.remainder = transcription.strip()
+    else:
+        result.remainder = " ".join(remainder)
+    return result
@@ -12,7 +12,7 @@ from src.apps.mcdonalds.schemas import (
     menu_item_to_response,
 )
 from src.apps.mcdonalds.session import UserSession, get_or_create_session
-from src.apps.mcdonalds.services.intent import parse_intent
+from src.apps.mcdonalds.services.intent import IntentResult, parse_intent
 from src.apps.mcdonalds.services.embeddings import create_query_embedding
 from src.apps.mcdonalds.services.retrieval import (
     search_menu_items,
@@ -78,13 +78,27 @@ async def _map_names_to_ids(
     return {name: db_lower_map[name.lower()] for name in name_list if name.lower() in db_lower_map}
 
 
+async def parse_turn(session: UserSession, transcript: str, db: AsyncSession) -> IntentResult:
+    """Classify the transcript's intent. Read-only, so it is safe to cancel."""
+    displayed_names = await get_item_names_by_ids(db, session.displayed_item_ids)
+    basket_names = await get_item_names_by_ids(db, session.basket_item_ids)
+
+    return await parse_intent(
+        transcript, session.conversation_history, displayed_names, basket_names
+    )
+
+
 async def run_pipeline(
     session: UserSession,
     transcript: str,
     db: AsyncSession,
     timer: PipelineTimer | None = None,
+    intent_result: IntentResult | None = None,
 ) -> AudioResponse:
-    """Run the intent-parse → search/modify → response pipeline."""
+    """Run the intent-parse → search/modify → response pipeline.
+
+    Pass *intent_result* to skip the parse step when it was already done by parse_turn.
+    """
     if timer is None:
         timer = PipelineTimer()
 
@@ -98,13 +112,9 @@ async def run_pipeline(
             basket_items=_basket_responses(basket_items_db, session),
         )
 
-    displayed_names = await get_item_names_by_ids(db, session.displayed_item_ids)
-    basket_names = await get_item_names_by_ids(db, session.basket_item_ids)
-
-    intent_result = await parse_intent(
-        transcript, session.conversation_history, displayed_names, basket_names
-    )
-    intent = intent_result.get("intent")
+    if intent_result is None:
+        intent_result = await parse_turn(session, transcript, db)
+    intent = intent_result.intent
     timer.mark("LLM")
     msg = ""
     confirmed = False
@@ -119,7 +129,7 @@ async def run_pipeline(
         )
 
     elif intent == "REMOVE":
-        remove_names = intent_result.get("remove_items", [])
+        remove_names = intent_result.remove_items
         removed_ids = await get_item_ids_by_names(db, remove_names)
         session.displayed_item_ids = [
             id for id in session.displayed_item_ids
@@ -128,8 +138,8 @@ async def run_pipeline(
         timer.mark("DB Remove")
 
     elif intent == "ADD":
-        new_search = intent_result.get("new_search", True)
-        search_criteria = intent_result.get("search_criteria")
+        new_search = intent_result.new_search
+        search_criteria = intent_result.search_criteria
         session.add_utterance(transcript, "ADD", new_search=new_search, search_criteria=search_criteria)
         exclude_ids = list(set(session.displayed_item_ids + session.basket_item_ids))
         if new_search:
@@ -147,8 +157,8 @@ async def run_pipeline(
         session.displayed_item_ids = [item.id for item in items]
 
     elif intent == "SELECT":
-        select_names = intent_result.get("select_items", [])
-        select_quantities_by_name = intent_result.get("select_quantities", {})
+        select_names = intent_result.select_items
+        select_quantities_by_name = intent_result.select_quantities
         selected_ids = await get_item_ids_by_names_from_set(
             db, select_names, session.displayed_item_ids
         )
@@ -185,7 +195,7 @@ async def run_pipeline(
             session.displayed_item_ids = [item.id for item in items]
 
     elif intent == "REMOVE_FROM_BASKET":
-        basket_remove_names = intent_result.get("basket_remove_items", [])
+        basket_remove_names = intent_result.basket_remove_items
         removed_ids = await get_item_ids_by_names(db, basket_remove_names)
         session.remove_from_basket(removed_ids)
         msg = "Removed item(s) from your order"
@@ -1,14 +1,14 @@
 import base64
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import msgspec
 from litestar import WebSocket
 from litestar.handlers import WebsocketListener
 
-from src.database import async_session
-from src.apps.mcdonalds.routes.audio import PipelineTimer, run_pipeline
 from src.apps.mcdonalds.services.phrase_hints import get_menu_phrases
+from src.apps.mcdonalds.turns import TurnExecutor
+from src.shared.audio import TARGET_SAMPLE_RATE, AudioFormat, AudioFormatError, PCMConverter
 from src.shared.stt import create_streaming_session
 from src.shared.stt.streaming import StreamingSTTSession
 from src.apps.mcdonalds.session import UserSession, get_or_create_session
@@ -20,6 +20,8 @@ logger = logging.getLogger(__name__)
 class ConnectionState:
     session: UserSession | None = None
     stt_session: StreamingSTTSession | None = None
+    converter: PCMConverter = field(default_factory=PCMConverter)
+    turns: TurnExecutor | None = None
 
 
 class AudioWSListener(WebsocketListener):
@@ -49,7 +51,7 @@ class AudioWSListener(WebsocketListener):
         if msg_type == "start":
             await self._handle_start(msg, conn, socket)
         elif msg_type == "audio":
-            await self._handle_audio(msg, conn)
+            await self._handle_audio(msg, conn, socket)
         elif msg_type == "stop":
             await self._handle_stop(conn)
 
@@ -57,6 +59,8 @@ class AudioWSListener(WebsocketListener):
         conn = self._connections.pop(id(socket), None)
         if conn and conn.stt_session:
             await conn.stt_session.stop()
+        if conn and conn.turns:
+            await conn.turns.close()
 
     async def _handle_start(
         self, msg: dict, conn: ConnectionState, socket: WebSocket
@@ -64,9 +68,22 @@ class AudioWSListener(WebsocketListener):
         session_id = msg.get("session_id")
         language = msg.get("language", "en-US")
 
+        try:
+            conn.converter = PCMConverter(AudioFormat(
+                sample_rate=int(msg.get("sample_rate", TARGET_SAMPLE_RATE)),
+                channels=int(msg.get("channels", 1)),
+                encoding=msg.get("encoding", "pcm_s16le"),
+            ))
+        except (AudioFormatError, TypeError, ValueError) as e:
+            await socket.send_json({"type": "error", "message": str(e)})
+            return
+
         conn.session = get_or_create_session(session_id)
         conn.session.language = language
 
+        if conn.turns is None:
+            conn.turns = TurnExecutor(lambda: conn.session, socket.send_json)
+
         stt_session = create_streaming_session()
         conn.stt_session = stt_session
 
@@ -77,24 +94,11 @@ class AudioWSListener(WebsocketListener):
                 pass
 
         async def on_final(text: str) -> None:
+            transcript = conn.turns.submit(text)
             try:
-                await socket.send_json({"type": "processing", "text": text})
-                timer = PipelineTimer()
-                async with async_session() as db:
-                    response = await run_pipeline(conn.session, text, db, timer)
-                result = msgspec.to_builtins(response)
-                result["type"] = "results"
-                await socket.send_json(result)
-                await socket.send_json({"type": "ready"})
+                await socket.send_json({"type": "processing", "text": transcript})
             except Exception:
-                logger.exception("Pipeline error in WS on_final")
-                try:
-                    await socket.send_json(
-                        {"type": "error", "message": "Pipeline processing failed"}
-                    )
-                    await socket.send_json({"type": "ready"})
-                except Exception:
-                    pass
+                pass
 
         phrases = get_menu_phrases(language)
         await stt_session.start(language, on_interim, on_final, phrase_hints=phrases)
@@ -103,16 +107,28 @@ class AudioWSListener(WebsocketListener):
             "session_id": conn.session.session_id,
         })
 
-    async def _handle_audio(self, msg: dict, conn: ConnectionState) -> None:
+    async def _handle_audio(self, msg: dict, conn: ConnectionState, socket: WebSocket) -> None:
         if not conn.stt_session:
             return
         audio_b64 = msg.get("data")
         if not audio_b64:
             return
-        pcm_bytes = base64.b64decode(audio_b64)
-        await conn.stt_session.send_audio(pcm_bytes)
+        pcm_bytes = conn.converter.convert(base64.b64decode(audio_b64))
+        if not pcm_bytes:
+            return
+        try:
+            await conn.stt_session.send_audio(pcm_bytes)
+        except Exception:
+            # The session already tried to reconnect; give up on this stream
+            logger.exception("STT session failed")
+            stt_session, conn.stt_session = conn.stt_session, None
+            await socket.send_json({"type": "error", "message": "Speech recognition failed"})
+            await stt_session.stop()
 
     async def _handle_stop(self, conn: ConnectionState) -> None:
         if conn.stt_session:
+            tail = conn.converter.flush()
+            if tail:
+                await conn.stt_session.send_audio(tail)
             await conn.stt_session.stop()
             conn.stt_session = None
@@ -1,7 +1,29 @@
-import json
+from typing import Annotated, Literal
 
-from src.shared.azure_openai import get_openai_client
-from src.settings import get_settings
+import msgspec
+from msgspec import Meta
+
+from src.shared.structured_output import complete_structured
+
+
+class IntentResult(msgspec.Struct):
+    """Classified intent of one user utterance."""
+    intent: Literal["ADD", "REMOVE", "SELECT", "REMOVE_FROM_BASKET", "CLEAR", "CONFIRM"]
+    search_criteria: str | None = None
+    # The prompt fills these only for their intent; null (as models often
+    # send for the others) is read as the default so it never needs a repair call
+    new_search: bool | None = None
+    remove_items: list[str] | None = None
+    select_items: list[str] | None = None
+    select_quantities: dict[str, Annotated[int, Meta(ge=1)]] | None = None
+    basket_remove_items: list[str] | None = None
+
+    def __post_init__(self) -> None:
+        self.new_search = self.new_search is not False
+        self.remove_items = self.remove_items or []
+        self.select_items = self.select_items or []
+        self.select_quantities = self.select_quantities or {}
+        self.basket_remove_items = self.basket_remove_items or []
 
 
 # Intent classification prompt
@@ -66,11 +88,8 @@ async def parse_intent(
     conversation_history: list[dict],
     displayed_items: list[str] | None = None,
     basket_items: list[str] | None = None,
-) -> dict:
+) -> IntentResult:
     """Parse user intent from transcript using Azure OpenAI"""
-    settings = get_settings()
-    client = get_openai_client()
-
     messages = [{'role': 'system', 'content': INTENT_SYSTEM_PROMPT}]
 
     for entry in conversation_history:
@@ -85,10 +104,4 @@ async def parse_intent(
     context_block = "\n".join(context_parts)
     messages.append({"role": "user", "content": f"{context_block}\n\nUser said: {transcript}"})
 
-    response = client.chat.completions.create(
-        model=settings.AZURE_OPENAI_DEPLOYMENT,
-        messages=messages,
-        response_format={"type": "json_object"},
-    )
-
-    return json.loads(response.choices[0].message.content)
+    return await complete_structured(messages, IntentResult)
@@ -0,0 +1,152 @@
+"""
+Per-connection execution of voice turns for the McDonald's WebSocket.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Awaitable
+from dataclasses import dataclass, field
+
+import msgspec
+
+from src.database import async_session
+from src.apps.mcdonalds.routes.audio import PipelineTimer, parse_turn, run_pipeline
+from src.apps.mcdonalds.session import UserSession
+from src.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Turn:
+    """One or more final transcripts processed with a single LLM call."""
+    texts: list[str]
+    last_arrival: float
+    timer: PipelineTimer = field(default_factory=PipelineTimer)
+
+    @property
+    def transcript(self) -> str:
+        return " ".join(self.texts)
+
+
+class TurnExecutor:
+    """Runs a connection's voice turns strictly one at a time, in order.
+
+    A final that arrives within the merge window of the previous one is merged
+    into it. If that turn is still classifying its intent (read-only work) the
+    parse is cancelled and redone with the merged transcript; once a turn
+    starts modifying the session it always finishes before the next begins.
+    Time spent waiting in the queue is reported as the "Queue" pipeline step.
+    """
+
+    def __init__(
+        self,
+        get_session: Callable[[], UserSession],
+        send: Callable[[dict], Awaitable[None]],
+        merge_window_ms: int | None = None,
+        max_merged: int | None = None,
+    ) -> None:
+        settings = get_settings()
+        self._get_session = get_session
+        self._send = send
+        self._merge_window = (
+            merge_window_ms if merge_window_ms is not None else settings.TURN_MERGE_WINDOW_MS
+        ) / 1000
+        self._max_merged = max_merged if max_merged is not None else settings.TURN_MAX_MERGED
+        self._pending: deque[Turn] = deque()
+        self._current: Turn | None = None
+        self._parse_task: asyncio.Task | None = None
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    def submit(self, text: str) -> str:
+        """Queue a final transcript; returns the (possibly merged) transcript of its turn."""
+        now = time.monotonic()
+
+        current = self._current
+        if (
+            current is not None
+            and self._parse_task is not None
+            and not self._parse_task.done()
+            and self._can_merge(current, now)
+        ):
+            current.texts.append(text)
+            current.last_arrival = now
+            self._parse_task.cancel()
+            return current.transcript
+
+        if self._pending and self._can_merge(self._pending[-1], now):
+            turn = self._pending[-1]
+            turn.texts.append(text)
+            turn.last_arrival = now
+            return turn.transcript
+
+        self._pending.append(Turn(texts=[text], last_arrival=now))
+        self._wakeup.set()
+        return text
+
+    async def close(self) -> None:
+        """Drop queued turns and stop; a turn already modifying the session finishes first."""
+        self._closing = True
+        self._pending.clear()
+        if self._current is None or self._parse_task is not None:
+            # Idle or still classifying the intent (read-only): safe to cancel
+            self._task.cancel()
+            if self._parse_task:
+                self._parse_task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def _can_merge(self, turn: Turn, now: float) -> bool:
+        return len(turn.texts) < self._max_merged and now - turn.last_arrival <= self._merge_window
+
+    async def _run(self) -> None:
+        while not self._closing:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            self._current = self._pending.popleft()
+            try:
+                await self._execute(self._current)
+            finally:
+                self._current = None
+                self._parse_task = None
+
+    async def _parse(self, session: UserSession, transcript: str) -> dict:
+        async with async_session() as db:
+            return await parse_turn(session, transcript, db)
+
+    async def _execute(self, turn: Turn) -> None:
+        session = self._get_session()
+        turn.timer.mark("Queue")
+        try:
+            while True:
+                transcript = turn.transcript
+                self._parse_task = asyncio.create_task(self._parse(session, transcript))
+                await asyncio.wait({self._parse_task})
+                if not self._parse_task.cancelled() and transcript == turn.transcript:
+                    break
+                logger.info("Turn superseded, re-parsing %d merged utterance(s)", len(turn.texts))
+
+            intent_result = self._parse_task.result()
+            self._parse_task = None
+            async with async_session() as db:
+                response = await run_pipeline(session, transcript, db, turn.timer, intent_result)
+
+            result = msgspec.to_builtins(response)
+            result["type"] = "results"
+            await self._send(result)
+            await self._send({"type": "ready"})
+        except Exception:
+            logger.exception("Pipeline error in WS turn")
+            try:
+                await self._send({"type": "error", "message": "Pipeline processing failed"})
+                await self._send({"type": "ready"})
+            except Exception:
+                pass
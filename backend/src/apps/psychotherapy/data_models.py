@@ -27,6 +27,29 @@ class AnalysisReport(Struct):
     insights: Annotated[str, Meta(description="Psychological insights and observations")]
 
 
+class MonologueAnalysis(Struct):
+    """LLM output for one monologue: metrics and report."""
+    metrics: Annotated[PsychMetrics, Meta(description="Psychological metrics")]
+    report: Annotated[AnalysisReport, Meta(description="Structured analysis report")]
+
+
+class ProsodyFeatures(Struct):
+    """Acoustic features of the recording."""
+    duration_s: Annotated[float, Meta(description="Audio duration in seconds")]
+    speech_rate_wpm: Annotated[float | None, Meta(description="Words per minute from first to last speech")] = None
+    articulation_rate_wpm: Annotated[float | None, Meta(description="Words per minute excluding pauses")] = None
+    pause_ratio: Annotated[float | None, Meta(description="Share of speaking time spent in pauses of 250 ms or more")] = None
+    pause_count: Annotated[int | None, Meta(description="Number of pauses")] = None
+    mean_pause_s: Annotated[float | None, Meta(description="Mean pause length in seconds")] = None
+    energy_mean_db: Annotated[float | None, Meta(description="Mean speech energy in dBFS")] = None
+    energy_std_db: Annotated[float | None, Meta(description="Speech energy variation in dB")] = None
+    voiced_ratio: Annotated[float | None, Meta(description="Share of speech frames with a detected pitch")] = None
+    f0_mean_hz: Annotated[float | None, Meta(description="Mean fundamental frequency in Hz")] = None
+    f0_std_hz: Annotated[float | None, Meta(description="Fundamental frequency deviation in Hz")] = None
+    f0_range_st: Annotated[float | None, Meta(description="Pitch range (5th-95th percentile) in semitones")] = None
+    jitter_percent: Annotated[float | None, Meta(description="Frame-to-frame pitch period variation (%)")] = None
+
+
 class SessionResult(Struct):
     """Complete session result with metrics, report, and metadata."""
     metrics: Annotated[PsychMetrics, Meta(description="Psychological metrics for the session")]
@@ -34,6 +57,7 @@ class SessionResult(Struct):
     transcription: Annotated[str, Meta(description="Original transcribed text")]
     session_number: Annotated[int, Meta(description="Session number for today")]
     timestamp: datetime = msgspec.field(default_factory=datetime.utcnow)
+    prosody: Annotated[ProsodyFeatures | None, Meta(description="Acoustic features of the recording")] = None
 
 
 METRIC_NAMES = {
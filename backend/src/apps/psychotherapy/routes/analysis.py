@@ -2,13 +2,25 @@
 Psychotherapy tracker API routes.
 """
 
+import asyncio
 import base64
+from datetime import date, datetime
 
 import msgspec
 from litestar import Controller, get, post
+from litestar.exceptions import NotFoundException, ServiceUnavailableException, ValidationException
+from litestar.response import ServerSentEvent, ServerSentEventMessage
+from litestar.status_codes import HTTP_202_ACCEPTED
 
-from src.shared.azure_stt import transcribe_audio_continuous
+from src.settings import get_settings
+from src.shared.audio import TARGET_FORMAT, AudioFormatError
+from src.shared.azure_openai import TRANSIENT_ERRORS as LLM_TRANSIENT_ERRORS
+from src.shared.azure_stt import AzureServiceError, AzureTransientError, transcribe_audio_continuous
+from src.shared.jobs import Job, JobPriority, JobQueueFullError, Stage, get_job_queue
+from src.shared.transcription_cache import get_transcription_cache, transcribe_cached
 from src.apps.psychotherapy.schemas import (
+    AnalyticsResponse,
+    AnalysisJobResponse,
     AnalysisRequest,
     AnalysisResponse,
     LanguageInfo,
@@ -16,10 +28,21 @@ from src.apps.psychotherapy.schemas import (
     MetricsResponse,
     MonologueInfo,
     ReportResponse,
+    ReportSectionEvent,
     SessionResponse,
     SessionsResponse,
+    StreamErrorEvent,
+    TranscriptionEvent,
 )
-from src.apps.psychotherapy.services.analysis import analyze_monologue
+from src.apps.psychotherapy.data_models import ProsodyFeatures, SessionResult
+from src.apps.psychotherapy.services.analysis import (
+    REPORT_SECTIONS,
+    AnalysisError,
+    analyze_monologue,
+    analyze_monologue_stream,
+)
+from src.apps.psychotherapy.services.analytics import session_analytics
+from src.apps.psychotherapy.services.prosody import ProsodyAnalyzer
 from src.apps.psychotherapy.session_storage import get_session_count, get_sessions, store_session
 from src.apps.psychotherapy.languages import LANGUAGES, MONOLOGUES
 
@@ -46,9 +69,105 @@ def _session_to_response(session_data: dict) -> SessionResponse:
         transcription=session_data.get("transcription", ""),
         session_number=session_data.get("session_number", 1),
         timestamp=session_data.get("timestamp", ""),
+        prosody=session_data.get("prosody"),
+    )
+
+
+JOB_KIND = "psychotherapy_analysis"
+# Name of the cached analysis in the transcription cache
+CACHE_ANALYSIS = "psychotherapy_analysis"
+
+
+def store_result(result: SessionResult) -> AnalysisResponse:
+    """Store an analyzed monologue as today's next session (numbered by store_session)."""
+    session_data = {
+        "metrics": msgspec.to_builtins(result.metrics),
+        "report": msgspec.to_builtins(result.report),
+        "transcription": result.transcription,
+        "timestamp": result.timestamp.isoformat(),
+        "session_number": result.session_number,
+        "prosody": msgspec.to_builtins(result.prosody) if result.prosody else None,
+    }
+    session_number = store_session(session_data)
+
+    return AnalysisResponse(
+        session=_session_to_response(session_data),
+        # Sessions are numbered consecutively, so this one's number is the count when it was stored
+        session_count=session_number,
+    )
+
+
+def _transcribe_pcm(pcm: bytes, locale: str) -> tuple[str, ProsodyFeatures | None]:
+    """Transcribe 16 kHz PCM, extracting prosody features from it when enabled."""
+    if not get_settings().PSYCHOTHERAPY_PROSODY:
+        return transcribe_audio_continuous(pcm, locale, audio_format=TARGET_FORMAT), None
+    analyzer = ProsodyAnalyzer()
+    transcription = transcribe_audio_continuous(pcm, locale, audio_format=TARGET_FORMAT, on_pcm=analyzer.feed)
+    return transcription, analyzer.features(len(transcription.split()))
+
+
+async def transcribe_monologue(audio_data: bytes, locale: str) -> tuple[str, str, ProsodyFeatures | None]:
+    """Transcribe a monologue (cached for repeated uploads).
+
+    Returns the audio cache key, the transcription and the prosody features.
+    """
+    audio_key, (transcription, prosody) = await transcribe_cached(
+        audio_data, locale, lambda pcm: _transcribe_pcm(pcm, locale)
+    )
+    return audio_key, transcription, prosody
+
+
+def _cached_analysis(audio_key: str | None) -> SessionResult | None:
+    if not audio_key or not get_settings().TRANSCRIPTION_CACHE_RESULTS:
+        return None
+    return get_transcription_cache().get(audio_key, CACHE_ANALYSIS)
+
+
+def _as_new_session(result: SessionResult) -> SessionResult:
+    # A cached analysis is stored as a new session of its own (store_session assigns its number)
+    return msgspec.structs.replace(result, timestamp=datetime.utcnow())
+
+
+async def analyze_and_store(
+    transcription: str, prosody: ProsodyFeatures | None = None, audio_key: str | None = None
+) -> AnalysisResponse:
+    """Analyze a transcribed monologue and store it as today's next session.
+
+    With the *audio_key* of the recording, the analysis is cached alongside its transcription.
+    """
+    def analyze():
+        # The session number is provisional; store_session assigns the final one
+        return asyncio.to_thread(analyze_monologue, transcription, get_session_count() + 1, prosody)
+
+    if audio_key and get_settings().TRANSCRIPTION_CACHE_RESULTS:
+        result = _as_new_session(await get_transcription_cache().get_or_compute(audio_key, CACHE_ANALYSIS, analyze))
+    else:
+        result = await analyze()
+    return await asyncio.to_thread(store_result, result)
+
+
+def _event(event: str, payload: msgspec.Struct) -> ServerSentEventMessage:
+    return ServerSentEventMessage(event=event, data=msgspec.json.encode(payload).decode())
+
+
+def _job_response(job: Job) -> AnalysisJobResponse:
+    return AnalysisJobResponse(
+        job_id=job.id,
+        status=job.status,
+        stage=job.stage,
+        attempts=job.attempts,
+        error=job.error,
+        result=job.result,
     )
 
 
+def _get_job(job_id: str) -> Job:
+    job = get_job_queue().get(job_id, JOB_KIND)
+    if job is None:
+        raise NotFoundException("Job not found or expired")
+    return job
+
+
 class AnalysisController(Controller):
     path = "/api/psychotherapy"
 
@@ -57,28 +176,87 @@ class AnalysisController(Controller):
         """Process audio: transcribe and analyze monologue."""
         audio_data = base64.b64decode(data.audio_base64)
 
-        session_number = get_session_count() + 1
-
         # Continuous recognition for longer monologues
-        transcription = transcribe_audio_continuous(audio_data, data.locale)
-
-        # Analyze the monologue
-        result = analyze_monologue(transcription, session_number)
-
-        # Store the session
-        session_data = {
-            "metrics": msgspec.to_builtins(result.metrics),
-            "report": msgspec.to_builtins(result.report),
-            "transcription": result.transcription,
-            "timestamp": result.timestamp.isoformat(),
-            "session_number": result.session_number,
-        }
-        store_session(session_data)
-
-        return AnalysisResponse(
-            session=_session_to_response(session_data),
-            session_count=get_session_count(),
-        )
+        audio_key, transcription, prosody = await transcribe_monologue(audio_data, data.locale)
+        return await analyze_and_store(transcription, prosody, audio_key)
+
+    @post("/jobs", status_code=HTTP_202_ACCEPTED)
+    async def submit_analysis_job(
+        self, data: AnalysisRequest, priority: JobPriority = JobPriority.NORMAL
+    ) -> AnalysisJobResponse:
+        """Queue a monologue for background analysis and return its job id."""
+        audio_data = base64.b64decode(data.audio_base64)
+
+        async def transcribe(_):
+            return await transcribe_monologue(audio_data, data.locale)
+
+        async def analyze(transcribed: tuple[str, str, ProsodyFeatures | None]):
+            audio_key, transcription, prosody = transcribed
+            return await analyze_and_store(transcription, prosody, audio_key)
+
+        stages = [
+            Stage("transcribe", transcribe, retry_on=(AzureTransientError,)),
+            Stage("analyze", analyze, retry_on=LLM_TRANSIENT_ERRORS),
+        ]
+        try:
+            job = get_job_queue().submit(JOB_KIND, stages, priority)
+        except JobQueueFullError as e:
+            raise ServiceUnavailableException(str(e)) from e
+        return _job_response(job)
+
+    @get("/jobs/{job_id:str}")
+    async def get_analysis_job(self, job_id: str) -> AnalysisJobResponse:
+        """Get the status (and, once finished, the result) of an analysis job."""
+        return _job_response(_get_job(job_id))
+
+    @get("/jobs/{job_id:str}/events")
+    async def stream_analysis_job(self, job_id: str) -> ServerSentEvent:
+        """Stream analysis job updates as server-sent events until it finishes."""
+        job = _get_job(job_id)
+
+        async def updates():
+            async for update in get_job_queue().watch(job):
+                yield msgspec.json.encode(_job_response(update)).decode()
+
+        return ServerSentEvent(updates(), event_type="job")
+
+    @post("/process/stream")
+    async def process_audio_stream(self, data: AnalysisRequest) -> ServerSentEvent:
+        """Process audio and stream metrics and report sections as server-sent events."""
+        audio_data = base64.b64decode(data.audio_base64)
+
+        async def events():
+            try:
+                audio_key, transcription, prosody = await transcribe_monologue(audio_data, data.locale)
+                yield _event("transcription", TranscriptionEvent(transcription=transcription))
+
+                cached = _cached_analysis(audio_key)
+                if cached is not None:
+                    # Replay the completed events of the cached analysis
+                    yield _event("metrics", MetricsResponse(**msgspec.to_builtins(cached.metrics)))
+                    for section in REPORT_SECTIONS:
+                        text = getattr(cached.report, section)
+                        yield _event("report_section", ReportSectionEvent(section=section, text=text))
+                    yield _event("session", await asyncio.to_thread(store_result, _as_new_session(cached)))
+                    return
+
+                # Provisional session number, see analyze_and_store
+                stream = analyze_monologue_stream(transcription, get_session_count() + 1, prosody)
+                async for kind, payload in stream:
+                    if kind == "metrics":
+                        yield _event(kind, MetricsResponse(**msgspec.to_builtins(payload)))
+                    elif kind == "result":
+                        if get_settings().TRANSCRIPTION_CACHE_RESULTS:
+                            get_transcription_cache().put(audio_key, CACHE_ANALYSIS, payload)
+                        yield _event("session", await asyncio.to_thread(store_result, payload))
+                    else:
+                        section, text = payload
+                        yield _event(kind, ReportSectionEvent(section=section, text=text))
+            # Headers are already sent, so failures are reported as an event
+            except (AzureServiceError, AudioFormatError, AnalysisError) as e:
+                yield _event("error", StreamErrorEvent(detail=str(e)))
+
+        return ServerSentEvent(events())
 
     @get("/sessions")
     async def get_today_sessions(self) -> SessionsResponse:
@@ -88,6 +266,13 @@ class AnalysisController(Controller):
             sessions=[_session_to_response(s) for s in sessions]
         )
 
+    @get("/analytics")
+    async def get_analytics(self, window_days: int | None = None, since: date | None = None) -> AnalyticsResponse:
+        """Get metric trends and recurring themes across sessions."""
+        if window_days is not None and window_days < 1:
+            raise ValidationException("window_days must be at least 1")
+        return msgspec.convert(session_analytics(window_days, since), AnalyticsResponse)
+
     @get("/languages")
     async def get_languages(self) -> LanguagesResponse:
         """Get available languages with monologues."""
@@ -39,6 +39,7 @@ class SessionResponse(msgspec.Struct):
     transcription: Annotated[str, Meta(description="Speech-to-text transcription")]
     session_number: Annotated[int, Meta(ge=1, description="Session number for today")]
     timestamp: Annotated[str, Meta(description="ISO 8601 timestamp of the session")]
+    prosody: Annotated[dict | None, Meta(description="Acoustic features of the recording")] = None
 
 
 class AnalysisResponse(msgspec.Struct):
@@ -47,6 +48,32 @@ class AnalysisResponse(msgspec.Struct):
     session_count: Annotated[int, Meta(ge=0, description="Total sessions today")]
 
 
+class TranscriptionEvent(msgspec.Struct):
+    """Streamed analysis: transcription finished."""
+    transcription: Annotated[str, Meta(description="Speech-to-text transcription")]
+
+
+class ReportSectionEvent(msgspec.Struct):
+    """Streamed analysis: new text of a report section, or the whole section once complete."""
+    section: Annotated[str, Meta(description="summary, key_emotions, concerns_themes or insights")]
+    text: Annotated[str, Meta(description="Section text")]
+
+
+class StreamErrorEvent(msgspec.Struct):
+    """Streamed analysis: analysis failed."""
+    detail: Annotated[str, Meta(description="Error message")]
+
+
+class AnalysisJobResponse(msgspec.Struct):
+    """Status of a background analysis job."""
+    job_id: Annotated[str, Meta(description="Job ID")]
+    status: Annotated[str, Meta(description="queued, running, succeeded or failed")]
+    stage: Annotated[str | None, Meta(description="Current or last stage")] = None
+    attempts: Annotated[int, Meta(ge=0, description="Attempts of the current stage")] = 0
+    error: Annotated[str | None, Meta(description="Error of the failed stage")] = None
+    result: Annotated[AnalysisResponse | None, Meta(description="Result once succeeded")] = None
+
+
 class SessionsResponse(msgspec.Struct):
     """Today's sessions."""
     sessions: Annotated[list[SessionResponse], Meta(description="List of today's sessions")]
@@ -70,3 +97,39 @@ class LanguageInfo(msgspec.Struct):
 class LanguagesResponse(msgspec.Struct):
     """Languages with monologues."""
     languages: Annotated[list[LanguageInfo], Meta(description="Available languages with monologues")]
+
+
+class DailyTrend(msgspec.Struct):
+    """Metric trend for one day with sessions."""
+    date: Annotated[str, Meta(description="ISO date")]
+    sessions: Annotated[int, Meta(ge=1, description="Sessions that day")]
+    mean: Annotated[dict[str, float], Meta(description="Mean of each metric that day")]
+    moving_average: Annotated[dict[str, float], Meta(description="Mean over the trailing window")]
+    volatility: Annotated[dict[str, float], Meta(description="Standard deviation over the trailing window")]
+    delta: Annotated[dict[str, float] | None, Meta(description="Change from the previous day with sessions")] = None
+
+
+class WeeklyTrend(msgspec.Struct):
+    """Metric means for one ISO week."""
+    week: Annotated[str, Meta(description="ISO week, e.g. 2026-W42")]
+    sessions: Annotated[int, Meta(ge=1, description="Sessions that week")]
+    mean: Annotated[dict[str, float], Meta(description="Mean of each metric that week")]
+    delta: Annotated[dict[str, float] | None, Meta(description="Change from the previous week with sessions")] = None
+
+
+class ThemeCluster(msgspec.Struct):
+    """Concerns/themes that recur across sessions."""
+    theme: Annotated[str, Meta(description="Most representative concerns/themes text")]
+    sessions: Annotated[int, Meta(ge=2, description="Sessions with this theme")]
+    first_date: Annotated[str, Meta(description="First session date")]
+    last_date: Annotated[str, Meta(description="Last session date")]
+    mean: Annotated[dict[str, float], Meta(description="Mean metrics of these sessions")]
+
+
+class AnalyticsResponse(msgspec.Struct):
+    """Cross-session trends and recurring themes."""
+    session_count: Annotated[int, Meta(ge=0, description="Sessions analyzed")]
+    window_days: Annotated[int, Meta(ge=1, description="Trailing window of the moving averages")]
+    daily: Annotated[list[DailyTrend], Meta(description="Trend per day")]
+    weekly: Annotated[list[WeeklyTrend], Meta(description="Trend per week")]
+    themes: Annotated[list[ThemeCluster], Meta(description="Recurring themes, most frequent first")]
@@ -2,11 +2,27 @@
 Azure OpenAI service for analyzing psychotherapy monologues.
 """
 
-import json
-
-from src.shared.azure_openai import get_openai_client
-from src.settings import get_settings
-from src.apps.psychotherapy.data_models import PsychMetrics, AnalysisReport, SessionResult
+from collections.abc import AsyncIterator
+from typing import Any
+
+import msgspec
+
+from src.shared.json_stream import JSONStreamScanner
+from src.shared.structured_output import (
+    StructuredOutputError,
+    complete_structured_sync,
+    decode_structured,
+    repair_structured,
+    stream_structured,
+)
+from src.apps.psychotherapy.data_models import (
+    AnalysisReport,
+    MonologueAnalysis,
+    ProsodyFeatures,
+    PsychMetrics,
+    SessionResult,
+)
+from src.apps.psychotherapy.services.prosody import prosody_context
 
 
 class AnalysisError(Exception):
@@ -41,6 +57,7 @@ Analyze the transcribed monologue and provide:
 - Offer hope and validation
 - Keep report sections concise (2-4 sentences each)
 - Base metrics only on what was actually expressed
+- Voice features (speech rate, pauses, pitch, loudness) may follow the monologue in brackets; use them only as supporting context, never as the sole basis for a metric
 
 ## Output Format
 Return ONLY valid JSON matching this schema:
@@ -63,14 +80,29 @@ Return ONLY valid JSON matching this schema:
 
 Now analyze the following monologue and return ONLY the JSON response:"""
 
+REPORT_SECTIONS = AnalysisReport.__struct_fields__
+
+
+def _messages(transcription: str, prosody: ProsodyFeatures | None = None) -> list[dict]:
+    context = prosody_context(prosody) if prosody is not None else ""
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"{transcription}\n\n{context}" if context else transcription},
+    ]
+
 
-def analyze_monologue(transcription: str, session_number: int) -> SessionResult:
+def analyze_monologue(
+    transcription: str,
+    session_number: int,
+    prosody: ProsodyFeatures | None = None,
+) -> SessionResult:
     """
     Analyze a transcribed monologue using Azure OpenAI.
 
     Args:
         transcription: The transcribed text from speech recognition
         session_number: The session number for today
+        prosody: Acoustic features of the recording, passed to the LLM as context
 
     Returns:
         SessionResult object with metrics, report, and metadata
@@ -81,39 +113,85 @@ def analyze_monologue(transcription: str, session_number: int) -> SessionResult:
     if not transcription.strip():
         raise AnalysisError("No transcription provided")
 
-    settings = get_settings()
-
     try:
-        client = get_openai_client()
-
-        response = client.chat.completions.create(
-            model=settings.AZURE_OPENAI_DEPLOYMENT,
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": transcription},
-            ],
-            response_format={"type": "json_object"},
-        )
-
-        result_text = response.choices[0].message.content
-        if not result_text:
-            raise AnalysisError("Empty response from LLM")
-
-        result_data = json.loads(result_text)
-
-        metrics = PsychMetrics(**result_data.get("metrics", {}))
-        report = AnalysisReport(**result_data.get("report", {}))
+        analysis = complete_structured_sync(_messages(transcription, prosody), MonologueAnalysis)
 
         return SessionResult(
-            metrics=metrics,
-            report=report,
+            metrics=analysis.metrics,
+            report=analysis.report,
             transcription=transcription,
             session_number=session_number,
+            prosody=prosody,
         )
 
-    except json.JSONDecodeError as e:
-        raise AnalysisError(f"Failed to parse LLM response as JSON: {str(e)}")
-    except AnalysisError:
-        raise
+    except StructuredOutputError as e:
+        raise AnalysisError(f"Invalid analysis from LLM: {str(e)}")
+    except Exception as e:
+        raise AnalysisError(f"Analysis failed: {str(e)}")
+
+
+async def analyze_monologue_stream(
+    transcription: str,
+    session_number: int,
+    prosody: ProsodyFeatures | None = None,
+) -> AsyncIterator[tuple[str, Any]]:
+    """
+    Streaming variant of analyze_monologue.
+
+    Args:
+        transcription: The transcribed text from speech recognition
+        session_number: The session number for today
+        prosody: Acoustic features of the recording, passed to the LLM as context
+
+    Yields:
+        ("metrics", PsychMetrics) as soon as the metrics object is complete (or after
+        the repair, if they were invalid),
+        ("report_delta", (section, text)) while a report section is generated,
+        ("report_section", (section, text)) when a section is complete, and
+        finally ("result", SessionResult) decoded from the full completion (after the
+        same schema repairs as analyze_monologue, if it is invalid)
+
+    Raises:
+        AnalysisError: If analysis fails
+    """
+    if not transcription.strip():
+        raise AnalysisError("No transcription provided")
+
+    messages = _messages(transcription, prosody)
+    scanner = JSONStreamScanner()
+    metrics_sent = False
+    try:
+        async for chunk in stream_structured(messages, MonologueAnalysis):
+            for kind, path, value in scanner.feed(chunk):
+                if kind == "value" and path == ("metrics",):
+                    try:
+                        metrics = msgspec.json.decode(value, type=PsychMetrics)
+                    except msgspec.ValidationError:
+                        # Out-of-range metrics are repaired once the stream is complete
+                        continue
+                    metrics_sent = True
+                    yield "metrics", metrics
+                elif len(path) == 2 and path[0] == "report" and path[1] in REPORT_SECTIONS:
+                    if kind == "delta":
+                        yield "report_delta", (path[1], value)
+                    else:
+                        yield "report_section", (path[1], msgspec.json.decode(value, type=str))
+        try:
+            analysis = decode_structured(scanner.text, MonologueAnalysis)
+        except StructuredOutputError as e:
+            analysis = await repair_structured(messages, scanner.text, e, MonologueAnalysis)
+            if not metrics_sent:
+                yield "metrics", analysis.metrics
+
+    except (StructuredOutputError, msgspec.ValidationError, msgspec.DecodeError) as e:
+        raise AnalysisError(f"Invalid analysis from LLM: {str(e)}")
     except Exception as e:
         raise AnalysisError(f"Analysis failed: {str(e)}")
+
+    yield "result", SessionResult(
+        metrics=analysis.metrics,
+        report=analysis.report,
+        transcription=transcription,
+        session_number=session_number,
+        prosody=prosody,
+    )
@@ -0,0 +1,227 @@
+"""
+Cross-session analytics: rolling metric trends and recurring themes.
+
+Every stored session is added to an in-memory index holding its metrics, its
+day and the embedding of its concerns_themes, so analytics are array
+operations over cached vectors instead of re-encoding text per request.
+"""
+
+import logging
+import threading
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+
+from src.apps.mcdonalds.services.embeddings import get_embedding_model
+from src.apps.psychotherapy.data_models import PsychMetrics
+from src.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+METRICS = PsychMetrics.__struct_fields__
+# Clusters listed in the analytics (largest first)
+MAX_THEMES = 10
+
+
+def embed_theme(text: str) -> np.ndarray | None:
+    """Normalized embedding of a session's concerns/themes, or None if it cannot be computed."""
+    if not text.strip():
+        return None
+    try:
+        return get_embedding_model().encode(text, normalize_embeddings=True).astype(np.float32)
+    except Exception as e:
+        logger.warning("Theme embedding failed: %s", e)
+        return None
+
+
+class SessionIndex:
+    """Metrics, days and theme vectors of all stored sessions, stacked on demand.
+
+    add() may be called from worker threads; the stacked arrays are rebuilt
+    only after new sessions were added.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._days: list[int] = []
+        self._metrics: list[list[float]] = []
+        self._vectors: list[np.ndarray | None] = []
+        self._themes: list[str] = []
+        self._stacked: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray] | None = None
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def add(self, day: date, session_data: dict) -> None:
+        """Index a stored session (embedding its concerns/themes)."""
+        metrics = session_data.get("metrics", {})
+        theme = session_data.get("report", {}).get("concerns_themes", "")
+        vector = embed_theme(theme)
+        with self._lock:
+            self._days.append(day.toordinal())
+            self._metrics.append([float(metrics.get(name, 5)) for name in METRICS])
+            self._vectors.append(vector)
+            self._themes.append(theme)
+            self._stacked = None
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(day ordinals, metrics (N, 6), theme vectors (M, D), session index of each vector)."""
+        with self._lock:
+            if self._stacked is None:
+                with_vector = [i for i, vector in enumerate(self._vectors) if vector is not None]
+                vectors = (
+                    np.stack([self._vectors[i] for i in with_vector])
+                    if with_vector else np.zeros((0, 0), dtype=np.float32)
+                )
+                self._stacked = (
+                    np.array(self._days, dtype=np.int64),
+                    np.array(self._metrics, dtype=np.float64).reshape(-1, len(METRICS)),
+                    vectors,
+                    np.array(with_vector, dtype=np.int64),
+                )
+            return self._stacked
+
+    def theme(self, index: int) -> str:
+        return self._themes[index]
+
+
+@lru_cache(maxsize=1)
+def get_session_index() -> SessionIndex:
+    return SessionIndex()
+
+
+def _by_metric(values: np.ndarray) -> dict[str, float]:
+    return {name: round(float(value), 2) for name, value in zip(METRICS, values)}
+
+
+def _rolling(days: np.ndarray, metrics: np.ndarray, window_days: int) -> dict:
+    """Daily means plus trailing-window mean and standard deviation, via prefix sums."""
+    order = np.argsort(days, kind="stable")
+    days, metrics = days[order], metrics[order]
+    prefix = np.vstack((np.zeros(metrics.shape[1]), np.cumsum(metrics, axis=0)))
+    prefix_sq = np.vstack((np.zeros(metrics.shape[1]), np.cumsum(metrics ** 2, axis=0)))
+
+    unique_days, starts = np.unique(days, return_index=True)
+    ends = np.append(starts[1:], len(days))
+    counts = (ends - starts)[:, None]
+    daily = (prefix[ends] - prefix[starts]) / counts
+
+    window_start = np.searchsorted(days, unique_days - window_days + 1, side="left")
+    window_count = (ends - window_start)[:, None]
+    moving = (prefix[ends] - prefix[window_start]) / window_count
+    variance = (prefix_sq[ends] - prefix_sq[window_start]) / window_count - moving ** 2
+    volatility = np.sqrt(np.maximum(variance, 0))
+    delta = np.diff(daily, axis=0)
+    return {
+        "days": unique_days, "counts": counts[:, 0], "daily": daily,
+        "moving": moving, "volatility": volatility, "delta": delta,
+    }
+
+
+def _weekly(days: np.ndarray, metrics: np.ndarray) -> list[dict]:
+    # Ordinal 1 (0001-01-01) is a Monday, so ISO weeks start at ordinals 7k + 1
+    weeks = (days - 1) // 7
+    unique_weeks, inverse = np.unique(weeks, return_inverse=True)
+    counts = np.bincount(inverse)
+    sums = np.zeros((len(unique_weeks), metrics.shape[1]))
+    np.add.at(sums, inverse, metrics)
+    means = sums / counts[:, None]
+    result = []
+    for index, week in enumerate(unique_weeks):
+        iso = date.fromordinal(int(week) * 7 + 1).isocalendar()
+        result.append({
+            "week": f"{iso.year}-W{iso.week:02d}",
+            "sessions": int(counts[index]),
+            "mean": _by_metric(means[index]),
+            "delta": _by_metric(means[index] - means[index - 1]) if index else None,
+        })
+    return result
+
+
+def cluster_themes(vectors: np.ndarray, threshold: float, limit: int = MAX_THEMES) -> list[np.ndarray]:
+    """
+    Group normalized vectors whose cosine similarity to a cluster center is at least *threshold*.
+
+    Centers are picked greedily by how many unassigned vectors they are similar
+    to, which keeps clusters tight instead of chaining loosely related themes.
+    Vectors similar to no other one are left out.
+
+    Returns:
+        Row indices of up to *limit* clusters, largest first; the first index is the center
+    """
+    similar = vectors @ vectors.T >= threshold
+    unassigned = np.ones(len(vectors), dtype=bool)
+    # Unassigned vectors similar to each vector (itself included)
+    counts = similar.sum(axis=1)
+    clusters = []
+    while len(clusters) < limit:
+        center = int(np.argmax(np.where(unassigned, counts, 0)))
+        if not unassigned[center] or counts[center] < 2:
+            break
+        members = np.flatnonzero(similar[center] & unassigned)
+        members = np.concatenate(([center], members[members != center]))
+        unassigned[members] = False
+        counts -= similar[:, members].sum(axis=1)
+        clusters.append(members)
+    return clusters
+
+
+def session_analytics(window_days: int | None = None, since: date | None = None) -> dict:
+    """
+    Metric trends and recurring themes over all indexed sessions.
+
+    Args:
+        window_days: Trailing window for moving averages and volatility
+            (default PSYCHOTHERAPY_TREND_WINDOW_DAYS)
+        since: Only include sessions from this day on
+
+    Returns:
+        Dict matching the AnalyticsResponse schema
+    """
+    settings = get_settings()
+    window_days = window_days or settings.PSYCHOTHERAPY_TREND_WINDOW_DAYS
+    index = get_session_index()
+    days, metrics, vectors, vector_sessions = index.arrays()
+
+    selected = days >= since.toordinal() if since else np.ones(len(days), dtype=bool)
+    if not selected.any():
+        return {"session_count": 0, "window_days": window_days, "daily": [], "weekly": [], "themes": []}
+    all_days, all_metrics = days, metrics
+    days, metrics = days[selected], metrics[selected]
+
+    rolling = _rolling(days, metrics, window_days)
+    daily = [
+        {
+            "date": date.fromordinal(int(day)).isoformat(),
+            "sessions": int(rolling["counts"][i]),
+            "mean": _by_metric(rolling["daily"][i]),
+            "moving_average": _by_metric(rolling["moving"][i]),
+            "volatility": _by_metric(rolling["volatility"][i]),
+            "delta": _by_metric(rolling["delta"][i - 1]) if i else None,
+        }
+        for i, day in enumerate(rolling["days"])
+    ]
+
+    themes = []
+    vector_selected = selected[vector_sessions]
+    if vector_selected.any():
+        sessions = vector_sessions[vector_selected]
+        for members in cluster_themes(vectors[vector_selected], settings.PSYCHOTHERAPY_THEME_SIMILARITY):
+            member_sessions = sessions[members]
+            member_days = all_days[member_sessions]
+            themes.append({
+                "theme": index.theme(int(member_sessions[0])),
+                "sessions": len(members),
+                "first_date": date.fromordinal(int(member_days.min())).isoformat(),
+                "last_date": date.fromordinal(int(member_days.max())).isoformat(),
+                "mean": _by_metric(all_metrics[member_sessions].mean(axis=0)),
+            })
+
+    return {
+        "session_count": int(selected.sum()),
+        "window_days": window_days,
+        "daily": daily,
+        "weekly": _weekly(days, metrics),
+        "themes": themes,
+    }
@@ -0,0 +1,183 @@
+"""
+Acoustic (prosodic) features of a monologue, computed from 16 kHz PCM chunk by chunk.
+
+Audio is decimated to 8 kHz and cut into 40 ms frames every 20 ms. Each block
+of frames is analyzed at once with NumPy: RMS energy, and F0 from the
+normalized autocorrelation (computed via FFT) of the frames loud enough to be
+speech. Only two floats per frame are kept, so memory grows with the frame
+count rather than the sample count.
+"""
+
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.apps.psychotherapy.data_models import ProsodyFeatures
+
+SAMPLE_RATE = 8000
+FRAME = 320  # 40 ms
+HOP = 160  # 20 ms
+MIN_F0 = 60.0
+MAX_F0 = 400.0
+# Normalized autocorrelation peak above which a frame counts as voiced
+VOICING_THRESHOLD = 0.5
+# Frames quieter than this are not analyzed for pitch
+PITCH_FLOOR_DB = -50.0
+# Speech: louder than the noise floor (10th percentile) by this margin
+SPEECH_MARGIN_DB = 12.0
+MIN_PAUSE_S = 0.25
+
+# Frame plus the longest lag, so the circular autocorrelation does not wrap
+_FFT_SIZE = 512
+# Shortest lag whose peak is this close to the highest, against octave errors
+_OCTAVE_TOLERANCE = 0.9
+_MIN_LAG = int(SAMPLE_RATE / MAX_F0)
+_MAX_LAG = int(math.ceil(SAMPLE_RATE / MIN_F0))
+_WINDOW = np.hanning(FRAME).astype(np.float32)
+# Autocorrelation of the window, to undo its taper (Boersma 1993)
+_WINDOW_AC = np.correlate(_WINDOW, _WINDOW, "full")[FRAME - 1:FRAME + _MAX_LAG + 1]
+_WINDOW_AC = (_WINDOW_AC / _WINDOW_AC[0]).astype(np.float32)
+
+
+class ProsodyAnalyzer:
+    """Accumulates frame energy and F0 from 16 kHz 16-bit mono PCM fed in chunks."""
+
+    def __init__(self) -> None:
+        self._odd = np.zeros(0, dtype=np.float32)  # 16 kHz sample left over from decimation
+        self._carry = np.zeros(0, dtype=np.float32)  # 8 kHz samples not yet framed
+        self._energy_db: list[np.ndarray] = []
+        self._f0: list[np.ndarray] = []
+        self._samples = 0
+
+    def feed(self, pcm: bytes) -> None:
+        """Analyze the next chunk of 16 kHz 16-bit mono PCM."""
+        samples = np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768.0
+        self._samples += len(samples)
+        samples = np.concatenate((self._odd, samples))
+        even = len(samples) // 2 * 2
+        self._odd = samples[even:]
+        # Averaging sample pairs is a sufficient low-pass for F0 below 400 Hz
+        decimated = (samples[0:even:2] + samples[1:even:2]) * 0.5
+
+        buffer = np.concatenate((self._carry, decimated))
+        if len(buffer) < FRAME:
+            self._carry = buffer
+            return
+        # A frame is two consecutive hops, so per-frame sums come from per-hop sums
+        hops = buffer[:len(buffer) // HOP * HOP].reshape(-1, HOP)
+        frames = sliding_window_view(buffer, FRAME)[::HOP]
+        self._carry = buffer[len(frames) * HOP:].copy()
+        self._analyze(frames, hops.sum(axis=1), np.einsum("ij,ij->i", hops, hops))
+
+    def _analyze(self, frames: np.ndarray, hop_sums: np.ndarray, hop_squares: np.ndarray) -> None:
+        mean = (hop_sums[:-1] + hop_sums[1:]) / FRAME
+        power = (hop_squares[:-1] + hop_squares[1:]) / FRAME - mean * mean
+        energy_db = 10.0 * np.log10(np.maximum(power, 0) + 1e-10)
+        f0 = np.full(len(frames), np.nan, dtype=np.float32)
+
+        loud = np.flatnonzero(energy_db > PITCH_FLOOR_DB)
+        if len(loud):
+            spectrum = np.fft.rfft((frames[loud] - mean[loud, None]) * _WINDOW, n=_FFT_SIZE)
+            ac = np.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, n=_FFT_SIZE)[:, :_MAX_LAG + 2]
+            ac = ac / (ac[:, :1] + 1e-12) / _WINDOW_AC
+            search = ac[:, _MIN_LAG - 1:_MAX_LAG + 2]
+            middle = search[:, 1:-1]
+            local_peaks = (middle > search[:, :-2]) & (middle >= search[:, 2:])
+            best = np.max(np.where(local_peaks, middle, -1.0), axis=1, keepdims=True)
+            lags = _MIN_LAG + np.argmax(local_peaks & (middle >= _OCTAVE_TOLERANCE * best), axis=1)
+            rows = np.arange(len(loud))
+            peak = ac[rows, lags]
+            # Parabolic interpolation around the peak for sub-sample lag
+            left, right = ac[rows, lags - 1], ac[rows, lags + 1]
+            curvature = left - 2 * peak + right
+            offset = np.where(curvature < 0, 0.5 * (left - right) / np.where(curvature < 0, curvature, -1), 0.0)
+            voiced = peak >= VOICING_THRESHOLD
+            f0[loud[voiced]] = SAMPLE_RATE / (lags[voiced] + offset[voiced])
+
+        self._energy_db.append(energy_db.astype(np.float32))
+        self._f0.append(f0)
+
+    def features(self, word_count: int | None = None) -> ProsodyFeatures:
+        """
+        Summarize the audio fed so far.
+
+        Args:
+            word_count: Words in the transcription, for speech and articulation rate
+
+        Returns:
+            ProsodyFeatures (fields are None when the audio has no speech)
+        """
+        duration = self._samples / (2 * SAMPLE_RATE)
+        if not self._energy_db:
+            return ProsodyFeatures(duration_s=round(duration, 2))
+        energy_db = np.concatenate(self._energy_db)
+        f0 = np.concatenate(self._f0)
+        hop_s = HOP / SAMPLE_RATE
+
+        speech = energy_db > max(np.percentile(energy_db, 10) + SPEECH_MARGIN_DB, PITCH_FLOOR_DB - 10)
+        active = np.flatnonzero(speech)
+        if not len(active):
+            return ProsodyFeatures(duration_s=round(duration, 2))
+
+        # Pauses: silent runs of at least MIN_PAUSE_S between the first and last speech frame
+        inner = ~speech[active[0]:active[-1] + 1]
+        edges = np.diff(np.concatenate(([0], inner.astype(np.int8), [0])))
+        runs = (np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)) * hop_s
+        pauses = runs[runs >= MIN_PAUSE_S]
+        speaking_s = len(inner) * hop_s
+        articulation_s = speaking_s - float(pauses.sum())
+
+        voiced = f0[~np.isnan(f0)]
+        f0_stats = {}
+        if len(voiced) >= 2:
+            low, high = np.percentile(voiced, (5, 95))
+            # Local jitter from consecutive voiced frames' periods
+            periods = 1.0 / f0
+            steps = np.abs(np.diff(periods))
+            steps = steps[~np.isnan(steps)]
+            f0_stats = {
+                "f0_mean_hz": round(float(voiced.mean()), 1),
+                "f0_std_hz": round(float(voiced.std()), 1),
+                "f0_range_st": round(float(12 * np.log2(high / low)), 1),
+                "jitter_percent": (
+                    round(float(100 * steps.mean() / np.nanmean(periods)), 2) if len(steps) else None
+                ),
+            }
+
+        speech_db = energy_db[speech]
+        return ProsodyFeatures(
+            duration_s=round(duration, 2),
+            speech_rate_wpm=round(60 * word_count / speaking_s, 1) if word_count else None,
+            articulation_rate_wpm=(
+                round(60 * word_count / articulation_s, 1) if word_count and articulation_s > 0 else None
+            ),
+            pause_ratio=round(float(pauses.sum() / speaking_s), 3),
+            pause_count=len(pauses),
+            mean_pause_s=round(float(pauses.mean()), 2) if len(pauses) else None,
+            energy_mean_db=round(float(speech_db.mean()), 1),
+            energy_std_db=round(float(speech_db.std()), 1),
+            voiced_ratio=round(len(voiced) / len(active), 3),
+            **f0_stats,
+        )
+
+
+def prosody_context(features: ProsodyFeatures) -> str:
+    """One-line summary of the features for the LLM prompt."""
+    parts = []
+    if features.speech_rate_wpm is not None:
+        parts.append(f"speech rate {features.speech_rate_wpm:.0f} wpm")
+    if features.pause_ratio is not None:
+        pause = f"pauses {100 * features.pause_ratio:.0f}% of speaking time"
+        if features.mean_pause_s is not None:
+            pause += f" (mean {features.mean_pause_s:.1f} s)"
+        parts.append(pause)
+    if features.f0_mean_hz is not None:
+        parts.append(
+            f"pitch {features.f0_mean_hz:.0f}±{features.f0_std_hz:.0f} Hz, range {features.f0_range_st:.1f} st"
+        )
+    if features.energy_std_db is not None:
+        parts.append(f"loudness variation {features.energy_std_db:.1f} dB")
+    if features.jitter_percent is not None:
+        parts.append(f"jitter {features.jitter_percent:.1f}%")
+    return f"[Voice features: {', '.join(parts)}]" if parts else ""
@@ -3,10 +3,14 @@ Session storage for psychotherapy tracker.
 In-memory store (resets on server restart).
 """
 
+import threading
 from datetime import date
 
+from src.apps.psychotherapy.services.analytics import get_session_index
 
 _sessions: dict[str, list[dict]] = {}
+# Sessions are stored from worker threads
+_lock = threading.Lock()
 
 
 def _get_today() -> str:
@@ -17,16 +21,18 @@ def _get_today() -> str:
 def store_session(session_data: dict) -> int:
     """
     Store a session and return session number for today (1-indexed).
+
+    The number is assigned here, overwriting any session_number in *session_data*.
     """
     today = _get_today()
 
-    if today not in _sessions:
-        _sessions[today] = []
-
-    session_number = len(_sessions[today]) + 1
-    session_data["session_number"] = session_number
+    with _lock:
+        sessions = _sessions.setdefault(today, [])
+        session_number = len(sessions) + 1
+        session_data["session_number"] = session_number
 
-    _sessions[today].append(session_data)
+        sessions.append(session_data)
+        get_session_index().add(date.fromisoformat(today), session_data)
 
     return session_number
 
@@ -34,7 +40,8 @@ def store_session(session_data: dict) -> int:
 def get_sessions() -> list[dict]:
     """Get all sessions for today."""
     today = _get_today()
-    return _sessions.get(today, [])
+    with _lock:
+        return list(_sessions.get(today, []))
 
 
 def get_session_count() -> int:
@@ -0,0 +1,170 @@
+import asyncio
+import base64
+import logging
+import time
+from dataclasses import dataclass, field
+
+import msgspec
+from litestar import WebSocket
+from litestar.handlers import WebsocketListener
+
+from src.apps.transport.languages import get_voice_for_locale
+from src.apps.transport.services.interpreter import SentenceInterpreter
+from src.settings import TTSOutputFormat
+from src.shared.azure_tts import get_synthesizer_pool
+from src.shared.audio import TARGET_SAMPLE_RATE, AudioFormat, AudioFormatError, PCMConverter
+from src.shared.stt import create_streaming_session
+from src.shared.stt.streaming import StreamingSTTSession
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ConnectionState:
+    stt_session: StreamingSTTSession | None = None
+    converter: PCMConverter = field(default_factory=PCMConverter)
+    interpreter: SentenceInterpreter | None = None
+    first_audio_at: float | None = None
+    first_result_logged: bool = False
+
+
+class InterpreterWSListener(WebsocketListener):
+    """Live interpreter: streams translated speech back sentence by sentence."""
+
+    path = "/ws/transport/interpret"
+    receive_mode = "text"
+    send_mode = "text"
+
+    _connections: dict[int, ConnectionState] = {}
+
+    async def on_accept(self, socket: WebSocket) -> None:
+        self._connections[id(socket)] = ConnectionState()
+
+    async def on_receive(self, data: str, socket: WebSocket) -> None:
+        try:
+            msg = msgspec.json.decode(data.encode() if isinstance(data, str) else data)
+        except Exception:
+            return
+
+        if not isinstance(msg, dict):
+            return
+
+        msg_type = msg.get("type")
+        conn = self._connections.get(id(socket))
+        if conn is None:
+            return
+
+        if msg_type == "start":
+            await self._handle_start(msg, conn, socket)
+        elif msg_type == "audio":
+            await self._handle_audio(msg, conn, socket)
+        elif msg_type == "stop":
+            await self._handle_stop(conn, socket)
+
+    async def on_disconnect(self, socket: WebSocket) -> None:
+        conn = self._connections.pop(id(socket), None)
+        if conn:
+            await self._release(conn)
+
+    @staticmethod
+    async def _release(conn: ConnectionState) -> None:
+        """Stop the connection's recognizer and interpreter."""
+        stt_session, conn.stt_session = conn.stt_session, None
+        if stt_session:
+            await stt_session.stop()
+        interpreter, conn.interpreter = conn.interpreter, None
+        if interpreter:
+            await interpreter.close()
+
+    async def _handle_start(
+        self, msg: dict, conn: ConnectionState, socket: WebSocket
+    ) -> None:
+        source_locale = msg.get("source_locale", "en-US")
+        target_locales = [
+            locale for locale in (msg.get("target_locale_1"), msg.get("target_locale_2")) if locale
+        ]
+
+        try:
+            conn.converter = PCMConverter(AudioFormat(
+                sample_rate=int(msg.get("sample_rate", TARGET_SAMPLE_RATE)),
+                channels=int(msg.get("channels", 1)),
+                encoding=msg.get("encoding", "pcm_s16le"),
+            ))
+            output_format = TTSOutputFormat(msg["output_format"]) if msg.get("output_format") else None
+        except (AudioFormatError, TypeError, ValueError) as e:
+            await socket.send_json({"type": "error", "message": str(e)})
+            return
+        if not target_locales:
+            await socket.send_json({"type": "error", "message": "No target language given"})
+            return
+
+        # A repeated start replaces the running session
+        await self._release(conn)
+
+        # Connect the target voices while the first sentence is being spoken
+        for locale in target_locales:
+            asyncio.get_running_loop().run_in_executor(
+                None, get_synthesizer_pool().warm, get_voice_for_locale(locale), output_format
+            )
+
+        async def send(message: dict) -> None:
+            if message["type"] == "audio" and not conn.first_result_logged and conn.first_audio_at:
+                conn.first_result_logged = True
+                logger.info(
+                    "Interpreter: first translated audio %.0fms after first speech audio",
+                    (time.perf_counter() - conn.first_audio_at) * 1000,
+                )
+            await socket.send_json(message)
+
+        conn.interpreter = SentenceInterpreter(send, source_locale, target_locales, output_format)
+        conn.first_audio_at = None
+        conn.first_result_logged = False
+
+        stt_session = create_streaming_session()
+        conn.stt_session = stt_session
+
+        async def on_interim(text: str) -> None:
+            try:
+                await socket.send_json({"type": "interim", "text": text})
+            except Exception:
+                pass
+
+        async def on_final(text: str) -> None:
+            seq = conn.interpreter.submit(text)
+            try:
+                await socket.send_json({"type": "sentence", "seq": seq, "text": text})
+            except Exception:
+                pass
+
+        await stt_session.start(source_locale, on_interim, on_final)
+        await socket.send_json({"type": "connected"})
+
+    async def _handle_audio(self, msg: dict, conn: ConnectionState, socket: WebSocket) -> None:
+        if not conn.stt_session:
+            return
+        audio_b64 = msg.get("data")
+        if not audio_b64:
+            return
+        pcm_bytes = conn.converter.convert(base64.b64decode(audio_b64))
+        if not pcm_bytes:
+            return
+        if conn.first_audio_at is None:
+            conn.first_audio_at = time.perf_counter()
+        try:
+            await conn.stt_session.send_audio(pcm_bytes)
+        except Exception:
+            logger.exception("STT session failed")
+            stt_session, conn.stt_session = conn.stt_session, None
+            await socket.send_json({"type": "error", "message": "Speech recognition failed"})
+            await stt_session.stop()
+
+    async def _handle_stop(self, conn: ConnectionState, socket: WebSocket) -> None:
+        if conn.stt_session:
+            tail = conn.converter.flush()
+            if tail:
+                await conn.stt_session.send_audio(tail)
+            await conn.stt_session.stop()
+            conn.stt_session = None
+        if conn.interpreter:
+            await conn.interpreter.drain()
+        await socket.send_json({"type": "done"})
@@ -3,10 +3,15 @@ Transport translation API routes.
 """
 
 import base64
+import uuid
 
-from litestar import Controller, get, post
+import msgspec
+from litestar import Controller, Response, get, post
+from litestar.exceptions import NotFoundException, ValidationException
+from litestar.response import Stream
 
 from src.apps.transport.schemas import (
+    AudioDelivery,
     LanguageInfo,
     LanguageResult,
     LanguagesResponse,
@@ -14,7 +19,54 @@ from src.apps.transport.schemas import (
     TranslationResponse,
 )
 from src.apps.transport.services.translation import process_recording
-from src.apps.transport.languages import LANGUAGES
+from src.apps.transport.languages import LANGUAGES, get_voice_for_locale
+from src.settings import TTSOutputFormat
+from src.shared.azure_tts import (
+    AUDIO_MIME_TYPES,
+    audio_to_base64,
+    resolve_output_format,
+    speech_cache_key,
+    stream_speech,
+)
+from src.shared.tts_cache import TTSCache, get_tts_cache
+
+_RESULT_KEYS = ("original", "translation_1", "translation_2")
+# Slice size when streaming memory-mapped audio from the disk tier
+_STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def _audio_response(audio: bytes | memoryview, media_type: str) -> Response:
+    """Respond with cached audio without copying it as a whole."""
+    if isinstance(audio, bytes):
+        return Response(content=audio, media_type=media_type)
+    # Disk hits are memory maps; send them in slices so the file is never copied to the heap at once
+    return Stream(
+        (bytes(audio[start:start + _STREAM_CHUNK_BYTES]) for start in range(0, len(audio), _STREAM_CHUNK_BYTES)),
+        media_type=media_type,
+        headers={"Content-Length": str(len(audio))},
+    )
+
+
+def _language_result(result: dict, output_format: TTSOutputFormat, delivery: AudioDelivery | None) -> LanguageResult:
+    """Build a LanguageResult; delivery None leaves the audio out (sent as a multipart part)."""
+    return LanguageResult(
+        locale=result["locale"],
+        text=result["text"],
+        audio_base64=audio_to_base64(result["audio"]) if delivery == AudioDelivery.BASE64 else None,
+        audio_url=(
+            f"/api/transport/audio/{output_format}/{result['audio_key']}"
+            if delivery == AudioDelivery.URL else None
+        ),
+        audio_mime_type=AUDIO_MIME_TYPES[output_format],
+    )
+
+
+def _translation_response(
+    result: dict, output_format: TTSOutputFormat, delivery: AudioDelivery | None
+) -> TranslationResponse:
+    return TranslationResponse(
+        **{key: _language_result(result[key], output_format, delivery) for key in _RESULT_KEYS}
+    )
 
 
 class TranslateController(Controller):
@@ -24,15 +76,81 @@ class TranslateController(Controller):
     async def process_audio(self, data: TranslationRequest) -> TranslationResponse:
         """Process audio: transcribe, translate to 2 languages, synthesize TTS."""
         audio_data = base64.b64decode(data.audio_base64)
-        result = process_recording(
-            audio_data, data.source_locale, data.target_locale_1, data.target_locale_2
+        output_format = resolve_output_format(data.output_format)
+        result = await process_recording(
+            audio_data, data.source_locale, data.target_locale_1, data.target_locale_2, output_format
         )
-        return TranslationResponse(
-            original=LanguageResult(**result["original"]),
-            translation_1=LanguageResult(**result["translation_1"]),
-            translation_2=LanguageResult(**result["translation_2"]),
+        return _translation_response(result, output_format, data.audio_delivery)
+
+    @post("/process/multipart")
+    async def process_audio_multipart(self, data: TranslationRequest) -> Response[bytes]:
+        """Process audio; return JSON text results plus the three audio clips as binary parts."""
+        audio_data = base64.b64decode(data.audio_base64)
+        output_format = resolve_output_format(data.output_format)
+        result = await process_recording(
+            audio_data, data.source_locale, data.target_locale_1, data.target_locale_2, output_format
         )
 
+        # multipart/mixed: the JSON part first, then one part per clip with Content-ID = result key
+        boundary = uuid.uuid4().hex
+        mime_type = AUDIO_MIME_TYPES[output_format]
+        parts: list[bytes | memoryview] = [
+            f"--{boundary}\r\nContent-Type: application/json\r\n\r\n".encode(),
+            msgspec.json.encode(_translation_response(result, output_format, None)),
+        ]
+        for key in _RESULT_KEYS:
+            audio = result[key]["audio"]
+            parts.append(
+                f"\r\n--{boundary}\r\nContent-Type: {mime_type}\r\n"
+                f"Content-ID: <{key}>\r\nContent-Length: {len(audio)}\r\n\r\n".encode()
+            )
+            parts.append(audio)
+        parts.append(f"\r\n--{boundary}--\r\n".encode())
+
+        return Response(content=b"".join(parts), media_type=f"multipart/mixed; boundary={boundary}")
+
+    @get("/audio/{output_format:str}/{key:str}")
+    async def get_audio(self, output_format: str, key: str) -> Response:
+        """Serve synthesized audio from the TTS cache (URLs expire when the entry is evicted)."""
+        if output_format not in AUDIO_MIME_TYPES or TTSCache.key_format(key) != output_format:
+            raise NotFoundException("Audio not found or expired")
+        audio = get_tts_cache().get(key)
+        if audio is None:
+            raise NotFoundException("Audio not found or expired")
+        return _audio_response(audio, AUDIO_MIME_TYPES[TTSOutputFormat(output_format)])
+
+    @get("/speak")
+    async def speak(self, text: str, locale: str, output_format: str | None = None) -> Response:
+        """Stream synthesized speech as chunked audio so playback can start after the first chunk."""
+        if output_format is not None and output_format not in AUDIO_MIME_TYPES:
+            raise ValidationException(f"Unsupported output format: {output_format}")
+        fmt = resolve_output_format(TTSOutputFormat(output_format) if output_format else None)
+        voice = get_voice_for_locale(locale)
+        cache = get_tts_cache()
+        key = speech_cache_key(text, voice, fmt)
+
+        cached = cache.get(key)
+        if cached is not None:
+            return _audio_response(cached, AUDIO_MIME_TYPES[fmt])
+
+        # Wait for the first chunk so synthesis errors still produce an error response
+        speech = stream_speech(text, voice, fmt)
+        first = await anext(speech)
+
+        async def chunks():
+            received = [first]
+            try:
+                yield first
+                async for chunk in speech:
+                    received.append(chunk)
+                    yield chunk
+            finally:
+                # Release the pooled synthesizer right away if the client disconnects mid-stream
+                await speech.aclose()
+            await cache.put(key, b"".join(received))
+
+        return Stream(chunks(), media_type=AUDIO_MIME_TYPES[fmt])
+
     @get("/languages")
     async def get_languages(self) -> LanguagesResponse:
         """Get available languages."""
@@ -2,11 +2,19 @@
 Request/response schemas for the transport translation app.
 """
 
+from enum import StrEnum
 from typing import Annotated
 
 import msgspec
 from msgspec import Meta
 
+from src.settings import TTSOutputFormat
+
+
+class AudioDelivery(StrEnum):
+    BASE64 = "base64"
+    URL = "url"
+
 
 class TranslationRequest(msgspec.Struct):
     """Audio translation request."""
@@ -14,13 +22,21 @@ class TranslationRequest(msgspec.Struct):
     source_locale: Annotated[str, Meta(description="Source language locale code")]
     target_locale_1: Annotated[str, Meta(description="First target language locale code")]
     target_locale_2: Annotated[str, Meta(description="Second target language locale code")]
+    output_format: Annotated[
+        TTSOutputFormat | None, Meta(description="Synthesized audio format (wav, pcm, mp3, opus)")
+    ] = None
+    audio_delivery: Annotated[
+        AudioDelivery, Meta(description="Embed audio as base64 or return short-lived audio URLs")
+    ] = AudioDelivery.BASE64
 
 
 class LanguageResult(msgspec.Struct):
     """Translation result for a single language."""
     locale: Annotated[str, Meta(description="Language locale code")]
     text: Annotated[str, Meta(description="Translated text")]
-    audio_base64: Annotated[str, Meta(description="Base64-encoded synthesized audio")]
+    audio_base64: Annotated[str | None, Meta(description="Base64-encoded synthesized audio")] = None
+    audio_url: Annotated[str | None, Meta(description="URL of the synthesized audio")] = None
+    audio_mime_type: Annotated[str, Meta(description="MIME type of the synthesized audio")] = "audio/wav"
 
 
 class TranslationResponse(msgspec.Struct):
@@ -0,0 +1,161 @@
+"""
+Sentence-by-sentence interpretation for the live transport WebSocket.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Awaitable
+
+from src.apps.transport.languages import get_translator_code, get_voice_for_locale
+from src.settings import TTSOutputFormat
+from src.shared.azure_translator import get_translator_client
+from src.shared.azure_tts import (
+    AUDIO_MIME_TYPES,
+    audio_to_base64,
+    resolve_output_format,
+    speech_cache_key,
+    stream_speech,
+)
+from src.shared.tts_cache import get_tts_cache
+
+logger = logging.getLogger(__name__)
+
+
+class SentenceInterpreter:
+    """Translates and voices each finalized sentence as soon as it arrives.
+
+    Every sentence is translated into all targets with one Translator request,
+    then each target is synthesized concurrently with other sentences. Audio
+    is streamed as "audio" chunks while Azure produces it, followed by
+    "audio_end", and the complete audio is cached afterwards. Results are sent
+    per target in sentence order: the messages for sentence n of a target go
+    out only after those of sentence n - 1, so chunks of a sentence that
+    finishes first are held until the previous one has been sent.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[dict], Awaitable[None]],
+        source_locale: str,
+        target_locales: list[str],
+        output_format: TTSOutputFormat | None = None,
+    ) -> None:
+        self._send = send
+        self._source_locale = source_locale
+        self._target_locales = target_locales
+        self._output_format = resolve_output_format(output_format)
+        self._seq = 0
+        loop = asyncio.get_running_loop()
+        self._tails: dict[str, asyncio.Future] = {}
+        for locale in target_locales:
+            self._tails[locale] = loop.create_future()
+            self._tails[locale].set_result(None)
+        self._tasks: set[asyncio.Task] = set()
+
+    def submit(self, text: str) -> int:
+        """Start interpreting a finalized sentence; returns its sequence number."""
+        seq = self._seq
+        self._seq += 1
+        received = time.perf_counter()
+        translation = asyncio.create_task(self._translate(text))
+
+        loop = asyncio.get_running_loop()
+        for locale in self._target_locales:
+            previous, done = self._tails[locale], loop.create_future()
+            self._tails[locale] = done
+            task = asyncio.create_task(self._speak(seq, locale, translation, previous, done, received))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return seq
+
+    async def drain(self) -> None:
+        """Wait until every submitted sentence has been delivered."""
+        await asyncio.gather(*self._tails.values())
+
+    async def close(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _translate(self, text: str) -> dict[str, str]:
+        return await get_translator_client().translate(
+            text,
+            get_translator_code(self._source_locale),
+            [get_translator_code(locale) for locale in self._target_locales],
+        )
+
+    async def _speak(
+        self,
+        seq: int,
+        locale: str,
+        translation: asyncio.Task,
+        previous: asyncio.Future,
+        done: asyncio.Future,
+        received: float,
+    ) -> None:
+        chunks: asyncio.Queue[bytes | memoryview | Exception | None] = asyncio.Queue()
+        synthesis = None
+        try:
+            text = None
+            try:
+                text = (await translation)[get_translator_code(locale)]
+                synthesis = asyncio.create_task(self._synthesize(text, locale, chunks))
+            except Exception:
+                logger.exception("Translating sentence %d into %s failed", seq, locale)
+
+            await previous
+            if synthesis is None:
+                await self._send({"type": "error", "seq": seq, "locale": locale,
+                                  "message": "Translation failed"})
+                return
+            await self._send({"type": "translation", "seq": seq, "locale": locale, "text": text})
+            index = 0
+            while (chunk := await chunks.get()) is not None:
+                if isinstance(chunk, Exception):
+                    await self._send({"type": "error", "seq": seq, "locale": locale,
+                                      "message": "Speech synthesis failed"})
+                    return
+                await self._send({
+                    "type": "audio",
+                    "seq": seq,
+                    "locale": locale,
+                    "chunk": index,
+                    "mime_type": AUDIO_MIME_TYPES[self._output_format],
+                    "data": audio_to_base64(chunk),
+                    "latency_ms": round((time.perf_counter() - received) * 1000),
+                })
+                index += 1
+            await self._send({"type": "audio_end", "seq": seq, "locale": locale, "chunks": index})
+        except Exception:
+            logger.debug("Interpreter delivery for sentence %d failed", seq, exc_info=True)
+        finally:
+            if synthesis is not None and not synthesis.done():
+                synthesis.cancel()
+            done.set_result(None)
+
+    async def _synthesize(self, text: str, locale: str, chunks: asyncio.Queue) -> None:
+        """Queue the audio of *text* chunk by chunk (then None), from the TTS cache or a stream."""
+        voice = get_voice_for_locale(locale)
+        cache = get_tts_cache()
+        key = speech_cache_key(text, voice, self._output_format)
+        try:
+            cached = cache.get(key)
+            if cached is not None:
+                chunks.put_nowait(cached)
+                return
+            speech = stream_speech(text, voice, self._output_format)
+            received = []
+            try:
+                async for chunk in speech:
+                    received.append(chunk)
+                    chunks.put_nowait(chunk)
+            finally:
+                # Stops the synthesis when the sentence is abandoned
+                await speech.aclose()
+            await cache.put(key, b"".join(received))
+        except Exception as e:
+            logger.exception("Synthesizing into %s failed", locale)
+            chunks.put_nowait(e)
+        finally:
+            chunks.put_nowait(None)
@@ -2,60 +2,113 @@
 Translation pipeline: STT -> Translate -> TTS for transport app.
 """
 
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable
+from typing import TypeVar
+
 from src.shared.azure_stt import transcribe_audio, AzureServiceError
-from src.shared.azure_tts import synthesize_speech, audio_to_base64
-from src.shared.azure_translator import translate_text
+from src.settings import TTSOutputFormat
+from src.shared.azure_tts import resolve_output_format, speech_cache_key, synthesize_speech_cached
+from src.shared.tts_cache import get_tts_cache
+from src.shared.azure_translator import get_translator_client
 from src.apps.transport.languages import get_voice_for_locale, get_translator_code
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
-def process_recording(
-    audio_data: bytes, source_locale: str, target_locale_1: str, target_locale_2: str
+
+async def process_recording(
+    audio_data: bytes,
+    source_locale: str,
+    target_locale_1: str,
+    target_locale_2: str,
+    output_format: TTSOutputFormat | None = None,
 ) -> dict:
     """
     Process a recording: transcribe, translate, and synthesize.
 
+    Blocking Azure SDK calls run in worker threads and repeated syntheses are
+    served from the TTS cache. Independent stages run concurrently: the
+    original is synthesized while both translations are fetched in a single
+    Translator request, and the two translations are then synthesized in
+    parallel.
+
     Args:
         audio_data: Audio data in WAV format
         source_locale: Source language locale
         target_locale_1: First target language locale
         target_locale_2: Second target language locale
+        output_format: Audio encoding of the synthesized speech (defaults to TTS_OUTPUT_FORMAT)
 
     Returns:
-        Dict with original, translation_1, translation_2 (each with locale, text, audio_base64)
+        Dict with original, translation_1, translation_2 (each with locale, text,
+        audio and audio_key, the TTS cache key of the audio)
     """
+    output_format = resolve_output_format(output_format)
+    timings: dict[str, float] = {}
+    started = time.perf_counter()
+
+    async def timed(name: str, stage: Awaitable[T]) -> T:
+        stage_start = time.perf_counter()
+        try:
+            return await stage
+        finally:
+            timings[name] = (time.perf_counter() - stage_start) * 1000
+
     # Step 1: Transcribe the audio
-    original_text = transcribe_audio(audio_data, source_locale)
+    original_text = await timed("STT", asyncio.to_thread(transcribe_audio, audio_data, source_locale))
 
     if not original_text.strip():
         raise AzureServiceError("No speech was recognized in the recording")
 
-    # Step 2: Translate to target languages
+    # Step 2 + 3: Translate to both target languages in one request while the
+    # original is synthesized, then synthesize the translations
     source_lang = get_translator_code(source_locale)
     target_lang_1 = get_translator_code(target_locale_1)
     target_lang_2 = get_translator_code(target_locale_2)
 
-    translation_1 = translate_text(original_text, source_lang, target_lang_1)
-    translation_2 = translate_text(original_text, source_lang, target_lang_2)
+    async def translate_and_speak() -> tuple[str, str, bytes, bytes]:
+        translations = await timed("Translate", get_translator_client().translate(
+            original_text, source_lang, [target_lang_1, target_lang_2]
+        ))
+        text_1, text_2 = translations[target_lang_1], translations[target_lang_2]
+        audio_1, audio_2 = await asyncio.gather(
+            timed("TTS 1", synthesize_speech_cached(text_1, get_voice_for_locale(target_locale_1), output_format)),
+            timed("TTS 2", synthesize_speech_cached(text_2, get_voice_for_locale(target_locale_2), output_format)),
+        )
+        return text_1, text_2, audio_1, audio_2
+
+    audio_original, (translation_1, translation_2, audio_translation_1, audio_translation_2) = (
+        await asyncio.gather(
+            timed(
+                "TTS original",
+                synthesize_speech_cached(original_text, get_voice_for_locale(source_locale), output_format),
+            ),
+            translate_and_speak(),
+        )
+    )
+
+    cache_stats = get_tts_cache().stats
+    logger.info(
+        "Transport pipeline: %s | total %.0fms | TTS cache hit rate %.0f%%, %.1f MB served",
+        " | ".join(f"{name}: {ms:.0f}ms" for name, ms in timings.items()),
+        (time.perf_counter() - started) * 1000,
+        cache_stats.hit_rate * 100, cache_stats.bytes_served / (1024 * 1024),
+    )
 
-    # Step 3: Synthesize all three texts
-    audio_original = synthesize_speech(original_text, get_voice_for_locale(source_locale))
-    audio_translation_1 = synthesize_speech(translation_1, get_voice_for_locale(target_locale_1))
-    audio_translation_2 = synthesize_speech(translation_2, get_voice_for_locale(target_locale_2))
+    def result(locale: str, text: str, audio: bytes | memoryview) -> dict:
+        return {
+            "locale": locale,
+            "text": text,
+            "audio": audio,
+            "audio_key": speech_cache_key(text, get_voice_for_locale(locale), output_format),
+        }
 
     return {
-        "original": {
-            "locale": source_locale,
-            "text": original_text,
-            "audio_base64": audio_to_base64(audio_original),
-        },
-        "translation_1": {
-            "locale": target_locale_1,
-            "text": translation_1,
-            "audio_base64": audio_to_base64(audio_translation_1),
-        },
-        "translation_2": {
-            "locale": target_locale_2,
-            "text": translation_2,
-            "audio_base64": audio_to_base64(audio_translation_2),
-        },
+        "original": result(source_locale, original_text, audio_original),
+        "translation_1": result(target_locale_1, translation_1, audio_translation_1),
+        "translation_2": result(target_locale_2, translation_2, audio_translation_2),
     }
@@ -1,7 +1,11 @@
+from sqlalchemy.exc import InterfaceError, OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from src.settings import get_settings
 
+# Errors worth retrying: lost or refused connections, timeouts
+TRANSIENT_ERRORS = (OperationalError, InterfaceError, ConnectionError, TimeoutError)
+
 settings = get_settings()
 
 engine = create_async_engine(settings.DATABASE_URL, echo=True)
@@ -1,5 +1,7 @@
+from datetime import datetime
+
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import String, Integer, Float, Text, ARRAY
+from sqlalchemy import String, Integer, SmallInteger, Boolean, Float, Text, ARRAY, DateTime, Index, func
 from pgvector.sqlalchemy import Vector
 
 
@@ -23,4 +25,53 @@ class MenuItem(Base):
     name_de: Mapped[str] = mapped_column(String(200), nullable=True)
     name_cs: Mapped[str] = mapped_column(String(200), nullable=True)
     description_de: Mapped[str] = mapped_column(Text, nullable=True)
-    description_cs: Mapped[str] = mapped_column(Text, nullable=True)
\ No newline at end of file
+    description_cs: Mapped[str] = mapped_column(Text, nullable=True)
+
+
+class TranslationMemoryEntry(Base):
+    __tablename__ = "translation_memory"
+    __table_args__ = (
+        Index("ix_translation_memory_key", "source_hash", "source_lang", "target_lang", unique=True),
+        Index("ix_translation_memory_hit_count", "hit_count"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # sha256 of the normalized source text
+    source_hash: Mapped[str] = mapped_column(String(64))
+    source_lang: Mapped[str] = mapped_column(String(20))
+    target_lang: Mapped[str] = mapped_column(String(20))
+    source_text: Mapped[str] = mapped_column(Text)
+    translated_text: Mapped[str] = mapped_column(Text)
+    hit_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class DentalExamRecord(Base):
+    """Stored periodontal exam as flattened PeriodontalChart arrays (-1 = not recorded)."""
+
+    __tablename__ = "dental_exams"
+    __table_args__ = (
+        Index("ix_dental_exams_patient_date", "patient_id", "exam_date"),
+        Index("ix_dental_exams_clinic_date", "clinic_id", "exam_date"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    patient_id: Mapped[str] = mapped_column(String(100))
+    clinic_id: Mapped[str] = mapped_column(String(100), nullable=True)
+    exam_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    # 32 teeth x 6 sites, row-major
+    pd: Mapped[list[int]] = mapped_column(ARRAY(SmallInteger))
+    cal: Mapped[list[int]] = mapped_column(ARRAY(SmallInteger))
+    recession: Mapped[list[int]] = mapped_column(ARRAY(SmallInteger))
+    # 32 teeth: BOP bitmasks and per-tooth findings
+    bop: Mapped[list[int]] = mapped_column(ARRAY(SmallInteger))
+    bop_recorded: Mapped[list[int]] = mapped_column(ARRAY(SmallInteger))
+    mobility: Mapped[list[int]] = mapped_column(ARRAY(SmallInteger))
+    furcation: Mapped[list[int]] = mapped_column(ARRAY(SmallInteger))
+    plaque: Mapped[list[int]] = mapped_column(ARRAY(SmallInteger))
+    calculus: Mapped[list[int]] = mapped_column(ARRAY(SmallInteger))
+    present: Mapped[list[bool]] = mapped_column(ARRAY(Boolean))
+
+    raw_transcription: Mapped[str] = mapped_column(Text, default="", server_default="")
+    extraction_notes: Mapped[str] = mapped_column(Text, nullable=True)
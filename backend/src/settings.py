@@ -7,6 +7,30 @@ class STTProvider(StrEnum):
     DEEPGRAM = "deepgram"
 
 
+class STTHedgeMode(StrEnum):
+    OFF = "off"
+    HEDGE = "hedge"
+    FANOUT = "fanout"
+
+
+class TTSOutputFormat(StrEnum):
+    WAV = "wav"
+    PCM = "pcm"
+    MP3 = "mp3"
+    OPUS = "opus"
+
+
+class DentalPromptVersion(StrEnum):
+    V1 = "v1"  # full JSON: every site and field, nulls included
+    V2 = "v2"  # sparse: per-tooth site arrays, dictated fields only
+
+
+class AudioOverflowPolicy(StrEnum):
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
@@ -23,6 +47,8 @@ class Settings(BaseSettings):
     AZURE_OPENAI_KEY: str
     AZURE_OPENAI_DEPLOYMENT: str = "gpt-4.1-mini"
     AZURE_OPENAI_API_VERSION: str = "2024-12-01-preview"
+    # Corrections requested when a response fails schema validation
+    AZURE_OPENAI_REPAIR_ATTEMPTS: int = 1
 
     # Azure Translator
     TRANSLATOR_ENDPOINT: str = "https://api.cognitive.microsofttranslator.com"
@@ -41,9 +67,72 @@ class Settings(BaseSettings):
 
     # STT provider
     STT_PROVIDER: STTProvider = STTProvider.AZURE
+
+    # Second STT provider: "hedge" starts it when the primary's first interim
+    # is later than STT_HEDGE_AFTER_MS, "fanout" streams to both from the start
+    STT_HEDGE_MODE: STTHedgeMode = STTHedgeMode.OFF
+    STT_HEDGE_AFTER_MS: int = 700
+
+    # Per-session audio buffering between client and STT provider
+    STT_AUDIO_QUEUE_MS: int = 2000
+    STT_AUDIO_OVERFLOW: AudioOverflowPolicy = AudioOverflowPolicy.BLOCK
+
+    # Audio kept for replay when a provider connection drops mid-utterance
+    STT_REPLAY_BUFFER_MS: int = 10000
+    STT_RECONNECT_ATTEMPTS: int = 3
+
+    # Interim transcript delivery to clients
+    STT_INTERIM_INTERVAL_MS: int = 150
+    STT_INTERIM_MIN_NEW_WORDS: int = 2
+
+    # McDonald's voice turns: finals this close together share one LLM call
+    TURN_MERGE_WINDOW_MS: int = 1500
+    TURN_MAX_MERGED: int = 3
     
+    # Synthesized speech (default format when a request does not ask for one)
+    TTS_OUTPUT_FORMAT: TTSOutputFormat = TTSOutputFormat.WAV
+    # Idle warmed synthesizers kept per (voice, format)
+    TTS_SYNTHESIZER_POOL_SIZE: int = 2
+
+    # Synthesized speech cache
+    TTS_CACHE_MEMORY_MB: int = 64
+    TTS_CACHE_DIR: str = ".cache/tts"
+    TTS_CACHE_DISK_MB: int = 512
+
+    # Transcriptions (and, with TRANSCRIPTION_CACHE_RESULTS, extractions/analyses) of uploaded recordings
+    TRANSCRIPTION_CACHE_MB: int = 32
+    TRANSCRIPTION_CACHE_RESULTS: bool = True
+
+    # Translation memory
+    TRANSLATION_MEMORY_SIZE: int = 10000
+    TRANSLATION_MEMORY_TTL_DAYS: int = 30
+    TRANSLATION_MEMORY_PRELOAD: int = 500
+
+    # Dental extraction: parse regular dictation with rules, send only the rest to the LLM
+    DENTAL_RULE_EXTRACTION: bool = True
+    # Teeth per concurrent LLM request for long dictations (0 = one request)
+    DENTAL_EXTRACTION_CHUNK_TEETH: int = 4
+    DENTAL_EXTRACTION_CONCURRENCY: int = 8
+    DENTAL_PROMPT_VERSION: DentalPromptVersion = DentalPromptVersion.V2
+    # Previous exams compared against the latest one by default
+    DENTAL_COMPARE_PREVIOUS: int = 5
+
+    # Psychotherapy: acoustic features of the recording as extra LLM context
+    PSYCHOTHERAPY_PROSODY: bool = True
+    # Psychotherapy analytics: trailing window for trends, cosine similarity for recurring themes
+    PSYCHOTHERAPY_TREND_WINDOW_DAYS: int = 7
+    PSYCHOTHERAPY_THEME_SIMILARITY: float = 0.6
+
+    # Background jobs (long dental and psychotherapy processing)
+    JOB_WORKERS: int = 4
+    JOB_QUEUE_SIZE: int = 100
+    JOB_STAGE_RETRIES: int = 2
+    JOB_RESULT_TTL_SECONDS: int = 600
+
     # Deepgram
     DEEPGRAM_API_KEY: str
+    DEEPGRAM_POOL_SIZE: int = 1
+    DEEPGRAM_KEEPALIVE_SECONDS: float = 5.0
 
 
 def get_settings() -> Settings:
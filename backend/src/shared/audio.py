@@ -0,0 +1,341 @@
+"""
+Audio normalization for speech recognition.
+Converts WAV or raw PCM in any common layout to 16 kHz 16-bit mono PCM, chunk by chunk.
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+TARGET_SAMPLE_RATE = 16000
+
+# Bytes fed to the converter per step when normalizing a whole buffer
+DEFAULT_BLOCK_SIZE = 64 * 1024
+
+_ENCODING_DTYPES: dict[str, np.dtype] = {
+    "pcm_u8": np.dtype(np.uint8),
+    "pcm_s16le": np.dtype("<i2"),
+    "pcm_s32le": np.dtype("<i4"),
+    "pcm_f32le": np.dtype("<f4"),
+}
+
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+class AudioFormatError(Exception):
+    """Custom exception for unsupported or malformed audio input."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+    """Layout of interleaved PCM audio."""
+
+    sample_rate: int = TARGET_SAMPLE_RATE
+    channels: int = 1
+    encoding: str = "pcm_s16le"
+
+    def __post_init__(self) -> None:
+        if self.encoding not in _ENCODING_DTYPES:
+            raise AudioFormatError(f"Unsupported PCM encoding: {self.encoding}")
+        if self.sample_rate <= 0 or self.channels <= 0:
+            raise AudioFormatError(
+                f"Invalid audio format: {self.sample_rate} Hz, {self.channels} channel(s)"
+            )
+
+    @property
+    def dtype(self) -> np.dtype:
+        return _ENCODING_DTYPES[self.encoding]
+
+    @property
+    def frame_size(self) -> int:
+        """Bytes per interleaved frame (one sample for every channel)."""
+        return self.dtype.itemsize * self.channels
+
+    @property
+    def is_target(self) -> bool:
+        """Whether audio in this format can be passed to STT unchanged."""
+        return self == TARGET_FORMAT
+
+
+TARGET_FORMAT = AudioFormat()
+
+
+def parse_wav_header(data: bytes | memoryview) -> tuple[AudioFormat, int, int | None] | None:
+    """
+    Parse a RIFF/WAVE header.
+
+    Args:
+        data: Leading bytes of a WAV file
+
+    Returns:
+        (format, offset of the first sample, data size in bytes or None if unknown),
+        or None if more bytes are needed to reach the data chunk
+
+    Raises:
+        AudioFormatError: If the header is malformed or the sample format is unsupported
+    """
+    view = memoryview(data)
+    if len(view) < 12:
+        return None
+    if bytes(view[:4]) != b"RIFF" or bytes(view[8:12]) != b"WAVE":
+        raise AudioFormatError("Not a RIFF/WAVE file")
+
+    audio_format: AudioFormat | None = None
+    offset = 12
+    while offset + 8 <= len(view):
+        chunk_id = bytes(view[offset:offset + 4])
+        (chunk_size,) = struct.unpack_from("<I", view, offset + 4)
+        body = offset + 8
+
+        if chunk_id == b"data":
+            if audio_format is None:
+                raise AudioFormatError("WAV data chunk precedes fmt chunk")
+            # Streaming writers leave the size as 0 or 0xFFFFFFFF
+            size = chunk_size if 0 < chunk_size < 0xFFFFFFFF else None
+            return audio_format, body, size
+
+        if body + chunk_size > len(view):
+            return None
+
+        if chunk_id == b"fmt ":
+            audio_format = _parse_fmt_chunk(view[body:body + chunk_size])
+
+        offset = body + chunk_size + (chunk_size & 1)
+
+    return None
+
+
+def _parse_fmt_chunk(fmt: memoryview) -> AudioFormat:
+    """Map a WAV fmt chunk to an AudioFormat."""
+    if len(fmt) < 16:
+        raise AudioFormatError("WAV fmt chunk is truncated")
+    tag, channels, sample_rate, _, _, bits = struct.unpack_from("<HHIIHH", fmt)
+    if tag == _WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        (tag,) = struct.unpack_from("<H", fmt, 24)
+
+    if tag == _WAVE_FORMAT_PCM and bits in (8, 16, 32):
+        encoding = {8: "pcm_u8", 16: "pcm_s16le", 32: "pcm_s32le"}[bits]
+    elif tag == _WAVE_FORMAT_IEEE_FLOAT and bits == 32:
+        encoding = "pcm_f32le"
+    else:
+        raise AudioFormatError(f"Unsupported WAV sample format (tag {tag:#06x}, {bits} bit)")
+
+    return AudioFormat(sample_rate=sample_rate, channels=channels, encoding=encoding)
+
+
+class PolyphaseResampler:
+    """Streaming rational resampler (upsample by L, low-pass, downsample by M).
+
+    The Kaiser-windowed sinc filter is split into L phases so every output
+    sample costs a single dot product of taps_per_phase input samples.
+    State (filter history and output position) is carried between chunks,
+    so the concatenated output equals resampling the whole signal at once.
+    """
+
+    def __init__(self, source_rate: int, target_rate: int, half_width: int = 10) -> None:
+        g = math.gcd(source_rate, target_rate)
+        self._up = target_rate // g
+        self._down = source_rate // g
+
+        factor = max(self._up, self._down)
+        num_taps = 2 * half_width * factor + 1
+        cutoff = 0.5 / factor
+        n = np.arange(num_taps) - (num_taps - 1) / 2
+        taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(num_taps, 5.0)
+        taps *= self._up / taps.sum()
+
+        self._taps_per_phase = math.ceil(num_taps / self._up)
+        padded = np.zeros(self._taps_per_phase * self._up)
+        padded[:num_taps] = taps
+        # bank[phase, j] weights the j-th oldest sample of a window ending at the newest input
+        self._bank = padded.reshape(self._taps_per_phase, self._up).T[:, ::-1].astype(np.float32)
+
+        self._delay = (num_taps - 1) // 2
+        self._history = np.zeros(self._taps_per_phase - 1, dtype=np.float32)
+        self._samples_in = 0
+        self._samples_out = 0
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Resample a block of float32 mono samples."""
+        return self._run(samples.astype(np.float32, copy=False), self._samples_in + len(samples))
+
+    def flush(self) -> np.ndarray:
+        """Emit the remaining output samples delayed by the filter."""
+        expected = math.ceil(self._samples_in * self._up / self._down)
+        tail = np.zeros(self._delay // self._up + self._taps_per_phase, dtype=np.float32)
+        out = self._run(tail, self._samples_in + len(tail), update_input_count=False)
+        return out[: max(expected - (self._samples_out - len(out)), 0)]
+
+    def _run(
+        self, samples: np.ndarray, available: int, update_input_count: bool = True
+    ) -> np.ndarray:
+        start = self._samples_in
+        extended = np.concatenate((self._history, samples))
+        windows = sliding_window_view(extended, self._taps_per_phase)
+
+        # Output n sits at position n*M + delay of the upsampled signal
+        first = self._samples_out
+        last = (available * self._up - 1 - self._delay) // self._down
+        if last < first:
+            out = np.empty(0, dtype=np.float32)
+        else:
+            pos = np.arange(first, last + 1, dtype=np.int64) * self._down + self._delay
+            newest = pos // self._up
+            phase = pos - newest * self._up
+            rows = windows[newest - start]
+            out = np.einsum("ij,ij->i", rows, self._bank[phase])
+            self._samples_out = last + 1
+
+        if len(self._history):
+            self._history = extended[-len(self._history):].copy()
+        if update_input_count:
+            self._samples_in = available
+        return out
+
+
+class PCMConverter:
+    """Streaming converter from WAV or raw PCM to 16 kHz 16-bit mono.
+
+    Feed arbitrary byte chunks to convert(); partial frames are carried over
+    to the next call. If *source* is None the format is detected from a RIFF
+    header, falling back to 16 kHz 16-bit mono for headerless input.
+    """
+
+    def __init__(self, source: AudioFormat | None = None) -> None:
+        self._source = source
+        self._pending = b""
+        self._data_remaining: int | None = None
+        self._resampler: PolyphaseResampler | None = None
+        if source is not None:
+            self._configure(source)
+
+    @property
+    def source(self) -> AudioFormat | None:
+        return self._source
+
+    def _configure(self, source: AudioFormat) -> None:
+        self._source = source
+        if source.sample_rate != TARGET_SAMPLE_RATE:
+            self._resampler = PolyphaseResampler(source.sample_rate, TARGET_SAMPLE_RATE)
+
+    def convert(self, chunk: bytes) -> bytes:
+        """Convert the next chunk of input; returns 16 kHz 16-bit mono PCM bytes."""
+        if self._source is None:
+            self._pending += chunk
+            if not self._detect_format():
+                return b""
+            chunk, self._pending = self._pending, b""
+
+        data = memoryview(chunk)
+        if self._data_remaining is not None:
+            data = data[: self._data_remaining]
+            self._data_remaining -= len(data)
+
+        if self._source.is_target and not self._pending and len(data) % 2 == 0:
+            if isinstance(chunk, bytes) and len(data) == len(chunk):
+                return chunk
+            return bytes(data)
+
+        if self._pending:
+            data = memoryview(self._pending + bytes(data))
+            self._pending = b""
+
+        frame_size = self._source.frame_size
+        usable = len(data) - len(data) % frame_size
+        if usable < len(data):
+            self._pending = bytes(data[usable:])
+        if not usable:
+            return b""
+
+        frames = np.frombuffer(data[:usable], dtype=self._source.dtype)
+        return self._encode(self._to_mono_float(frames))
+
+    def flush(self) -> bytes:
+        """Finish conversion and return any samples still held by the resampler."""
+        if self._source is None and self._pending:
+            # Too short for a WAV header: treat as headerless target-format PCM
+            self._configure(TARGET_FORMAT)
+            pending, self._pending = self._pending, b""
+            return self.convert(pending)
+        if self._resampler is None:
+            return b""
+        return self._encode(self._resampler.flush(), resample=False)
+
+    def _detect_format(self) -> bool:
+        if len(self._pending) < 4:
+            return False
+        if self._pending[:4] != b"RIFF":
+            self._configure(TARGET_FORMAT)
+            return True
+        header = parse_wav_header(self._pending)
+        if header is None:
+            return False
+        source, data_offset, data_size = header
+        self._configure(source)
+        self._pending = self._pending[data_offset:]
+        self._data_remaining = data_size
+        return True
+
+    def _to_mono_float(self, frames: np.ndarray) -> np.ndarray:
+        source = self._source
+        if source.encoding == "pcm_u8":
+            samples = (frames.astype(np.float32) - 128.0) * (1.0 / 128.0)
+        elif source.encoding == "pcm_f32le":
+            samples = frames
+        else:
+            scale = 1.0 / float(1 << (8 * source.dtype.itemsize - 1))
+            samples = frames.astype(np.float32) * np.float32(scale)
+        if source.channels > 1:
+            samples = samples.reshape(-1, source.channels).mean(axis=1, dtype=np.float32)
+        return samples
+
+    def _encode(self, samples: np.ndarray, resample: bool = True) -> bytes:
+        if resample and self._resampler is not None:
+            samples = self._resampler.process(samples)
+        scaled = np.clip(np.rint(samples * 32768.0), -32768, 32767)
+        return scaled.astype("<i2").tobytes()
+
+
+def iter_pcm16k(
+    audio_data: bytes,
+    source: AudioFormat | None = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Convert a buffer of WAV or raw PCM audio block by block.
+
+    Args:
+        audio_data: WAV file bytes, or raw PCM in *source* format
+        source: Format of headerless input (None = detect from WAV header)
+        block_size: Input bytes converted per step
+
+    Yields:
+        Non-empty chunks of 16 kHz 16-bit mono PCM
+
+    Raises:
+        AudioFormatError: If the input format is unsupported
+    """
+    converter = PCMConverter(source)
+    view = memoryview(audio_data)
+    for start in range(0, len(view), block_size):
+        pcm = converter.convert(view[start:start + block_size])
+        if pcm:
+            yield pcm
+    tail = converter.flush()
+    if tail:
+        yield tail
+
+
+def to_pcm16k(audio_data: bytes, source: AudioFormat | None = None) -> bytes:
+    """Convert a whole buffer of WAV or raw PCM audio to 16 kHz 16-bit mono PCM."""
+    return b"".join(iter_pcm16k(audio_data, source))
@@ -2,10 +2,15 @@
 Unified Azure OpenAI client factory.
 """
 
-from openai import OpenAI
+from functools import lru_cache
+
+from openai import APIConnectionError, AsyncOpenAI, InternalServerError, OpenAI, RateLimitError
 
 from src.settings import get_settings
 
+# Errors worth retrying: connection failures and timeouts, throttling, server errors
+TRANSIENT_ERRORS = (APIConnectionError, RateLimitError, InternalServerError)
+
 
 def get_openai_client() -> OpenAI:
     """Get OpenAI client configured for Azure AI Foundry."""
@@ -14,3 +19,13 @@ def get_openai_client() -> OpenAI:
         api_key=settings.AZURE_OPENAI_KEY,
         base_url=settings.AZURE_OPENAI_ENDPOINT,
     )
+
+
+@lru_cache(maxsize=1)
+def get_async_openai_client() -> AsyncOpenAI:
+    """Get the shared async OpenAI client (one connection pool per process)."""
+    settings = get_settings()
+    return AsyncOpenAI(
+        api_key=settings.AZURE_OPENAI_KEY,
+        base_url=settings.AZURE_OPENAI_ENDPOINT,
+    )
@@ -3,13 +3,13 @@ Azure Speech-to-Text service wrappers.
 Provides one-shot and continuous recognition.
 """
 
-import io
 import time
-import wave
+from collections.abc import Callable
 
 import azure.cognitiveservices.speech as speechsdk
 
 from src.settings import get_settings
+from src.shared.audio import AudioFormat, iter_pcm16k
 
 
 class AzureServiceError(Exception):
@@ -18,18 +18,46 @@ class AzureServiceError(Exception):
     pass
 
 
+class AzureTransientError(AzureServiceError):
+    """Custom exception for Azure errors that may succeed on retry."""
+
+    pass
+
+
+# Cancellation error codes of connection, throttling and service failures
+_TRANSIENT_CANCELLATIONS = {
+    speechsdk.CancellationErrorCode.ConnectionFailure,
+    speechsdk.CancellationErrorCode.ServiceTimeout,
+    speechsdk.CancellationErrorCode.ServiceError,
+    speechsdk.CancellationErrorCode.ServiceUnavailable,
+    speechsdk.CancellationErrorCode.TooManyRequests,
+}
+
+
+def _cancellation_error(details: speechsdk.CancellationDetails) -> AzureServiceError:
+    """Error for a canceled recognition; transient for connection and service failures."""
+    if details.reason != speechsdk.CancellationReason.Error:
+        return AzureServiceError(f"Speech recognition canceled: {details.reason}")
+    message = f"Speech recognition canceled: {details.code}: {details.error_details}"
+    if details.code in _TRANSIENT_CANCELLATIONS:
+        return AzureTransientError(message)
+    return AzureServiceError(message)
+
+
 def transcribe_audio(
     audio_data: bytes,
     locale: str = "en-US",
     phrase_hints: list[str] | None = None,
+    audio_format: AudioFormat | None = None,
 ) -> str:
     """
     Transcribe audio data using Azure Speech-to-Text (one-shot recognition).
 
     Args:
-        audio_data: Audio data in WAV format (16kHz, 16-bit, mono)
+        audio_data: Audio data as a WAV file (any rate/channels) or raw PCM
         locale: Language locale code (e.g., "en-US")
         phrase_hints: Optional list of phrases to bias recognition toward
+        audio_format: Format of headerless PCM input (default 16kHz, 16-bit, mono)
 
     Returns:
         Transcribed text
@@ -59,11 +87,8 @@ def transcribe_audio(
             for phrase in phrase_hints:
                 phrase_list.addPhrase(phrase)
 
-        if audio_data[:4] == b'RIFF':
-            with wave.open(io.BytesIO(audio_data), 'rb') as wav_file:
-                audio_data = wav_file.readframes(wav_file.getnframes())
-
-        audio_stream.write(audio_data)
+        for pcm in iter_pcm16k(audio_data, audio_format):
+            audio_stream.write(pcm)
         audio_stream.close()
 
         result = recognizer.recognize_once()
@@ -73,8 +98,7 @@ def transcribe_audio(
         elif result.reason == speechsdk.ResultReason.NoMatch:
             raise AzureServiceError("No speech could be recognized in the audio")
         elif result.reason == speechsdk.ResultReason.Canceled:
-            cancellation = result.cancellation_details
-            raise AzureServiceError(f"Speech recognition canceled: {cancellation.reason}")
+            raise _cancellation_error(result.cancellation_details)
         else:
             raise AzureServiceError(f"Unexpected result: {result.reason}")
 
@@ -88,15 +112,19 @@ def transcribe_audio_continuous(
     audio_data: bytes,
     locale: str = "en-US",
     phrase_hints: list[str] | None = None,
+    audio_format: AudioFormat | None = None,
+    on_pcm: Callable[[bytes], None] | None = None,
 ) -> str:
     """
     Transcribe longer audio using continuous recognition.
     Better for recordings longer than 15 seconds.
 
     Args:
-        audio_data: Audio data in WAV format (16kHz, 16-bit, mono)
+        audio_data: Audio data as a WAV file (any rate/channels) or raw PCM
         locale: Language locale code
         phrase_hints: Optional list of phrases to bias recognition toward
+        audio_format: Format of headerless PCM input (default 16kHz, 16-bit, mono)
+        on_pcm: Optional callback receiving each converted 16kHz mono PCM chunk
 
     Returns:
         Transcribed text (concatenated from all recognized segments)
@@ -128,13 +156,15 @@ def transcribe_audio_continuous(
 
         results: list[str] = []
         done = False
+        cancellation: speechsdk.CancellationDetails | None = None
 
         def recognized_cb(evt):
             if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
                 results.append(evt.result.text)
 
         def canceled_cb(evt):
-            nonlocal done
+            nonlocal done, cancellation
+            cancellation = evt.cancellation_details
             done = True
 
         def stopped_cb(evt):
@@ -147,11 +177,10 @@ def transcribe_audio_continuous(
 
         recognizer.start_continuous_recognition()
 
-        if audio_data[:4] == b'RIFF':
-            with wave.open(io.BytesIO(audio_data), 'rb') as wav_file:
-                audio_data = wav_file.readframes(wav_file.getnframes())
-
-        audio_stream.write(audio_data)
+        for pcm in iter_pcm16k(audio_data, audio_format):
+            audio_stream.write(pcm)
+            if on_pcm is not None:
+                on_pcm(pcm)
         audio_stream.close()
 
         timeout = 60
@@ -161,6 +190,9 @@ def transcribe_audio_continuous(
 
         recognizer.stop_continuous_recognition()
 
+        # A failed connection would otherwise pass for silence or a complete transcript
+        if cancellation is not None and cancellation.reason == speechsdk.CancellationReason.Error:
+            raise _cancellation_error(cancellation)
         if not results:
             raise AzureServiceError("No speech could be recognized in the audio")
 
@@ -2,14 +2,26 @@
 Azure Translator service wrapper.
 """
 
+import asyncio
+import logging
 import uuid
+from functools import lru_cache
 
+import httpx
 import requests as http_requests
 
 from src.settings import get_settings
 from src.shared.azure_stt import AzureServiceError
+from src.shared.translation_memory import (
+    MemoryKey,
+    TranslationMemory,
+    get_translation_memory,
+    memory_key,
+    normalize_text,
+)
 from src.settings import get_settings
 
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
@@ -67,3 +79,174 @@ def translate_text(text: str, source_lang: str, target_lang: str) -> str:
         raise AzureServiceError(f"Translation request failed: {str(e)}")
     except (KeyError, IndexError) as e:
         raise AzureServiceError(f"Failed to parse translation response: {str(e)}")
+
+
+# Translator v3 per-request limits
+MAX_REQUEST_ELEMENTS = 1000
+MAX_REQUEST_CHARS = 50000
+
+
+class TranslatorClient:
+    """Async Azure Translator client sharing one pool of keep-alive connections.
+
+    translate_batch() translates many texts into many target languages with
+    as few requests as the API limits allow; requests that would exceed them
+    are split and sent concurrently. With a translation *memory*, only the
+    (text, target) pairs it does not already hold are sent to Azure.
+    """
+
+    def __init__(self, max_connections: int = 10, memory: TranslationMemory | None = None) -> None:
+        settings = get_settings()
+        self._memory = memory
+        if not settings.AZURE_TRANSLATOR_KEY:
+            raise AzureServiceError("Azure Translator Key not configured")
+        self._client = httpx.AsyncClient(
+            base_url=settings.TRANSLATOR_ENDPOINT,
+            headers={
+                "Ocp-Apim-Subscription-Key": settings.AZURE_TRANSLATOR_KEY,
+                "Ocp-Apim-Subscription-Region": settings.AZURE_TRANSLATOR_REGION,
+                "Content-Type": "application/json",
+            },
+            timeout=30,
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+        )
+
+    async def translate(self, text: str, source_lang: str, target_langs: list[str]) -> dict[str, str]:
+        """Translate one text into several languages; returns {target_lang: text}."""
+        return (await self.translate_batch([text], source_lang, target_langs))[0]
+
+    async def translate_batch(
+        self, texts: list[str], source_lang: str, target_langs: list[str]
+    ) -> list[dict[str, str]]:
+        """
+        Translate many texts into many target languages.
+
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code (e.g., "en")
+            target_langs: Target language codes (e.g., ["de", "cs"])
+
+        Returns:
+            One {target_lang: translated text} dict per input text, in input order
+
+        Raises:
+            AzureServiceError: If translation fails or a single text exceeds the request limit
+        """
+        results: list[dict[str, str]] = [{} for _ in texts]
+        targets = list(dict.fromkeys(t for t in target_langs if t != source_lang))
+        for lang in target_langs:
+            if lang == source_lang:
+                for i, text in enumerate(texts):
+                    results[i][lang] = text
+
+        pending = [i for i, text in enumerate(texts) if text.strip()]
+        for i, text in enumerate(texts):
+            if not text.strip():
+                results[i].update((lang, "") for lang in targets)
+        if not targets or not pending:
+            return results
+
+        keys = {(i, lang): memory_key(texts[i], source_lang, lang) for i in pending for lang in targets}
+        cached = await self._memory.get_many(list(keys.values())) if self._memory else {}
+        missing: dict[int, list[str]] = {}
+        for (i, lang), key in keys.items():
+            if key in cached:
+                results[i][lang] = cached[key]
+            else:
+                missing.setdefault(i, []).append(lang)
+        if not missing:
+            return results
+
+        # One request group per set of missing targets; identical texts are sent once
+        groups: dict[tuple[str, ...], dict[str, list[int]]] = {}
+        for i, langs in missing.items():
+            groups.setdefault(tuple(langs), {}).setdefault(normalize_text(texts[i]), []).append(i)
+
+        translated = await asyncio.gather(*(
+            self._translate_uncached([indices[0] for indices in by_text.values()], texts, source_lang, list(langs))
+            for langs, by_text in groups.items()
+        ))
+
+        new_entries: dict[MemoryKey, tuple[str, str]] = {}
+        for by_text, items in zip(groups.values(), translated):
+            for indices, item in zip(by_text.values(), items):
+                for i in indices:
+                    results[i].update(item)
+                source = texts[indices[0]]
+                for lang, text in item.items():
+                    new_entries[memory_key(source, source_lang, lang)] = (source, text)
+        logger.debug(
+            "Translator: %d of %d translations from memory, %d requested",
+            len(keys) - sum(map(len, missing.values())), len(keys), len(new_entries),
+        )
+        if self._memory:
+            self._memory.put_many(new_entries)
+        return results
+
+    async def _translate_uncached(
+        self, indices: list[int], texts: list[str], source_lang: str, targets: list[str]
+    ) -> list[dict[str, str]]:
+        batches = self._split(indices, texts)
+        translated = await asyncio.gather(
+            *(self._request([texts[i] for i in batch], source_lang, targets) for batch in batches)
+        )
+        return [item for items in translated for item in items]
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+    @staticmethod
+    def _split(indices: list[int], texts: list[str]) -> list[list[int]]:
+        batches: list[list[int]] = []
+        current: list[int] = []
+        chars = 0
+        for i in indices:
+            length = len(texts[i])
+            if length > MAX_REQUEST_CHARS:
+                raise AzureServiceError(f"Text of {length} characters exceeds the translation request limit")
+            if current and (len(current) == MAX_REQUEST_ELEMENTS or chars + length > MAX_REQUEST_CHARS):
+                batches.append(current)
+                current, chars = [], 0
+            current.append(i)
+            chars += length
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _request(
+        self, texts: list[str], source_lang: str, targets: list[str]
+    ) -> list[dict[str, str]]:
+        try:
+            response = await self._client.post(
+                "/translate",
+                params=[("api-version", "3.0"), ("from", source_lang), *(("to", t) for t in targets)],
+                headers={"X-ClientTraceId": str(uuid.uuid4())},
+                json=[{"text": text} for text in texts],
+            )
+            response.raise_for_status()
+            result = response.json()
+            if not isinstance(result, list) or len(result) != len(texts):
+                raise AzureServiceError("Unexpected translation response format")
+            return [
+                {t["to"]: t["text"] for t in item["translations"]}
+                for item in result
+            ]
+        except httpx.HTTPError as e:
+            raise AzureServiceError(f"Translation request failed: {str(e)}")
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            raise AzureServiceError(f"Failed to parse translation response: {str(e)}")
+
+
+@lru_cache(maxsize=1)
+def get_translator_client() -> TranslatorClient:
+    """Get the shared async translator client (one connection pool per process)."""
+    return TranslatorClient(memory=get_translation_memory())
+
+
+async def close_translator_client() -> None:
+    """Close the shared translator client's connections if it was created."""
+    if get_translator_client.cache_info().currsize:
+        await get_translator_client().close()
+        get_translator_client.cache_clear()
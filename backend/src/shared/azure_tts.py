@@ -2,57 +2,170 @@
 Azure Text-to-Speech service wrapper.
 """
 
+import asyncio
 import base64
+import logging
+import threading
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from functools import lru_cache
 
 import azure.cognitiveservices.speech as speechsdk
 
-from src.settings import get_settings
+from src.settings import TTSOutputFormat, get_settings
 from src.shared.azure_stt import AzureServiceError
+from src.shared.tts_cache import get_tts_cache
 
+logger = logging.getLogger(__name__)
 
-def synthesize_speech(text: str, voice_name: str) -> bytes:
+# All formats are 16 kHz mono; the compressed ones are ~10-20x smaller than PCM
+_SDK_FORMATS = {
+    TTSOutputFormat.WAV: speechsdk.SpeechSynthesisOutputFormat.Riff16Khz16BitMonoPcm,
+    TTSOutputFormat.PCM: speechsdk.SpeechSynthesisOutputFormat.Raw16Khz16BitMonoPcm,
+    TTSOutputFormat.MP3: speechsdk.SpeechSynthesisOutputFormat.Audio16Khz32KBitRateMonoMp3,
+    TTSOutputFormat.OPUS: speechsdk.SpeechSynthesisOutputFormat.Ogg16Khz16BitMonoOpus,
+}
+
+# ~100 ms of 16 kHz 16-bit PCM; compressed formats fill it with more audio
+_STREAM_CHUNK_BYTES = 3200
+
+AUDIO_MIME_TYPES = {
+    TTSOutputFormat.WAV: "audio/wav",
+    TTSOutputFormat.PCM: "audio/L16;rate=16000;channels=1",
+    TTSOutputFormat.MP3: "audio/mpeg",
+    TTSOutputFormat.OPUS: "audio/ogg; codecs=opus",
+}
+
+
+def resolve_output_format(output_format: TTSOutputFormat | None) -> TTSOutputFormat:
+    """Return *output_format*, or the configured default when it is None."""
+    return output_format or get_settings().TTS_OUTPUT_FORMAT
+
+
+class SynthesizerPool:
+    """Idle SpeechSynthesizers per (voice, format), reused across requests.
+
+    Creating a synthesizer and opening its service connection costs a TLS
+    handshake per call; pooled synthesizers keep the connection open. A
+    synthesizer is used by one synthesis at a time; if that synthesis fails,
+    or the pool is already full, its connection is closed instead of being
+    returned.
+    """
+
+    def __init__(self, max_idle: int) -> None:
+        self._max_idle = max_idle
+        self._idle: dict[tuple[str, TTSOutputFormat], list[tuple[speechsdk.SpeechSynthesizer, speechsdk.Connection]]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def synthesizer(self, voice_name: str, output_format: TTSOutputFormat) -> Iterator[speechsdk.SpeechSynthesizer]:
+        key = (voice_name, output_format)
+        with self._lock:
+            idle = self._idle.get(key)
+            entry = idle.pop() if idle else None
+        if entry is None:
+            entry = self._create(voice_name, output_format)
+
+        try:
+            yield entry[0]
+        except BaseException:
+            # The connection may be left mid-synthesis; never reuse it
+            self._close(entry)
+            raise
+        self._release(key, entry)
+
+    def warm(self, voice_name: str, output_format: TTSOutputFormat | None = None) -> None:
+        """Open a connection for *voice_name* ahead of use (blocking; run in a thread)."""
+        key = (voice_name, resolve_output_format(output_format))
+        with self._lock:
+            if len(self._idle.get(key, [])) >= self._max_idle:
+                return
+        try:
+            entry = self._create(*key)
+        except Exception:
+            logger.warning("Failed to warm synthesizer for %s", voice_name, exc_info=True)
+            return
+        self._release(key, entry)
+
+    def _release(
+        self, key: tuple[str, TTSOutputFormat], entry: tuple[speechsdk.SpeechSynthesizer, speechsdk.Connection]
+    ) -> None:
+        """Return a healthy synthesizer to the pool, or close it when the pool is full."""
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self._max_idle:
+                idle.append(entry)
+                return
+        self._close(entry)
+
+    @staticmethod
+    def _close(entry: tuple[speechsdk.SpeechSynthesizer, speechsdk.Connection]) -> None:
+        try:
+            entry[1].close()
+        except Exception:
+            logger.debug("Failed to close synthesizer connection", exc_info=True)
+
+    @staticmethod
+    def _create(
+        voice_name: str, output_format: TTSOutputFormat
+    ) -> tuple[speechsdk.SpeechSynthesizer, speechsdk.Connection]:
+        settings = get_settings()
+        speech_config = speechsdk.SpeechConfig(
+            subscription=settings.AZURE_SPEECH_KEY, region=settings.AZURE_SPEECH_REGION
+        )
+        speech_config.speech_synthesis_voice_name = voice_name
+        speech_config.set_speech_synthesis_output_format(_SDK_FORMATS[output_format])
+        synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config, audio_config=None)
+        connection = speechsdk.Connection.from_speech_synthesizer(synthesizer)
+        connection.open(True)
+        return synthesizer, connection
+
+
+@lru_cache(maxsize=1)
+def get_synthesizer_pool() -> SynthesizerPool:
+    """Get the process-wide pool of warmed synthesizers."""
+    return SynthesizerPool(get_settings().TTS_SYNTHESIZER_POOL_SIZE)
+
+
+def _check_request(text: str) -> None:
+    settings = get_settings()
+    if not settings.AZURE_SPEECH_KEY:
+        raise AzureServiceError("Azure Speech Key not configured")
+
+    if not text.strip():
+        raise AzureServiceError("No text provided for synthesis")
+
+
+def synthesize_speech(
+    text: str, voice_name: str, output_format: TTSOutputFormat | None = None
+) -> bytes:
     """
     Synthesize speech from text using Azure Text-to-Speech.
 
     Args:
         text: Text to synthesize
         voice_name: Azure TTS neural voice name (e.g., "en-US-JennyNeural")
+        output_format: Audio encoding (defaults to TTS_OUTPUT_FORMAT)
 
     Returns:
-        Audio data in WAV format
+        Audio data in the requested format
 
     Raises:
         AzureServiceError: If synthesis fails
     """
-    settings = get_settings()
-    if not settings.AZURE_SPEECH_KEY:
-        raise AzureServiceError("Azure Speech Key not configured")
-
-    if not text.strip():
-        raise AzureServiceError("No text provided for synthesis")
+    _check_request(text)
 
     try:
-        speech_config = speechsdk.SpeechConfig(
-            subscription=settings.AZURE_SPEECH_KEY, region=settings.AZURE_SPEECH_REGION
-        )
-        speech_config.speech_synthesis_voice_name = voice_name
-        speech_config.set_speech_synthesis_output_format(
-            speechsdk.SpeechSynthesisOutputFormat.Riff16Khz16BitMonoPcm
-        )
-
-        synthesizer = speechsdk.SpeechSynthesizer(
-            speech_config=speech_config, audio_config=None
-        )
+        with get_synthesizer_pool().synthesizer(voice_name, resolve_output_format(output_format)) as synthesizer:
+            result = synthesizer.speak_text(text)
 
-        result = synthesizer.speak_text(text)
-
-        if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
-            return result.audio_data
-        elif result.reason == speechsdk.ResultReason.Canceled:
-            cancellation = result.cancellation_details
-            raise AzureServiceError(f"Speech synthesis canceled: {cancellation.reason}")
-        else:
-            raise AzureServiceError(f"Unexpected result: {result.reason}")
+            if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
+                return result.audio_data
+            elif result.reason == speechsdk.ResultReason.Canceled:
+                cancellation = result.cancellation_details
+                raise AzureServiceError(f"Speech synthesis canceled: {cancellation.reason}")
+            else:
+                raise AzureServiceError(f"Unexpected result: {result.reason}")
 
     except AzureServiceError:
         raise
@@ -60,6 +173,98 @@ def synthesize_speech(text: str, voice_name: str) -> bytes:
         raise AzureServiceError(f"Text-to-Speech error: {str(e)}")
 
 
-def audio_to_base64(audio_data: bytes) -> str:
+async def stream_speech(
+    text: str, voice_name: str, output_format: TTSOutputFormat | None = None
+) -> AsyncIterator[bytes]:
+    """
+    Synthesize speech and yield audio chunks as Azure produces them.
+
+    The first chunk is available shortly after synthesis starts, long before
+    the whole utterance is done. The blocking SDK reads run in a worker
+    thread; closing the generator early stops the synthesis.
+
+    Args:
+        text: Text to synthesize
+        voice_name: Azure TTS neural voice name (e.g., "en-US-JennyNeural")
+        output_format: Audio encoding (defaults to TTS_OUTPUT_FORMAT)
+
+    Yields:
+        Consecutive chunks of audio in the requested format
+
+    Raises:
+        AzureServiceError: If synthesis fails
+    """
+    _check_request(text)
+    output_format = resolve_output_format(output_format)
+    loop = asyncio.get_running_loop()
+    chunks: asyncio.Queue[bytes | Exception | None] = asyncio.Queue()
+    stopped = threading.Event()
+
+    def produce() -> None:
+        try:
+            with get_synthesizer_pool().synthesizer(voice_name, output_format) as synthesizer:
+                result = synthesizer.start_speaking_text_async(text).get()
+                if result.reason == speechsdk.ResultReason.Canceled:
+                    raise AzureServiceError(
+                        f"Speech synthesis canceled: {result.cancellation_details.reason}"
+                    )
+                stream = speechsdk.AudioDataStream(result)
+                buffer = bytes(_STREAM_CHUNK_BYTES)
+                while not stopped.is_set() and (filled := stream.read_data(buffer)) > 0:
+                    loop.call_soon_threadsafe(chunks.put_nowait, buffer[:filled])
+                if stopped.is_set():
+                    synthesizer.stop_speaking_async().get()
+                elif stream.status == speechsdk.StreamStatus.Canceled:
+                    raise AzureServiceError("Speech synthesis canceled")
+        except Exception as e:
+            error = e if isinstance(e, AzureServiceError) else AzureServiceError(f"Text-to-Speech error: {str(e)}")
+            loop.call_soon_threadsafe(chunks.put_nowait, error)
+        finally:
+            loop.call_soon_threadsafe(chunks.put_nowait, None)
+
+    producer = loop.run_in_executor(None, produce)
+    try:
+        while (chunk := await chunks.get()) is not None:
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+    finally:
+        stopped.set()
+        await asyncio.shield(producer)
+
+
+async def synthesize_speech_cached(
+    text: str, voice_name: str, output_format: TTSOutputFormat | None = None
+) -> bytes | memoryview:
+    """
+    Synthesize speech through the shared TTS cache.
+
+    Repeated (text, voice, format) requests are served from memory or disk,
+    and concurrent identical requests share a single Azure call.
+
+    Args:
+        text: Text to synthesize
+        voice_name: Azure TTS neural voice name (e.g., "en-US-JennyNeural")
+        output_format: Audio encoding (defaults to TTS_OUTPUT_FORMAT)
+
+    Returns:
+        Audio data in the requested format (a memoryview when served from the disk tier)
+
+    Raises:
+        AzureServiceError: If synthesis fails
+    """
+    output_format = resolve_output_format(output_format)
+    return await get_tts_cache().get_or_synthesize(
+        text, voice_name, output_format,
+        lambda: asyncio.to_thread(synthesize_speech, text, voice_name, output_format),
+    )
+
+
+def speech_cache_key(text: str, voice_name: str, output_format: TTSOutputFormat | None = None) -> str:
+    """Key under which synthesize_speech_cached() stores this audio."""
+    return get_tts_cache().key(text, voice_name, resolve_output_format(output_format))
+
+
+def audio_to_base64(audio_data: bytes | memoryview) -> str:
     """Convert audio data to base64 string."""
     return base64.b64encode(audio_data).decode("utf-8")
@@ -0,0 +1,233 @@
+"""
+In-process background jobs: staged pipelines run by a bounded worker pool.
+
+Long requests (continuous STT followed by an LLM call) are submitted as jobs
+and answered with a job id right away; clients poll the job or subscribe to
+its updates over SSE. A job is a list of stages, each receiving the previous
+stage's output, so a stage that fails with a transient error is retried on
+its own without repeating the stages before it.
+"""
+
+import asyncio
+import inspect
+import itertools
+import logging
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from enum import StrEnum
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+from src.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+_RETRY_BASE_DELAY = 0.5
+
+
+class Stage(NamedTuple):
+    """One step of a job; sync callables run in a thread."""
+
+    name: str
+    # Takes the previous stage's output
+    run: Callable[[Any], Any]
+    # Transient errors worth retrying; any other error fails the job at once
+    retry_on: tuple[type[BaseException], ...] = ()
+
+
+def _is_transient(error: BaseException, retry_on: tuple[type[BaseException], ...]) -> bool:
+    """Whether *error*, or an error it was raised from or while handling, is one of *retry_on*.
+
+    Services wrap provider errors in their own exception types, so the chain is checked.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        if isinstance(error, retry_on):
+            return True
+        seen.add(id(error))
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class JobStatus(StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobPriority(StrEnum):
+    HIGH = "high"
+    NORMAL = "normal"
+    LOW = "low"
+
+
+_PRIORITY_ORDER = {JobPriority.HIGH: 0, JobPriority.NORMAL: 1, JobPriority.LOW: 2}
+
+
+class JobQueueFullError(Exception):
+    """Custom exception for job queue overflow errors."""
+    pass
+
+
+@dataclass
+class Job:
+    """A submitted pipeline and its progress."""
+
+    id: str
+    kind: str
+    stages: list[Stage]
+    priority: JobPriority = JobPriority.NORMAL
+    status: JobStatus = JobStatus.QUEUED
+    stage: str | None = None
+    attempts: int = 0
+    result: Any = None
+    error: str | None = None
+    finished_at: float | None = None
+    _updated: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+    def _notify(self) -> None:
+        # Wake current watchers; later ones wait on a fresh event
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+
+class JobQueue:
+    """Priority queue of jobs run by *workers* concurrent worker tasks.
+
+    At most *max_queued* jobs wait at a time; submitting more raises
+    JobQueueFullError. A stage failing with one of its retry_on errors is
+    retried up to *stage_retries* times with exponential backoff. Finished jobs are kept for *result_ttl* seconds.
+    Workers start with the first submission.
+    """
+
+    def __init__(self, workers: int, max_queued: int, stage_retries: int, result_ttl: float) -> None:
+        self._workers = workers
+        self._max_queued = max_queued
+        self._stage_retries = stage_retries
+        self._result_ttl = result_ttl
+        self._queue: asyncio.PriorityQueue[tuple[int, int, Job]] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._jobs: dict[str, Job] = {}
+        self._sequence = itertools.count()
+
+    def submit(self, kind: str, stages: list[Stage], priority: JobPriority = JobPriority.NORMAL) -> Job:
+        """
+        Queue a pipeline.
+
+        Args:
+            kind: Job type, checked when the job is looked up
+            stages: Stages to run in order
+            priority: Queue priority
+
+        Returns:
+            The queued job
+
+        Raises:
+            JobQueueFullError: If max_queued jobs are already waiting
+        """
+        self._prune()
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue(maxsize=self._max_queued)
+            self._tasks = [asyncio.create_task(self._work()) for _ in range(self._workers)]
+
+        job = Job(id=uuid.uuid4().hex, kind=kind, stages=stages, priority=priority)
+        try:
+            self._queue.put_nowait((_PRIORITY_ORDER[priority], next(self._sequence), job))
+        except asyncio.QueueFull:
+            raise JobQueueFullError(f"{self._max_queued} jobs already queued") from None
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str, kind: str | None = None) -> Job | None:
+        """Return a job that has not expired (and is of *kind*, if given)."""
+        self._prune()
+        job = self._jobs.get(job_id)
+        if job is None or (kind is not None and job.kind != kind):
+            return None
+        return job
+
+    async def watch(self, job: Job) -> AsyncIterator[Job]:
+        """Yield the job now and after every change until it has finished."""
+        while True:
+            updated = job._updated
+            yield job
+            if job.done:
+                return
+            await updated.wait()
+
+    async def close(self) -> None:
+        """Cancel the workers; queued and running jobs are abandoned."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def _prune(self) -> None:
+        expired = time.monotonic() - self._result_ttl
+        for job_id in [j.id for j in self._jobs.values() if j.finished_at is not None and j.finished_at < expired]:
+            del self._jobs[job_id]
+
+    async def _work(self) -> None:
+        while True:
+            _, _, job = await self._queue.get()
+            try:
+                await self._run(job)
+            except Exception:
+                logger.exception("Job %s crashed", job.id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.status = JobStatus.RUNNING
+        value = None
+        for name, run, retry_on in job.stages:
+            job.stage, job.attempts = name, 0
+            job._notify()
+            while True:
+                job.attempts += 1
+                try:
+                    if inspect.iscoroutinefunction(run):
+                        value = await run(value)
+                    else:
+                        value = await asyncio.to_thread(run, value)
+                    break
+                except Exception as e:
+                    if job.attempts > self._stage_retries or not _is_transient(e, retry_on):
+                        logger.error("Job %s failed in stage %s: %s", job.id, name, e)
+                        self._finish(job, JobStatus.FAILED, error=f"{name}: {e}")
+                        return
+                    logger.warning("Job %s stage %s failed (attempt %d): %s", job.id, name, job.attempts, e)
+                    await asyncio.sleep(_RETRY_BASE_DELAY * 2 ** (job.attempts - 1))
+        self._finish(job, JobStatus.SUCCEEDED, result=value)
+
+    @staticmethod
+    def _finish(job: Job, status: JobStatus, result: Any = None, error: str | None = None) -> None:
+        job.status, job.result, job.error = status, result, error
+        job.stages = []
+        job.finished_at = time.monotonic()
+        job._notify()
+
+
+@lru_cache(maxsize=1)
+def get_job_queue() -> JobQueue:
+    settings = get_settings()
+    return JobQueue(
+        workers=settings.JOB_WORKERS,
+        max_queued=settings.JOB_QUEUE_SIZE,
+        stage_retries=settings.JOB_STAGE_RETRIES,
+        result_ttl=settings.JOB_RESULT_TTL_SECONDS,
+    )
+
+
+async def close_job_queue() -> None:
+    """Shutdown hook: stop the job workers."""
+    if get_job_queue.cache_info().currsize:
+        await get_job_queue().close()
@@ -0,0 +1,120 @@
+"""
+Incremental scanning of JSON documents that arrive in pieces (streamed LLM output).
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Any
+
+# Events: ("delta", path, text) for new characters of a string value,
+# ("value", path, raw_json) when a value is complete
+JSONStreamEvent = tuple[str, tuple, str]
+
+_WHITESPACE = " \t\r\n"
+_SCALAR_END = ",}]" + _WHITESPACE
+# Unfinished \uXXXX escape at the end of a partial string; the backslash must
+# not itself be escaped, so an even number of backslashes precedes it (group 1)
+_PARTIAL_UNICODE_ESCAPE = re.compile(r"((?:^|[^\\])(?:\\\\)*)\\u[0-9a-fA-F]{0,3}$")
+
+
+@dataclass
+class _Container:
+    kind: str  # "{" or "["
+    start: int
+    key: Any = None  # current key (object) or index (array)
+    expect_key: bool = False
+
+
+class JSONStreamScanner:
+    """Scanner reporting values of a JSON document as soon as they are complete.
+
+    Paths are tuples of the keys and array indices leading to a value, e.g.
+    ("report", "summary"). String values additionally report their decoded
+    text as it arrives. Each character is scanned once; the document is not
+    validated, so decode the full text afterwards.
+    """
+
+    def __init__(self) -> None:
+        self.text = ""
+        self._stack: list[_Container] = []
+        self._in_string = False
+        self._string_start = 0
+        self._string_is_key = False
+        self._escape = False
+        self._emitted = 0
+        self._scalar_start: int | None = None
+
+    def feed(self, chunk: str) -> list[JSONStreamEvent]:
+        """Append *chunk* and return the events it completes."""
+        events: list[JSONStreamEvent] = []
+        start = len(self.text)
+        self.text += chunk
+        for index in range(start, len(self.text)):
+            self._scan(index, events)
+        if self._in_string and not self._string_is_key:
+            self._emit_delta(events, self.text[self._string_start:], final=False)
+        return events
+
+    def _path(self) -> tuple:
+        return tuple(container.key for container in self._stack)
+
+    def _scan(self, index: int, events: list[JSONStreamEvent]) -> None:
+        char = self.text[index]
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                raw = self.text[self._string_start - 1:index + 1]
+                if self._string_is_key:
+                    self._stack[-1].key = json.loads(raw)
+                else:
+                    self._emit_delta(events, raw[1:-1], final=True)
+                    events.append(("value", self._path(), raw))
+            return
+
+        if self._scalar_start is not None:
+            if char not in _SCALAR_END:
+                return
+            events.append(("value", self._path(), self.text[self._scalar_start:index]))
+            self._scalar_start = None
+
+        if char in _WHITESPACE:
+            return
+        if char == '"':
+            self._in_string, self._string_start, self._emitted = True, index + 1, 0
+            self._string_is_key = bool(self._stack) and self._stack[-1].expect_key
+        elif char == "{":
+            self._stack.append(_Container("{", index, expect_key=True))
+        elif char == "[":
+            self._stack.append(_Container("[", index, key=0))
+        elif char in "}]":
+            container = self._stack.pop()
+            events.append(("value", self._path(), self.text[container.start:index + 1]))
+        elif char == ":":
+            self._stack[-1].expect_key = False
+        elif char == ",":
+            container = self._stack[-1]
+            if container.kind == "{":
+                container.expect_key = True
+            else:
+                container.key += 1
+        else:
+            self._scalar_start = index
+
+    def _emit_delta(self, events: list[JSONStreamEvent], raw: str, final: bool) -> None:
+        if not final:
+            # Hold back an escape sequence that is still incomplete
+            if self._escape:
+                raw = raw[:-1]
+            raw = _PARTIAL_UNICODE_ESCAPE.sub(r"\1", raw)
+        decoded = json.loads(f'"{raw}"')
+        if not final and decoded and "\ud800" <= decoded[-1] <= "\udbff":
+            # First half of an escaped surrogate pair
+            decoded = decoded[:-1]
+        if len(decoded) > self._emitted:
+            events.append(("delta", self._path(), decoded[self._emitted:]))
+            self._emitted = len(decoded)
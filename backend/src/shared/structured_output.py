@@ -0,0 +1,212 @@
+"""
+Schema-constrained LLM output decoded straight into msgspec Structs.
+"""
+
+import logging
+from functools import lru_cache
+from collections.abc import AsyncIterator
+from typing import Any, TypeVar
+
+import msgspec
+
+from src.shared.azure_openai import get_async_openai_client, get_openai_client
+from src.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Keywords OpenAI strict mode rejects; the values are still enforced when decoding
+_UNSUPPORTED_IN_STRICT = (
+    "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum", "multipleOf",
+    "minLength", "maxLength", "pattern", "format", "minItems", "maxItems", "default",
+)
+
+_REPAIR_PROMPT = (
+    "Your previous response did not match the required schema: {error}. "
+    "Return the corrected JSON only."
+)
+
+
+class StructuredOutputError(Exception):
+    """Custom exception for structured output errors."""
+    pass
+
+
+class _NotStrict(Exception):
+    pass
+
+
+def _strict(node: Any) -> Any:
+    """Rewrite a JSON schema node for strict mode, or raise _NotStrict if it cannot be expressed."""
+    if isinstance(node, list):
+        return [_strict(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+
+    if "$ref" in node:
+        # Strict mode takes references without sibling keywords
+        return {"$ref": node["$ref"]}
+    node = dict(node)
+    if isinstance(node.get("additionalProperties"), dict):
+        # Free-form maps (dict[str, X]) have no strict-mode equivalent
+        raise _NotStrict
+    limits = [node.pop(key) for key in ("minimum", "maximum") if key in node]
+    for key in _UNSUPPORTED_IN_STRICT:
+        node.pop(key, None)
+    if len(limits) == 2:
+        node["description"] = f"{node.get('description', '')} ({limits[0]}-{limits[1]})".strip()
+
+    for key in ("properties", "$defs"):
+        if key in node:
+            node[key] = {name: _strict(child) for name, child in node[key].items()}
+    for key in ("items", "anyOf"):
+        if key in node:
+            node[key] = _strict(node[key])
+    if "properties" in node:
+        node["required"] = list(node["properties"])
+        node["additionalProperties"] = False
+    return node
+
+
+@lru_cache(maxsize=None)
+def response_format(output_type: type) -> dict:
+    """
+    Build the response_format for *output_type* from its msgspec JSON schema.
+
+    The schema is sent in strict mode when it can be expressed there. Types
+    containing free-form maps (e.g. teeth keyed by tooth number) are sent as a
+    non-strict schema instead; the model is still guided by it and the
+    response is validated when decoded.
+    """
+    schema = msgspec.json.schema(output_type)
+    definitions = schema.pop("$defs", {})
+    if "$ref" in schema:
+        schema = definitions.pop(schema["$ref"].rsplit("/", 1)[-1])
+    if definitions:
+        schema["$defs"] = definitions
+
+    try:
+        schema, strict = _strict(schema), True
+    except _NotStrict:
+        strict = False
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": output_type.__name__, "schema": schema, "strict": strict},
+    }
+
+
+def decode_structured(content: str | None, output_type: type[T]) -> T:
+    """
+    Decode and validate an LLM response into *output_type*.
+
+    Raises:
+        StructuredOutputError: If the content is empty, not JSON or violates the type's constraints
+    """
+    if not content:
+        raise StructuredOutputError("Empty response from LLM")
+    try:
+        return msgspec.json.decode(content, type=output_type)
+    except (msgspec.ValidationError, msgspec.DecodeError) as e:
+        raise StructuredOutputError(str(e)) from e
+
+
+def _request(messages: list[dict], output_type: type, kwargs: dict) -> dict:
+    return {
+        "model": get_settings().AZURE_OPENAI_DEPLOYMENT,
+        "messages": messages,
+        "response_format": response_format(output_type),
+        **kwargs,
+    }
+
+
+def _repair_messages(messages: list[dict], content: str | None, error: StructuredOutputError) -> list[dict]:
+    return [
+        *messages,
+        {"role": "assistant", "content": content or ""},
+        {"role": "user", "content": _REPAIR_PROMPT.format(error=error)},
+    ]
+
+
+async def complete_structured(messages: list[dict], output_type: type[T], **kwargs: Any) -> T:
+    """
+    Run a chat completion constrained to *output_type* and decode the answer into it.
+
+    A response that fails validation is sent back with the error for up to
+    AZURE_OPENAI_REPAIR_ATTEMPTS corrections.
+
+    Args:
+        messages: Chat messages
+        output_type: msgspec Struct (or other msgspec-supported type) to decode into
+        **kwargs: Extra arguments for chat.completions.create
+
+    Returns:
+        The decoded response
+
+    Raises:
+        StructuredOutputError: If no valid response was produced
+    """
+    return await _complete(messages, output_type, get_settings().AZURE_OPENAI_REPAIR_ATTEMPTS, kwargs)
+
+
+async def repair_structured(
+    messages: list[dict], content: str | None, error: StructuredOutputError, output_type: type[T], **kwargs: Any
+) -> T:
+    """
+    Ask for corrections of an invalid response produced outside complete_structured (e.g. a stream).
+
+    Uses the same AZURE_OPENAI_REPAIR_ATTEMPTS budget, so a streamed answer
+    gets as many corrections as a complete_structured one.
+
+    Raises:
+        StructuredOutputError: *error* when repairs are disabled, or the last error if none succeeded
+    """
+    attempts = get_settings().AZURE_OPENAI_REPAIR_ATTEMPTS
+    if attempts <= 0:
+        raise error
+    logger.warning("Invalid %s from LLM stream: %s", output_type.__name__, error)
+    return await _complete(_repair_messages(messages, content, error), output_type, attempts - 1, kwargs)
+
+
+async def _complete(messages: list[dict], output_type: type[T], repairs: int, kwargs: dict) -> T:
+    client = get_async_openai_client()
+    for attempt in range(repairs + 1):
+        response = await client.chat.completions.create(**_request(messages, output_type, kwargs))
+        content = response.choices[0].message.content
+        try:
+            return decode_structured(content, output_type)
+        except StructuredOutputError as e:
+            error = e
+            logger.warning("Invalid %s from LLM (attempt %d): %s", output_type.__name__, attempt + 1, e)
+            messages = _repair_messages(messages, content, e)
+    raise error
+
+
+def complete_structured_sync(messages: list[dict], output_type: type[T], **kwargs: Any) -> T:
+    """Blocking variant of complete_structured."""
+    client = get_openai_client()
+    for attempt in range(get_settings().AZURE_OPENAI_REPAIR_ATTEMPTS + 1):
+        response = client.chat.completions.create(**_request(messages, output_type, kwargs))
+        content = response.choices[0].message.content
+        try:
+            return decode_structured(content, output_type)
+        except StructuredOutputError as e:
+            error = e
+            logger.warning("Invalid %s from LLM (attempt %d): %s", output_type.__name__, attempt + 1, e)
+            messages = _repair_messages(messages, content, e)
+    raise error
+
+
+async def stream_structured(messages: list[dict], output_type: type, **kwargs: Any) -> AsyncIterator[str]:
+    """
+    Stream the text of a chat completion constrained to *output_type* as it is generated.
+
+    No repair is attempted; validate the joined text with decode_structured
+    and pass a failure to repair_structured.
+    """
+    client = get_async_openai_client()
+    stream = await client.chat.completions.create(**_request(messages, output_type, kwargs), stream=True)
+    async for chunk in stream:
+        # Azure sends content-filter chunks without choices
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
@@ -1,19 +1,45 @@
-from src.settings import get_settings
+from src.settings import STTHedgeMode, STTProvider, get_settings
 from src.shared.stt.streaming import StreamingSTTSession
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-def create_streaming_session() -> StreamingSTTSession:
-    """Create a streaming STT session using the configured provider."""
-    settings = get_settings()
-    logger.info(f"Creating streaming session using {settings.STT_PROVIDER} as a STT provider")
-    if settings.STT_PROVIDER == "deepgram":
+def _create_provider_session(provider: str) -> StreamingSTTSession:
+    if provider == "deepgram":
         from src.shared.stt.deepgram_provider import DeepgramStreamingSession
         return DeepgramStreamingSession()
-    elif settings.STT_PROVIDER == "azure":
+    elif provider == "azure":
         from src.shared.stt.azure_provider import AzureStreamingSession
         return AzureStreamingSession()
     else:
-        raise ValueError(f"Invalid STT provider: {settings.STT_PROVIDER}")
+        raise ValueError(f"Invalid STT provider: {provider}")
+
+
+def create_streaming_session() -> StreamingSTTSession:
+    """Create a streaming STT session using the configured provider(s)."""
+    settings = get_settings()
+    if settings.STT_HEDGE_MODE == STTHedgeMode.OFF:
+        logger.info(f"Creating streaming session using {settings.STT_PROVIDER} as a STT provider")
+        return _create_provider_session(settings.STT_PROVIDER)
+
+    from src.shared.stt.hedged import HedgedStreamingSession, rank_providers
+    other = next(p for p in STTProvider if p != settings.STT_PROVIDER)
+    primary, secondary = rank_providers([str(settings.STT_PROVIDER), str(other)])
+    logger.info(
+        f"Creating {settings.STT_HEDGE_MODE} streaming session: {primary} primary, {secondary} secondary"
+    )
+    return HedgedStreamingSession(
+        (primary, lambda: _create_provider_session(primary)),
+        (secondary, lambda: _create_provider_session(secondary)),
+        mode=settings.STT_HEDGE_MODE,
+        hedge_after_ms=settings.STT_HEDGE_AFTER_MS,
+    )
+
+
+async def close_streaming_resources() -> None:
+    """Close provider resources kept between sessions (e.g. warm connections)."""
+    settings = get_settings()
+    if settings.STT_PROVIDER == "deepgram" or settings.STT_HEDGE_MODE != STTHedgeMode.OFF:
+        from src.shared.stt.deepgram_pool import get_connection_pool
+        await get_connection_pool().close()
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Awaitable
+from dataclasses import dataclass, field
+
+from src.settings import AudioOverflowPolicy, get_settings
+from src.shared.audio import TARGET_SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+# 16 kHz 16-bit mono PCM
+BYTES_PER_MS = TARGET_SAMPLE_RATE * 2 // 1000
+
+
+@dataclass(frozen=True)
+class AudioQueueConfig:
+    """Capacity and overflow behaviour of a session's audio queue."""
+
+    max_ms: int = 2000
+    policy: AudioOverflowPolicy = AudioOverflowPolicy.BLOCK
+
+    @classmethod
+    def from_settings(cls) -> "AudioQueueConfig":
+        settings = get_settings()
+        return cls(max_ms=settings.STT_AUDIO_QUEUE_MS, policy=settings.STT_AUDIO_OVERFLOW)
+
+
+@dataclass
+class AudioQueueStats:
+    """Counters describing how well the provider keeps up with incoming audio."""
+
+    depth_ms: float = 0.0
+    max_depth_ms: float = 0.0
+    dropped_ms: float = 0.0
+    sent_chunks: int = 0
+    send_latency_ms: list[float] = field(default_factory=list)
+
+    @property
+    def avg_send_latency_ms(self) -> float:
+        if not self.send_latency_ms:
+            return 0.0
+        return sum(self.send_latency_ms) / len(self.send_latency_ms)
+
+    @property
+    def max_send_latency_ms(self) -> float:
+        return max(self.send_latency_ms, default=0.0)
+
+
+class AudioSendQueue:
+    """Bounded ring buffer between the WebSocket reader and a provider.
+
+    put() never waits on the provider itself; a sender task drains the buffer
+    and calls *send* one chunk at a time. When the buffer holds more than
+    *max_ms* of audio the overflow policy applies:
+
+    - BLOCK: put() waits until the sender frees space.
+    - DROP_OLDEST: the oldest queued chunks are discarded (counted in dropped_ms).
+    - COALESCE: put() waits like BLOCK, but the sender merges the whole backlog
+      into one provider call so a slow provider catches up in fewer round trips.
+    """
+
+    # Bounds the per-session latency history kept for metrics
+    _LATENCY_SAMPLES = 1000
+
+    def __init__(
+        self,
+        send: Callable[[bytes], Awaitable[None]],
+        config: AudioQueueConfig,
+    ) -> None:
+        self._send = send
+        self._config = config
+        self._max_bytes = config.max_ms * BYTES_PER_MS
+        self._chunks: deque[bytes] = deque()
+        self._queued_bytes = 0
+        self._changed = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._sender: asyncio.Task | None = None
+        self._error: BaseException | None = None
+        self._closing = False
+        self.stats = AudioQueueStats()
+
+    async def put(self, chunk: bytes) -> None:
+        self._ensure_sender()
+        if self._config.policy != AudioOverflowPolicy.DROP_OLDEST:
+            while self._chunks and self._queued_bytes + len(chunk) > self._max_bytes:
+                self._space.clear()
+                await self._space.wait()
+        self._append(chunk)
+
+    def put_nowait(self, chunk: bytes) -> None:
+        """Queue a chunk without waiting; beyond capacity the oldest audio is dropped (any policy)."""
+        self._ensure_sender()
+        self._append(chunk)
+
+    def _ensure_sender(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+        if self._sender is None or self._sender.done():
+            self._closing = False
+            self._sender = asyncio.create_task(self._run())
+
+    def _append(self, chunk: bytes) -> None:
+        while self._chunks and self._queued_bytes + len(chunk) > self._max_bytes:
+            dropped = self._chunks.popleft()
+            self._queued_bytes -= len(dropped)
+            self.stats.dropped_ms += len(dropped) / BYTES_PER_MS
+        self._chunks.append(chunk)
+        self._queued_bytes += len(chunk)
+        self._update_depth()
+        self._changed.set()
+
+    async def close(self) -> None:
+        """Wait for queued audio to reach the provider, then stop the sender."""
+        if self._sender is None:
+            return
+        self._closing = True
+        self._changed.set()
+        try:
+            await self._sender
+        except Exception:
+            logger.exception("Audio sender failed")
+        self._sender = None
+        self._error = None
+
+    async def _run(self) -> None:
+        while True:
+            if not self._chunks:
+                if self._closing:
+                    return
+                self._changed.clear()
+                await self._changed.wait()
+                continue
+
+            if self._config.policy == AudioOverflowPolicy.COALESCE and len(self._chunks) > 1:
+                chunk = b"".join(self._chunks)
+                self._chunks.clear()
+            else:
+                chunk = self._chunks.popleft()
+            self._queued_bytes -= len(chunk)
+            self._update_depth()
+            self._space.set()
+
+            started = time.perf_counter()
+            try:
+                await self._send(chunk)
+            except Exception as e:
+                logger.warning("Provider audio send failed: %s", e)
+                self._error = e
+                self._chunks.clear()
+                self._queued_bytes = 0
+                self._update_depth()
+                self._space.set()
+                return
+            self._record_latency((time.perf_counter() - started) * 1000)
+
+    def _update_depth(self) -> None:
+        self.stats.depth_ms = self._queued_bytes / BYTES_PER_MS
+        self.stats.max_depth_ms = max(self.stats.max_depth_ms, self.stats.depth_ms)
+
+    def _record_latency(self, latency_ms: float) -> None:
+        self.stats.sent_chunks += 1
+        latencies = self.stats.send_latency_ms
+        latencies.append(latency_ms)
+        if len(latencies) > self._LATENCY_SAMPLES:
+            del latencies[: len(latencies) - self._LATENCY_SAMPLES]
@@ -1,21 +1,32 @@
 import asyncio
 from collections.abc import Callable, Awaitable
+from functools import partial
 
 import azure.cognitiveservices.speech as speechsdk
 
 from src.settings import get_settings
-from src.shared.stt.streaming import StreamingSTTSession
+from src.shared.stt.streaming import ReconnectingSTTSession
 
 
-class AzureStreamingSession(StreamingSTTSession):
-    """Streaming STT using Azure continuous recognition."""
+# Azure reports result offsets and durations in 100 ns ticks
+_TICKS_PER_SECOND = 10_000_000
+
+
+class AzureStreamingSession(ReconnectingSTTSession):
+    """Streaming STT using Azure continuous recognition.
+
+    A cancellation with an error (e.g. a dropped service connection) is
+    raised on the next audio write, which makes the base class start a new
+    recognizer and replay the buffered audio.
+    """
 
     def __init__(self) -> None:
+        super().__init__()
         self._stream: speechsdk.audio.PushAudioInputStream | None = None
         self._recognizer: speechsdk.SpeechRecognizer | None = None
-        self._on_interim: Callable[[str], Awaitable[None]] | None = None
-        self._on_final: Callable[[str], Awaitable[None]] | None = None
-        self._loop: asyncio.AbstractEventLoop | None = None
+        self._language: str = "en-US"
+        self._phrase_hints: list[str] = []
+        self._error: str | None = None
 
     async def start(
         self,
@@ -24,52 +35,71 @@ class AzureStreamingSession(StreamingSTTSession):
         on_final: Callable[[str], Awaitable[None]],
         phrase_hints: list[str] | None = None,
     ) -> None:
-        settings = get_settings()
-        self._on_interim = on_interim
-        self._on_final = on_final
-        self._loop = asyncio.get_running_loop()
+        self._bind_callbacks(on_interim, on_final)
+        self._language = language
+        self._phrase_hints = phrase_hints or []
+        self._open()
 
+    def _open(self) -> None:
+        settings = get_settings()
         speech_config = speechsdk.SpeechConfig(
             subscription=settings.AZURE_SPEECH_KEY,
             region=settings.AZURE_SPEECH_REGION,
         )
-        speech_config.speech_recognition_language = language
+        speech_config.speech_recognition_language = self._language
 
         self._stream = speechsdk.audio.PushAudioInputStream()
         audio_config = speechsdk.audio.AudioConfig(stream=self._stream)
 
-        self._recognizer = speechsdk.SpeechRecognizer(
+        recognizer = speechsdk.SpeechRecognizer(
             speech_config=speech_config,
             audio_config=audio_config,
         )
 
-        if phrase_hints:
-            phrase_list = speechsdk.PhraseListGrammar.from_recognizer(self._recognizer)
-            for phrase in phrase_hints:
+        if self._phrase_hints:
+            phrase_list = speechsdk.PhraseListGrammar.from_recognizer(recognizer)
+            for phrase in self._phrase_hints:
                 phrase_list.addPhrase(phrase)
 
-        self._recognizer.recognizing.connect(self._handle_recognizing)
-        self._recognizer.recognized.connect(self._handle_recognized)
+        # Handlers are bound to their recognizer so late events from a replaced one are ignored
+        recognizer.recognizing.connect(partial(self._handle_recognizing, recognizer))
+        recognizer.recognized.connect(partial(self._handle_recognized, recognizer))
+        recognizer.canceled.connect(partial(self._handle_canceled, recognizer))
 
-        self._recognizer.start_continuous_recognition()
+        self._error = None
+        self._recognizer = recognizer
+        recognizer.start_continuous_recognition()
 
-    def _handle_recognizing(self, evt: speechsdk.SpeechRecognitionEventArgs) -> None:
-        if self._on_interim and self._loop:
-            asyncio.run_coroutine_threadsafe(
-                self._on_interim(evt.result.text), self._loop
-            )
+    def _handle_recognizing(self, recognizer, evt: speechsdk.SpeechRecognitionEventArgs) -> None:
+        if recognizer is self._recognizer:
+            self._submit_interim_threadsafe(evt.result.text)
 
-    def _handle_recognized(self, evt: speechsdk.SpeechRecognitionEventArgs) -> None:
-        if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech and self._on_final and self._loop:
-            asyncio.run_coroutine_threadsafe(
-                self._on_final(evt.result.text), self._loop
-            )
+    def _handle_recognized(self, recognizer, evt: speechsdk.SpeechRecognitionEventArgs) -> None:
+        if recognizer is self._recognizer and evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
+            end = (evt.result.offset + evt.result.duration) / _TICKS_PER_SECOND
+            self._submit_final_threadsafe(evt.result.text, end)
 
-    async def send_audio(self, chunk: bytes) -> None:
+    def _handle_canceled(self, recognizer, evt: speechsdk.SpeechRecognitionCanceledEventArgs) -> None:
+        if recognizer is self._recognizer and evt.cancellation_details.reason == speechsdk.CancellationReason.Error:
+            self._error = evt.cancellation_details.error_details or "recognition canceled"
+
+    async def _write_audio(self, chunk: bytes) -> None:
+        if self._error:
+            raise ConnectionError(f"Azure recognition canceled: {self._error}")
+        if self._stream:
+            # PushAudioInputStream.write can block on the SDK's internal buffer
+            await asyncio.to_thread(self._stream.write, chunk)
+
+    async def _reconnect(self) -> None:
+        # Detach first: whatever the old recognizer still emits is replayed instead
+        recognizer, self._recognizer = self._recognizer, None
         if self._stream:
-            self._stream.write(chunk)
+            self._stream.close()
+        if recognizer:
+            await asyncio.to_thread(recognizer.stop_continuous_recognition)
+        self._open()
 
-    async def stop(self) -> None:
+    async def _close(self) -> None:
         if self._stream:
             self._stream.close()
         if self._recognizer:
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Awaitable
+
+from src.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptCoalescer:
+    """Delivers recogniser results to a client at a bounded rate.
+
+    Only the latest interim transcript is kept. It is sent at most once per
+    *interval_ms*, or straight away when it changes meaningfully (earlier
+    words were revised or *min_new_words* words were added). Finals are
+    delivered strictly in arrival order by a single dispatcher task and
+    supersede any interim still pending.
+
+    submit_interim/submit_final must be called on the event loop thread;
+    the *_threadsafe variants are for provider SDK callback threads.
+    """
+
+    def __init__(
+        self,
+        on_interim: Callable[[str], Awaitable[None]],
+        on_final: Callable[[str], Awaitable[None]],
+        interval_ms: int | None = None,
+        min_new_words: int | None = None,
+    ) -> None:
+        settings = get_settings()
+        self._on_interim = on_interim
+        self._on_final = on_final
+        self._interval = (interval_ms if interval_ms is not None else settings.STT_INTERIM_INTERVAL_MS) / 1000
+        self._min_new_words = (
+            min_new_words if min_new_words is not None else settings.STT_INTERIM_MIN_NEW_WORDS
+        )
+        self._loop = asyncio.get_running_loop()
+        self._latest: str | None = None
+        self._last_sent = ""
+        self._last_sent_at = 0.0
+        self._finals: deque[str] = deque()
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    def submit_interim(self, text: str) -> None:
+        if not text or text == self._last_sent or self._closing:
+            return
+        self._latest = text
+        self._wakeup.set()
+
+    def submit_final(self, text: str) -> None:
+        self._finals.append(text)
+        self._latest = None
+        self._wakeup.set()
+
+    def submit_interim_threadsafe(self, text: str) -> None:
+        self._loop.call_soon_threadsafe(self.submit_interim, text)
+
+    def submit_final_threadsafe(self, text: str) -> None:
+        self._loop.call_soon_threadsafe(self.submit_final, text)
+
+    async def close(self) -> None:
+        """Deliver queued finals, drop any stale interim and stop the dispatcher."""
+        self._closing = True
+        self._latest = None
+        self._wakeup.set()
+        await self._task
+
+    async def _run(self) -> None:
+        while True:
+            if self._finals:
+                text = self._finals.popleft()
+                self._last_sent = ""
+                await self._deliver(self._on_final, text)
+                continue
+
+            if self._latest is not None:
+                delay = self._flush_delay(self._latest)
+                if delay <= 0:
+                    text, self._latest = self._latest, None
+                    self._last_sent = text
+                    self._last_sent_at = time.monotonic()
+                    await self._deliver(self._on_interim, text)
+                else:
+                    await self._wait(delay)
+                continue
+
+            if self._closing:
+                return
+            await self._wait(None)
+
+    def _flush_delay(self, text: str) -> float:
+        previous = self._last_sent
+        if not text.startswith(previous.rsplit(" ", 1)[0]):
+            return 0.0
+        if len(text.split()) - len(previous.split()) >= self._min_new_words:
+            return 0.0
+        return self._last_sent_at + self._interval - time.monotonic()
+
+    async def _wait(self, timeout: float | None) -> None:
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except TimeoutError:
+            pass
+
+    async def _deliver(self, callback: Callable[[str], Awaitable[None]], text: str) -> None:
+        try:
+            await callback(text)
+        except Exception:
+            logger.exception("Transcript delivery failed")
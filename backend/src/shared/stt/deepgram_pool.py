@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Awaitable
+from functools import lru_cache
+
+from deepgram import AsyncDeepgramClient
+from deepgram.core.events import EventType
+from deepgram.extensions.types.sockets import ListenV1ControlMessage
+
+from src.settings import get_settings
+from src.shared.audio import TARGET_SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+ConnectionKey = tuple[str, tuple[str, ...]]
+
+
+class DeepgramConnection:
+    """A Deepgram live-transcription socket that can be opened ahead of use.
+
+    Messages are forwarded to *handler*, which the owning session sets once it
+    takes the connection. While no audio flows a KeepAlive control message is
+    sent periodically so Deepgram does not close the idle socket.
+    """
+
+    def __init__(self, language: str, keyterms: list[str]) -> None:
+        self.language = language
+        self.keyterms = keyterms
+        self.handler: Callable[[object], Awaitable[None]] | None = None
+        self._ctx_manager = None
+        self._socket = None
+        self._listener_task: asyncio.Task | None = None
+        self._keepalive_task: asyncio.Task | None = None
+        self._last_send = time.monotonic()
+
+    @property
+    def is_open(self) -> bool:
+        return (
+            self._socket is not None
+            and self._listener_task is not None
+            and not self._listener_task.done()
+        )
+
+    async def open(self) -> None:
+        settings = get_settings()
+        started = time.perf_counter()
+        client = AsyncDeepgramClient(api_key=settings.DEEPGRAM_API_KEY)
+        self._ctx_manager = client.listen.v1.connect(
+            model="nova-3",
+            language=self.language,
+            smart_format="true",
+            interim_results="true",
+            utterance_end_ms="1000",
+            encoding="linear16",
+            sample_rate=TARGET_SAMPLE_RATE,
+            channels=1,
+            keyterm=self.keyterms,
+        )
+        self._socket = await self._ctx_manager.__aenter__()
+        self._socket.on(EventType.MESSAGE, self._dispatch)
+        self._listener_task = asyncio.create_task(self._socket.start_listening())
+        self._last_send = time.monotonic()
+        self._keepalive_task = asyncio.create_task(
+            self._keep_alive(settings.DEEPGRAM_KEEPALIVE_SECONDS)
+        )
+        logger.info(
+            "Deepgram connection (%s) opened in %.0fms",
+            self.language, (time.perf_counter() - started) * 1000,
+        )
+
+    async def _dispatch(self, result) -> None:
+        if self.handler:
+            await self.handler(result)
+
+    async def _keep_alive(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            if time.monotonic() - self._last_send < interval:
+                continue
+            try:
+                await self._socket.send_control(ListenV1ControlMessage(type="KeepAlive"))
+                self._last_send = time.monotonic()
+            except Exception:
+                logger.warning("Deepgram KeepAlive failed, dropping connection")
+                return
+
+    async def send_media(self, chunk: bytes) -> None:
+        self._last_send = time.monotonic()
+        await self._socket.send_media(chunk)
+
+    async def close(self, finalize: bool = False) -> None:
+        if self._keepalive_task:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        if self._socket and finalize:
+            try:
+                await self._socket.send_control(ListenV1ControlMessage(type="Finalize"))
+            except Exception:
+                pass
+        if self._listener_task:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener_task = None
+        if self._ctx_manager:
+            try:
+                await self._ctx_manager.__aexit__(None, None, None)
+            except Exception:
+                pass
+            self._ctx_manager = None
+        self._socket = None
+        self.handler = None
+
+
+class DeepgramConnectionPool:
+    """Keeps a few warm connections per (language, keyterms) pair.
+
+    Connections are single-use: acquire() hands out an idle connection (or
+    opens one if none is ready) and refills the pool in the background, so
+    the next session for the same configuration skips the DNS/TLS/WebSocket
+    handshake entirely.
+    """
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._idle: dict[ConnectionKey, list[DeepgramConnection]] = {}
+        self._refilling: set[ConnectionKey] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+    async def acquire(self, language: str, keyterms: list[str]) -> DeepgramConnection:
+        key = (language, tuple(keyterms))
+        idle = self._idle.setdefault(key, [])
+
+        connection = None
+        while idle:
+            candidate = idle.pop(0)
+            if candidate.is_open:
+                connection = candidate
+                break
+            await candidate.close()
+
+        self.prewarm(language, keyterms)
+
+        if connection is None:
+            connection = DeepgramConnection(language, keyterms)
+            await connection.open()
+        return connection
+
+    def prewarm(self, language: str, keyterms: list[str]) -> None:
+        """Start filling the pool for a configuration without waiting."""
+        key = (language, tuple(keyterms))
+        if self._size <= 0 or key in self._refilling:
+            return
+        self._refilling.add(key)
+        task = asyncio.create_task(self._refill(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refill(self, key: ConnectionKey) -> None:
+        language, keyterms = key
+        idle = self._idle.setdefault(key, [])
+        try:
+            while len(idle) < self._size:
+                connection = DeepgramConnection(language, list(keyterms))
+                await connection.open()
+                idle.append(connection)
+        except Exception:
+            logger.warning("Failed to pre-warm Deepgram connection", exc_info=True)
+        finally:
+            self._refilling.discard(key)
+
+    async def close(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        for idle in self._idle.values():
+            for connection in idle:
+                await connection.close()
+        self._idle.clear()
+
+
+@lru_cache(maxsize=1)
+def get_connection_pool() -> DeepgramConnectionPool:
+    """Get the process-wide Deepgram connection pool."""
+    settings = get_settings()
+    return DeepgramConnectionPool(settings.DEEPGRAM_POOL_SIZE)
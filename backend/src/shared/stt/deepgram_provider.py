@@ -1,12 +1,8 @@
 import asyncio
 from collections.abc import Callable, Awaitable
 
-from deepgram import AsyncDeepgramClient
-from deepgram.core.events import EventType
-from deepgram.extensions.types.sockets import ListenV1ControlMessage
-
-from src.settings import get_settings
-from src.shared.stt.streaming import StreamingSTTSession
+from src.shared.stt.deepgram_pool import DeepgramConnection, get_connection_pool
+from src.shared.stt.streaming import ReconnectingSTTSession
 
 _LOCALE_TO_LANG = {
     "en-US": "en",
@@ -15,18 +11,21 @@ _LOCALE_TO_LANG = {
 }
 
 
-class DeepgramStreamingSession(StreamingSTTSession):
-    """Streaming STT using Deepgram's async WebSocket API."""
+class DeepgramStreamingSession(ReconnectingSTTSession):
+    """Streaming STT using Deepgram's async WebSocket API.
+
+    The connection is taken from the warm pool (or opened) as soon as start()
+    is called. Audio that arrives before it is ready waits in the session's
+    audio queue and is flushed in order once the socket is available. If the
+    socket drops, a new one is acquired and the buffered audio replayed.
+    """
 
     def __init__(self) -> None:
-        self._connection = None
-        self._ctx_manager = None
-        self._listener_task: asyncio.Task | None = None
-        self._on_interim: Callable[[str], Awaitable[None]] | None = None
-        self._on_final: Callable[[str], Awaitable[None]] | None = None
+        super().__init__()
+        self._connection: DeepgramConnection | None = None
+        self._connect_task: asyncio.Task | None = None
         self._language: str = "en"
         self._keyterms: list[str] = []
-        self._started = False
 
     async def start(
         self,
@@ -35,32 +34,16 @@ class DeepgramStreamingSession(StreamingSTTSession):
         on_final: Callable[[str], Awaitable[None]],
         phrase_hints: list[str] | None = None,
     ) -> None:
-        self._on_interim = on_interim
-        self._on_final = on_final
+        self._bind_callbacks(on_interim, on_final)
         self._language = _LOCALE_TO_LANG.get(language, language)
         if phrase_hints:
             self._keyterms = [f"{p}:2" for p in phrase_hints]
+        self._connect_task = asyncio.create_task(self._connect())
 
-    async def _ensure_connected(self) -> None:
-        if self._started:
-            return
-        self._started = True
-        settings = get_settings()
-        client = AsyncDeepgramClient(api_key=settings.DEEPGRAM_API_KEY)
-        self._ctx_manager = client.listen.v1.connect(
-            model="nova-3",
-            language=self._language,
-            smart_format="true",
-            interim_results="true",
-            utterance_end_ms="1000",
-            encoding="linear16",
-            sample_rate=16000,
-            channels=1,
-            keyterm=self._keyterms,
-        )
-        self._connection = await self._ctx_manager.__aenter__()
-        self._connection.on(EventType.MESSAGE, self._handle_message)
-        self._listener_task = asyncio.create_task(self._connection.start_listening())
+    async def _connect(self) -> None:
+        connection = await get_connection_pool().acquire(self._language, self._keyterms)
+        connection.handler = self._handle_message
+        self._connection = connection
 
     async def _handle_message(self, result) -> None:
         if getattr(result, "type", None) != "Results":
@@ -69,33 +52,34 @@ class DeepgramStreamingSession(StreamingSTTSession):
         if not transcript:
             return
         if result.is_final:
-            if self._on_final:
-                await self._on_final(transcript)
-        elif self._on_interim:
-            await self._on_interim(transcript)
+            self._submit_final(transcript, result.start + result.duration)
+        else:
+            self._submit_interim(transcript)
 
-    async def send_audio(self, chunk: bytes) -> None:
-        await self._ensure_connected()
+    async def _write_audio(self, chunk: bytes) -> None:
+        if self._connection is None and self._connect_task:
+            await self._connect_task
         if self._connection:
+            if not self._connection.is_open:
+                raise ConnectionError("Deepgram connection closed")
             await self._connection.send_media(chunk)
 
-    async def stop(self) -> None:
+    async def _reconnect(self) -> None:
+        if self._connect_task and not self._connect_task.done():
+            self._connect_task.cancel()
+        self._connect_task = None
         if self._connection:
+            await self._connection.close()
+            self._connection = None
+        await self._connect()
+
+    async def _close(self) -> None:
+        if self._connect_task:
             try:
-                await self._connection.send_control(ListenV1ControlMessage(type="Finalize"))
-            except Exception:
-                pass
-        if self._listener_task:
-            self._listener_task.cancel()
-            try:
-                await self._listener_task
-            except (asyncio.CancelledError, Exception):
-                pass
-            self._listener_task = None
-        if self._ctx_manager:
-            try:
-                await self._ctx_manager.__aexit__(None, None, None)
+                await self._connect_task
             except Exception:
                 pass
-            self._ctx_manager = None
+            self._connect_task = None
+        if self._connection:
+            await self._connection.close(finalize=True)
         self._connection = None
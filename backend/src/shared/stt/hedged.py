@@ -0,0 +1,322 @@
+import asyncio
+import bisect
+import difflib
+import logging
+import re
+import time
+from collections.abc import Callable, Awaitable
+from dataclasses import dataclass, field
+from functools import partial
+
+from src.settings import AudioOverflowPolicy
+from src.shared.stt.audio_queue import BYTES_PER_MS, AudioQueueConfig, AudioSendQueue
+from src.shared.stt.streaming import StreamingSTTSession
+
+logger = logging.getLogger(__name__)
+
+_LATENCY_BUCKETS_MS = (50, 100, 200, 400, 800, 1600, 3200, 6400)
+
+
+@dataclass
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (upper bounds in ms, last bucket is overflow)."""
+    counts: list[int] = field(default_factory=lambda: [0] * (len(_LATENCY_BUCKETS_MS) + 1))
+    total_ms: float = 0.0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def observe(self, latency_ms: float) -> None:
+        self.counts[bisect.bisect_left(_LATENCY_BUCKETS_MS, latency_ms)] += 1
+        self.total_ms += latency_ms
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (inf if it overflows)."""
+        target = q * self.count
+        running = 0
+        for bound, count in zip((*_LATENCY_BUCKETS_MS, float("inf")), self.counts):
+            running += count
+            if running >= target and running:
+                return bound
+        return float("inf")
+
+
+@dataclass
+class ProviderLatency:
+    first_interim: LatencyHistogram = field(default_factory=LatencyHistogram)
+    final_lag: LatencyHistogram = field(default_factory=LatencyHistogram)
+    wins: int = 0
+
+
+# Process-wide per-provider latency, used to order providers for new sessions
+_provider_latency: dict[str, ProviderLatency] = {}
+
+
+def get_provider_latency() -> dict[str, ProviderLatency]:
+    return _provider_latency
+
+
+def rank_providers(providers: list[str]) -> list[str]:
+    """Order providers by observed median first-interim latency; unmeasured ones sort first."""
+    def median(name: str) -> float:
+        stats = _provider_latency.get(name)
+        if stats is None or stats.first_interim.count == 0:
+            return 0.0
+        return stats.first_interim.quantile(0.5)
+    return sorted(providers, key=median)
+
+
+_WORD = re.compile(r"\w+")
+# Share of the shorter side's words that must align for a final to repeat emitted text
+_MIN_OVERLAP = 0.5
+
+
+def _words(text: str) -> list[re.Match]:
+    return list(_WORD.finditer(text))
+
+
+@dataclass
+class _Branch:
+    name: str
+    session: StreamingSTTSession
+    # Audio waiting for this provider; a slow provider never holds back the other
+    feed: AudioSendQueue | None = None
+    starting: asyncio.Task | None = None
+    # Emitted words this provider's finals have covered so far
+    covered: int = 0
+    started_at: float | None = None
+    first_interim_at: float | None = None
+    failed: bool = False
+
+
+class HedgedStreamingSession(StreamingSTTSession):
+    """Runs two providers for one audio stream and keeps the faster result.
+
+    In "fanout" mode both providers receive audio from the start. In "hedge"
+    mode only the primary does; if it has produced no interim *hedge_after_ms*
+    after the first audio, or fails, the secondary is started and the
+    buffered audio is replayed to it.
+
+    Each provider is fed from its own queue holding up to *max_replay_ms* of
+    audio (oldest dropped beyond that), so a provider that falls behind or
+    fails does not stall the other; the session fails only when every
+    provider has.
+
+    Providers split utterances differently, so finals are matched by text: a
+    final is aligned with the words the other provider emitted in the last
+    *duplicate_window_ms* that this one has not covered yet, and only the
+    words beyond them (if any) are emitted. A final overlapping nothing there
+    is a new utterance. Interims are forwarded only from the provider that
+    spoke first since the last final. Per-provider first-interim latency and
+    final lag are recorded so rank_providers() can pick the primary for new
+    sessions.
+    """
+
+    def __init__(
+        self,
+        primary: tuple[str, Callable[[], StreamingSTTSession]],
+        secondary: tuple[str, Callable[[], StreamingSTTSession]],
+        mode: str = "hedge",
+        hedge_after_ms: int = 700,
+        max_replay_ms: int = 30000,
+        duplicate_window_ms: int = 10000,
+    ) -> None:
+        # Each provider session recovers on its own; no replay buffer needed here
+        super().__init__(replay_ms=0)
+        self._factories = dict((primary, secondary))
+        self._primary_name = primary[0]
+        self._secondary_name = secondary[0]
+        self._primary: _Branch | None = None
+        self._secondary: _Branch | None = None
+        self._mode = mode
+        self._hedge_after = hedge_after_ms / 1000
+        self._max_replay_bytes = max_replay_ms * BYTES_PER_MS
+        self._feed_config = AudioQueueConfig(max_ms=max_replay_ms, policy=AudioOverflowPolicy.DROP_OLDEST)
+        self._duplicate_window = duplicate_window_ms / 1000
+        self._hedge_buffer: list[bytes] | None = [] if mode == "hedge" else None
+        self._hedge_buffer_bytes = 0
+        self._start_args: tuple | None = None
+        self._first_audio_at: float | None = None
+        self._hedge_task: asyncio.Task | None = None
+        # Normalized words of all emitted finals and when each was emitted
+        self._emitted_words: list[str] = []
+        self._emitted_at: list[float] = []
+        self._interim_leader: str | None = None
+
+    @property
+    def branches(self) -> list[_Branch]:
+        return [b for b in (self._primary, self._secondary) if b is not None]
+
+    async def start(
+        self,
+        language: str,
+        on_interim: Callable[[str], Awaitable[None]],
+        on_final: Callable[[str], Awaitable[None]],
+        phrase_hints: list[str] | None = None,
+    ) -> None:
+        self._bind_callbacks(on_interim, on_final)
+        self._start_args = (language, phrase_hints)
+        self._primary = self._open_branch(self._primary_name)
+        if self._mode == "fanout":
+            self._start_secondary([])
+        results = await asyncio.gather(*(branch.starting for branch in self.branches), return_exceptions=True)
+        for branch, result in zip(self.branches, results):
+            if isinstance(result, Exception):
+                logger.error("Hedged STT: provider %s failed to start: %s", branch.name, result)
+                branch.failed = True
+        if self._primary.failed and self._secondary is None:
+            self._hedge_buffer = None
+            await self._start_secondary([]).starting
+        elif all(branch.failed for branch in self.branches):
+            raise results[0]
+
+    def _open_branch(self, name: str) -> _Branch:
+        """Create a provider session and start it; audio queued meanwhile waits for the start."""
+        branch = _Branch(name, self._factories[name]())
+        branch.feed = AudioSendQueue(partial(self._feed, branch), self._feed_config)
+        branch.starting = asyncio.create_task(self._start_branch(branch))
+        branch.starting.add_done_callback(lambda done: done.cancelled() or done.exception())
+        return branch
+
+    async def _start_branch(self, branch: _Branch) -> None:
+        language, phrase_hints = self._start_args
+
+        async def on_interim(text: str) -> None:
+            self._handle_interim(branch, text)
+
+        async def on_final(text: str) -> None:
+            self._handle_final(branch, text)
+
+        branch.started_at = time.monotonic()
+        await branch.session.start(language, on_interim, on_final, phrase_hints=phrase_hints)
+
+    def _start_secondary(self, replay: list[bytes]) -> _Branch:
+        """Start the secondary provider (once) and queue *replay* for it ahead of new audio."""
+        if self._secondary is None:
+            self._secondary = self._open_branch(self._secondary_name)
+            for chunk in replay:
+                self._secondary.feed.put_nowait(chunk)
+            logger.info("Hedged STT: started secondary provider %s", self._secondary_name)
+        return self._secondary
+
+    async def _feed(self, branch: _Branch, chunk: bytes) -> None:
+        """Send one chunk to a provider; a failure retires that provider only."""
+        if branch.failed:
+            return
+        try:
+            await branch.starting
+            await branch.session.send_audio(chunk)
+        except Exception:
+            logger.exception("Hedged STT: provider %s failed", branch.name)
+            branch.failed = True
+            if branch is self._primary and self._mode == "hedge" and self._secondary is None:
+                # Fail over with whatever audio is still buffered
+                replay, self._hedge_buffer = self._hedge_buffer or [], None
+                self._start_secondary(replay)
+
+    def _handle_interim(self, branch: _Branch, text: str) -> None:
+        now = time.monotonic()
+        if branch.first_interim_at is None:
+            branch.first_interim_at = now
+            if self._first_audio_at is not None:
+                # A late-started secondary is measured from its own start, not the session's first audio
+                latency = (now - max(self._first_audio_at, branch.started_at or 0.0)) * 1000
+                _provider_latency.setdefault(branch.name, ProviderLatency()).first_interim.observe(latency)
+        if self._interim_leader is None:
+            self._interim_leader = branch.name
+        if self._interim_leader == branch.name and self._transcripts:
+            self._transcripts.submit_interim(text)
+
+    def _handle_final(self, branch: _Branch, text: str) -> None:
+        now = time.monotonic()
+        stats = _provider_latency.setdefault(branch.name, ProviderLatency())
+        words = _words(text)
+        if not words:
+            return
+        normalized = [word.group().lower() for word in words]
+
+        # Only recent words of the other provider can be repeated by this final
+        while branch.covered < len(self._emitted_words) and now - self._emitted_at[branch.covered] > self._duplicate_window:
+            branch.covered += 1
+        tail = self._emitted_words[branch.covered:]
+        if not tail:
+            # Everything emitted is this provider's own or stale: a new utterance
+            self._emit(branch, stats, text, normalized, now)
+            return
+
+        # Align with the start of the uncovered words (allowing for a different split)
+        window = tail[:2 * len(normalized) + 2]
+        matcher = difflib.SequenceMatcher(None, window, normalized, autojunk=False)
+        blocks = [block for block in matcher.get_matching_blocks() if block.size]
+        matched = sum(b.size for b in blocks)
+        if matched < _MIN_OVERLAP * min(len(normalized), len(window)):
+            # Nothing the other provider emitted: a new utterance
+            self._emit(branch, stats, text, normalized, now)
+            return
+
+        tail_end = blocks[-1].a + blocks[-1].size
+        final_end = blocks[-1].b + blocks[-1].size
+        branch.covered += tail_end
+        stats.final_lag.observe((now - self._emitted_at[branch.covered - 1]) * 1000)
+        if final_end < len(normalized) and branch.covered == len(self._emitted_words):
+            # This provider's utterance runs past the emitted text: emit the rest
+            start = words[final_end].start()
+            self._emit(branch, stats, text[start:], normalized[final_end:], now)
+
+    def _emit(self, branch: _Branch, stats: ProviderLatency, text: str, normalized: list[str], now: float) -> None:
+        stats.wins += 1
+        stats.final_lag.observe(0.0)
+        self._emitted_words.extend(normalized)
+        self._emitted_at.extend([now] * len(normalized))
+        branch.covered = len(self._emitted_words)
+        self._interim_leader = None
+        if self._transcripts:
+            self._transcripts.submit_final(text)
+
+    async def _write_audio(self, chunk: bytes) -> None:
+        if self._first_audio_at is None:
+            self._first_audio_at = time.monotonic()
+            if self._mode == "hedge":
+                self._hedge_task = asyncio.create_task(self._hedge_if_late())
+
+        if self._hedge_buffer is not None:
+            self._hedge_buffer.append(chunk)
+            self._hedge_buffer_bytes += len(chunk)
+            if self._hedge_buffer_bytes > self._max_replay_bytes:
+                # Too much audio to catch up on; stay with the primary
+                self._hedge_buffer = None
+
+        live = [branch for branch in self.branches if not branch.failed]
+        if not live:
+            raise ConnectionError("All hedged STT providers failed")
+        for branch in live:
+            branch.feed.put_nowait(chunk)
+
+    async def _hedge_if_late(self) -> None:
+        await asyncio.sleep(self._hedge_after)
+        if self._primary.first_interim_at is not None or self._hedge_buffer is None:
+            self._hedge_buffer = None
+            return
+        replay, self._hedge_buffer = self._hedge_buffer, None
+        self._start_secondary(replay)
+
+    async def _close(self) -> None:
+        if self._hedge_task:
+            self._hedge_task.cancel()
+            try:
+                await self._hedge_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._hedge_task = None
+        await asyncio.gather(*(self._close_branch(branch) for branch in self.branches))
+
+    @staticmethod
+    async def _close_branch(branch: _Branch) -> None:
+        """Deliver the provider's queued audio, then stop it."""
+        await branch.feed.close()
+        try:
+            await branch.starting
+            await branch.session.stop()
+        except Exception:
+            logger.warning("Hedged STT: failed to stop provider %s", branch.name, exc_info=True)
@@ -0,0 +1,63 @@
+from collections import deque
+from dataclasses import dataclass, field
+
+from src.shared.stt.audio_queue import BYTES_PER_MS
+
+
+class PCMRingBuffer:
+    """Rolling window of the most recent PCM sent to a provider.
+
+    Positions are absolute byte offsets from the start of the session, so a
+    caller can ask for "everything since offset N" after older audio has
+    already been evicted (it gets whatever is still retained).
+    """
+
+    def __init__(self, max_ms: int) -> None:
+        self._max_bytes = max_ms * BYTES_PER_MS
+        self._chunks: deque[bytes] = deque()
+        self._size = 0
+        self._start = 0
+
+    @property
+    def start(self) -> int:
+        """Absolute offset of the oldest retained byte."""
+        return self._start
+
+    @property
+    def end(self) -> int:
+        """Absolute offset just past the newest byte (total bytes appended)."""
+        return self._start + self._size
+
+    def append(self, chunk: bytes) -> None:
+        if self._max_bytes <= 0:
+            self._start += len(chunk)
+            return
+        self._chunks.append(chunk)
+        self._size += len(chunk)
+        while self._size - len(self._chunks[0]) >= self._max_bytes:
+            dropped = self._chunks.popleft()
+            self._size -= len(dropped)
+            self._start += len(dropped)
+
+    def since(self, offset: int) -> bytes:
+        """Return retained audio from *offset* (clamped to the buffer) to the end."""
+        skip = max(offset - self._start, 0)
+        if skip >= self._size:
+            return b""
+        return b"".join(self._chunks)[skip:]
+
+
+@dataclass
+class RecoveryStats:
+    """Reconnects performed by a session and how long each one took."""
+
+    reconnects: int = 0
+    failed_reconnects: int = 0
+    recovery_ms: list[float] = field(default_factory=list)
+    replayed_ms: float = 0.0
+    lost_ms: float = 0.0
+    duplicate_finals: int = 0
+
+    @property
+    def max_recovery_ms(self) -> float:
+        return max(self.recovery_ms, default=0.0)
@@ -1,22 +1,60 @@
 from __future__ import annotations
 
 import abc
+import asyncio
+import logging
+import time
 from collections.abc import Callable, Awaitable
 
+from src.settings import get_settings
+from src.shared.stt.audio_queue import BYTES_PER_MS, AudioQueueConfig, AudioQueueStats, AudioSendQueue
+from src.shared.stt.coalescer import TranscriptCoalescer
+from src.shared.stt.recovery import PCMRingBuffer, RecoveryStats
+
+logger = logging.getLogger(__name__)
+
 
 class StreamingSTTSession(abc.ABC):
     """Base class for streaming speech-to-text sessions.
 
-    Providers implement start/send_audio/stop to pipe live PCM audio
+    Providers implement start/_write_audio/_close to pipe live PCM audio
     into a continuous recogniser and fire callbacks on interim/final results.
+
+    send_audio() only enqueues into a bounded per-session buffer; a sender
+    task feeds the provider, so a slow provider cannot stall the caller and
+    a fast client cannot grow memory without limit.
+
+    Results go through a TranscriptCoalescer (see _bind_callbacks), which
+    rate-limits interims and keeps finals in order. Providers that can reopen
+    their stream derive from ReconnectingSTTSession instead.
     """
 
+    def __init__(
+        self,
+        queue_config: AudioQueueConfig | None = None,
+        replay_ms: int | None = None,
+    ) -> None:
+        settings = get_settings()
+        self._audio_queue = AudioSendQueue(
+            self._send_chunk, queue_config or AudioQueueConfig.from_settings()
+        )
+        self._transcripts: TranscriptCoalescer | None = None
+        self._replay = PCMRingBuffer(
+            replay_ms if replay_ms is not None else settings.STT_REPLAY_BUFFER_MS
+        )
+        self._reconnect_attempts = settings.STT_RECONNECT_ATTEMPTS
+        self._stream_base = 0
+        self._final_offset = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.recovery_stats = RecoveryStats()
+
     @abc.abstractmethod
     async def start(
         self,
         language: str,
         on_interim: Callable[[str], Awaitable[None]],
         on_final: Callable[[str], Awaitable[None]],
+        phrase_hints: list[str] | None = None,
     ) -> None:
         """Begin continuous recognition for *language*.
 
@@ -24,10 +62,133 @@ class StreamingSTTSession(abc.ABC):
         *on_final* is called when the recogniser commits a sentence.
         """
 
-    @abc.abstractmethod
     async def send_audio(self, chunk: bytes) -> None:
-        """Feed a chunk of raw 16 kHz 16-bit mono PCM audio."""
+        """Queue a chunk of raw 16 kHz 16-bit mono PCM audio for the provider."""
+        await self._audio_queue.put(chunk)
 
-    @abc.abstractmethod
     async def stop(self) -> None:
-        """Stop recognition and release resources."""
+        """Deliver queued audio, then stop recognition and release resources."""
+        await self._audio_queue.close()
+        stats = self.audio_stats
+        logger.info(
+            "%s audio queue: max depth %.0fms, dropped %.0fms, send latency avg %.1fms / max %.1fms",
+            type(self).__name__, stats.max_depth_ms, stats.dropped_ms,
+            stats.avg_send_latency_ms, stats.max_send_latency_ms,
+        )
+        recovery = self.recovery_stats
+        if recovery.reconnects or recovery.failed_reconnects:
+            logger.info(
+                "%s recovery: %d reconnect(s), %d failed, max %.0fms, replayed %.0fms, lost %.0fms, "
+                "%d duplicate final(s) dropped",
+                type(self).__name__, recovery.reconnects, recovery.failed_reconnects,
+                recovery.max_recovery_ms, recovery.replayed_ms, recovery.lost_ms,
+                recovery.duplicate_finals,
+            )
+        await self._close()
+        if self._transcripts:
+            await self._transcripts.close()
+            self._transcripts = None
+
+    @property
+    def audio_stats(self) -> AudioQueueStats:
+        """Queue depth, dropped audio and provider send latency for this session."""
+        return self._audio_queue.stats
+
+    def _bind_callbacks(
+        self,
+        on_interim: Callable[[str], Awaitable[None]],
+        on_final: Callable[[str], Awaitable[None]],
+    ) -> TranscriptCoalescer:
+        """Route provider results to the caller's callbacks; call from start()."""
+        self._loop = asyncio.get_running_loop()
+        self._transcripts = TranscriptCoalescer(on_interim, on_final)
+        return self._transcripts
+
+    def _submit_interim(self, text: str) -> None:
+        if self._transcripts:
+            self._transcripts.submit_interim(text)
+
+    def _submit_final(self, text: str, end_seconds: float | None = None) -> None:
+        """Deliver a final; *end_seconds* is its end time within the current provider stream."""
+        if end_seconds is None:
+            end = self._replay.end
+        else:
+            end = self._stream_base + int(end_seconds * 1000) * BYTES_PER_MS
+            if end <= self._final_offset:
+                self.recovery_stats.duplicate_finals += 1
+                return
+        self._final_offset = max(self._final_offset, end)
+        if self._transcripts:
+            self._transcripts.submit_final(text)
+
+    def _submit_interim_threadsafe(self, text: str) -> None:
+        self._loop.call_soon_threadsafe(self._submit_interim, text)
+
+    def _submit_final_threadsafe(self, text: str, end_seconds: float | None = None) -> None:
+        self._loop.call_soon_threadsafe(self._submit_final, text, end_seconds)
+
+    async def _send_chunk(self, chunk: bytes) -> None:
+        self._replay.append(chunk)
+        await self._write_audio(chunk)
+
+    @abc.abstractmethod
+    async def _write_audio(self, chunk: bytes) -> None:
+        """Send one chunk to the provider (called only from the sender task)."""
+
+    @abc.abstractmethod
+    async def _close(self) -> None:
+        """Stop recognition and release provider resources."""
+
+
+class ReconnectingSTTSession(StreamingSTTSession):
+    """Streaming session that recovers from a dropped provider connection.
+
+    Audio sent to the provider is kept in a rolling buffer, and when
+    _write_audio fails _reconnect() opens a fresh stream that is fed
+    everything after the last finalized offset. Providers report finals
+    through _submit_final with the end time of the result so that a final
+    repeated by the replayed stream is dropped.
+    """
+
+    async def _send_chunk(self, chunk: bytes) -> None:
+        self._replay.append(chunk)
+        try:
+            await self._write_audio(chunk)
+        except Exception as e:
+            await self._recover(e)
+
+    async def _recover(self, error: Exception) -> None:
+        """Reopen the provider stream and replay audio after the last final."""
+        logger.warning("%s provider failed (%s), reconnecting", type(self).__name__, error)
+        started = time.perf_counter()
+        for attempt in range(self._reconnect_attempts):
+            if attempt:
+                await asyncio.sleep(0.2 * 2 ** (attempt - 1))
+            try:
+                await self._reconnect()
+                replay_from = max(self._final_offset, self._replay.start)
+                lost = replay_from - self._final_offset
+                self._stream_base = replay_from
+                audio = self._replay.since(replay_from)
+                if audio:
+                    await self._write_audio(audio)
+            except Exception:
+                self.recovery_stats.failed_reconnects += 1
+                logger.warning("%s reconnect attempt %d failed", type(self).__name__, attempt + 1, exc_info=True)
+                continue
+
+            stats = self.recovery_stats
+            stats.reconnects += 1
+            stats.recovery_ms.append((time.perf_counter() - started) * 1000)
+            stats.replayed_ms += len(audio) / BYTES_PER_MS
+            stats.lost_ms += lost / BYTES_PER_MS
+            logger.info(
+                "%s recovered in %.0fms, replayed %.0fms of audio",
+                type(self).__name__, stats.recovery_ms[-1], len(audio) / BYTES_PER_MS,
+            )
+            return
+        raise error
+
+    @abc.abstractmethod
+    async def _reconnect(self) -> None:
+        """Replace the provider stream with a fresh one."""
@@ -0,0 +1,165 @@
+"""
+Content-addressed cache for transcriptions of uploaded recordings.
+
+Recordings are keyed by a hash of their decoded 16 kHz PCM, so the same audio
+re-encoded or sent with a different WAV header still hits, together with the
+locale and a digest of the phrase hints (their version: editing the hint list
+changes the key). Besides the transcription, an entry can hold results
+computed from it, such as the dental extraction or psychotherapy analysis.
+"""
+
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, TypeVar
+
+import msgspec
+
+from src.settings import get_settings
+from src.shared.audio import to_pcm16k
+
+logger = logging.getLogger(__name__)
+
+_MB = 1024 * 1024
+
+T = TypeVar("T")
+
+TRANSCRIPTION = "transcription"
+
+
+@dataclass
+class TranscriptionCacheStats:
+    """Lookups served from the cache, by a concurrent computation, or computed."""
+
+    hits: int = 0
+    shared: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.shared + self.misses
+        return (self.hits + self.shared) / lookups if lookups else 0.0
+
+
+class TranscriptionCache:
+    """LRU of per-recording entries, bounded by *max_bytes*.
+
+    An entry maps value names ("transcription", downstream results) to
+    values; its size is the length of their JSON encoding, so values must be
+    msgspec-encodable. Concurrent requests for the same key and name share
+    one computation, run as a task so that it completes for the others when
+    the caller that started it is cancelled. Failures are not cached.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        # key -> name -> (value, encoded size)
+        self._entries: OrderedDict[str, dict[str, tuple[Any, int]]] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._size = 0
+        self._inflight: dict[tuple[str, str], asyncio.Task] = {}
+        self.stats = TranscriptionCacheStats()
+
+    @staticmethod
+    def key(pcm: bytes, locale: str, phrase_hints: list[str] | None = None) -> str:
+        digest = hashlib.sha256(f"{locale}\0".encode())
+        digest.update(hashlib.sha256("\n".join(phrase_hints or []).encode()).digest())
+        digest.update(pcm)
+        return digest.hexdigest()
+
+    async def get_or_compute(self, key: str, name: str, compute: Callable[[], Awaitable[T]]) -> T:
+        """Return the cached *name* value of *key*, or run *compute* once for all concurrent callers."""
+        entry = self._entries.get(key)
+        if entry is not None and name in entry:
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[name][0]
+
+        task = self._inflight.get((key, name))
+        if task is None:
+            self.stats.misses += 1
+            task = asyncio.create_task(self._compute(key, name, compute))
+            # Mark the exception retrieved when every caller was cancelled
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self._inflight[key, name] = task
+        else:
+            self.stats.shared += 1
+        return await asyncio.shield(task)
+
+    async def _compute(self, key: str, name: str, compute: Callable[[], Awaitable[T]]) -> T:
+        try:
+            value = await compute()
+            self.put(key, name, value)
+            return value
+        finally:
+            del self._inflight[key, name]
+
+    def get(self, key: str, name: str) -> Any | None:
+        """Return the cached *name* value of *key* without computing it."""
+        entry = self._entries.get(key)
+        if entry is None or name not in entry:
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry[name][0]
+
+    def put(self, key: str, name: str, value: Any) -> None:
+        """Store a value computed outside get_or_compute (e.g. a completed stream)."""
+        size = len(msgspec.json.encode(value))
+        entry = self._entries.get(key)
+        # An overwritten value no longer counts
+        replaced = entry[name][1] if entry is not None and name in entry else 0
+        entry_size = self._sizes.get(key, len(key)) - replaced + size
+        if entry_size > self._max_bytes:
+            return
+        if entry is None:
+            entry = self._entries[key] = {}
+        entry[name] = (value, size)
+        self._entries.move_to_end(key)
+        self._size += entry_size - self._sizes.get(key, 0)
+        self._sizes[key] = entry_size
+        while self._size > self._max_bytes:
+            evicted, _ = self._entries.popitem(last=False)
+            self._size -= self._sizes.pop(evicted)
+
+
+@lru_cache(maxsize=1)
+def get_transcription_cache() -> TranscriptionCache:
+    """Get the process-wide transcription cache."""
+    return TranscriptionCache(max_bytes=get_settings().TRANSCRIPTION_CACHE_MB * _MB)
+
+
+async def transcribe_cached(
+    audio_data: bytes,
+    locale: str,
+    transcribe: Callable[[bytes], T],
+    phrase_hints: list[str] | None = None,
+) -> tuple[str, T]:
+    """
+    Transcribe a recording unless the same audio was transcribed before.
+
+    Args:
+        audio_data: Audio data as a WAV file (any rate/channels) or raw PCM
+        locale: Language locale code
+        transcribe: Blocking STT call taking 16 kHz 16-bit mono PCM; its result is cached
+        phrase_hints: Phrase hints passed to the STT call
+
+    Returns:
+        (cache key of the recording, result of *transcribe*)
+
+    Raises:
+        AudioFormatError: If the audio format is unsupported
+    """
+    def decode() -> tuple[bytes, str]:
+        pcm = to_pcm16k(audio_data)
+        return pcm, TranscriptionCache.key(pcm, locale, phrase_hints)
+
+    pcm, key = await asyncio.to_thread(decode)
+    result = await get_transcription_cache().get_or_compute(
+        key, TRANSCRIPTION, lambda: asyncio.to_thread(transcribe, pcm)
+    )
+    return key, result
@@ -0,0 +1,240 @@
+"""
+Translation memory: cached translations in memory and in the database.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+from sqlalchemy import Integer, String, and_, column, or_, select, update, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.database import async_session
+from src.models import TranslationMemoryEntry
+from src.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# (source hash, source lang, target lang)
+MemoryKey = tuple[str, str, str]
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for lookup: NFC, trimmed, whitespace collapsed."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def memory_key(text: str, source_lang: str, target_lang: str) -> MemoryKey:
+    digest = hashlib.sha256(normalize_text(text).encode()).hexdigest()
+    return digest, source_lang, target_lang
+
+
+class TranslationMemory:
+    """Two-tier store of previous translations.
+
+    Lookups hit a bounded in-memory LRU first and then the translation_memory
+    table. Entries older than *ttl_seconds* are treated as misses in both
+    tiers and overwritten when translated again. Hit counts are accumulated
+    in memory and written back in batches; preload() fills the memory tier
+    with the most frequently used phrases. Database writes (new entries and
+    hit counts) run as background tasks so they never delay a translation;
+    flush() waits for them and is called at shutdown.
+
+    The database tier is best effort: if it is unavailable, lookups fall
+    back to memory only and translation continues.
+    """
+
+    # Pending hit counts are written back once this many have accumulated
+    _HIT_FLUSH_THRESHOLD = 100
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._entries: OrderedDict[MemoryKey, tuple[str, float]] = OrderedDict()
+        self._pending_hits: Counter[MemoryKey] = Counter()
+        self._writes: set[asyncio.Task] = set()
+
+    async def get_many(self, keys: list[MemoryKey]) -> dict[MemoryKey, str]:
+        """Return cached translations for the keys that are present and fresh."""
+        now = time.time()
+        found: dict[MemoryKey, str] = {}
+        missing: list[MemoryKey] = []
+        for key in dict.fromkeys(keys):
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] < self._ttl:
+                self._entries.move_to_end(key)
+                found[key] = entry[0]
+            else:
+                missing.append(key)
+
+        if missing:
+            for key, (text, stored_at) in (await self._load(missing)).items():
+                found[key] = text
+                self._remember(key, text, stored_at)
+
+        self._pending_hits.update(found.keys())
+        if sum(self._pending_hits.values()) >= self._HIT_FLUSH_THRESHOLD:
+            self._write_in_background(self._write_hits())
+        return found
+
+    def put_many(self, entries: dict[MemoryKey, tuple[str, str]]) -> None:
+        """Store translations; *entries* maps key -> (source text, translated text). Persisted in the background."""
+        now = time.time()
+        for key, (_, translated) in entries.items():
+            self._remember(key, translated, now)
+        if not entries:
+            return
+
+        rows = [
+            {
+                "source_hash": key[0],
+                "source_lang": key[1],
+                "target_lang": key[2],
+                "source_text": normalize_text(source),
+                "translated_text": translated,
+                "hit_count": 1,
+                "created_at": datetime.fromtimestamp(now, timezone.utc),
+            }
+            for key, (source, translated) in entries.items()
+        ]
+        self._write_in_background(self._persist(rows))
+
+    async def _persist(self, rows: list[dict]) -> None:
+        stmt = insert(TranslationMemoryEntry).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["source_hash", "source_lang", "target_lang"],
+            set_={
+                "translated_text": stmt.excluded.translated_text,
+                "created_at": stmt.excluded.created_at,
+                "hit_count": TranslationMemoryEntry.hit_count + 1,
+            },
+        )
+        try:
+            async with async_session() as db:
+                await db.execute(stmt)
+                await db.commit()
+        except (SQLAlchemyError, OSError):
+            logger.warning("Translation memory: failed to persist %d entries", len(rows), exc_info=True)
+
+    async def preload(self, limit: int) -> int:
+        """Load the *limit* most used fresh phrases into memory; returns how many."""
+        if limit <= 0:
+            return 0
+        stmt = (
+            select(TranslationMemoryEntry)
+            .where(TranslationMemoryEntry.created_at >= self._fresh_since())
+            .order_by(TranslationMemoryEntry.hit_count.desc())
+            .limit(min(limit, self._max_entries))
+        )
+        try:
+            async with async_session() as db:
+                rows = (await db.execute(stmt)).scalars().all()
+        except (SQLAlchemyError, OSError):
+            logger.warning("Translation memory: preload failed", exc_info=True)
+            return 0
+        # Least used first so the most used end up most recently used
+        for row in reversed(rows):
+            key = (row.source_hash, row.source_lang, row.target_lang)
+            self._remember(key, row.translated_text, row.created_at.timestamp())
+        logger.info("Translation memory: preloaded %d phrases", len(rows))
+        return len(rows)
+
+    async def flush(self) -> None:
+        """Wait for background writes, then write accumulated hit counts to the database."""
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+        await self._write_hits()
+
+    def _write_in_background(self, write) -> None:
+        task = asyncio.create_task(write)
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def _write_hits(self) -> None:
+        pending, self._pending_hits = self._pending_hits, Counter()
+        if not pending:
+            return
+        # One UPDATE ... FROM (VALUES ...) for the whole batch
+        hits = values(
+            column("source_hash", String),
+            column("source_lang", String),
+            column("target_lang", String),
+            column("hits", Integer),
+            name="hits",
+        ).data([(*key, count) for key, count in pending.items()])
+        stmt = (
+            update(TranslationMemoryEntry)
+            .where(
+                TranslationMemoryEntry.source_hash == hits.c.source_hash,
+                TranslationMemoryEntry.source_lang == hits.c.source_lang,
+                TranslationMemoryEntry.target_lang == hits.c.target_lang,
+            )
+            .values(hit_count=TranslationMemoryEntry.hit_count + hits.c.hits)
+        )
+        try:
+            async with async_session() as db:
+                await db.execute(stmt)
+                await db.commit()
+        except (SQLAlchemyError, OSError):
+            logger.warning("Translation memory: failed to write hit counts", exc_info=True)
+
+    def _remember(self, key: MemoryKey, text: str, stored_at: float) -> None:
+        self._entries[key] = (text, stored_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _fresh_since(self) -> datetime:
+        return datetime.now(timezone.utc) - timedelta(seconds=self._ttl)
+
+    async def _load(self, keys: list[MemoryKey]) -> dict[MemoryKey, tuple[str, float]]:
+        stmt = select(TranslationMemoryEntry).where(
+            TranslationMemoryEntry.created_at >= self._fresh_since(),
+            or_(*(
+                and_(
+                    TranslationMemoryEntry.source_hash == source_hash,
+                    TranslationMemoryEntry.source_lang == source_lang,
+                    TranslationMemoryEntry.target_lang == target_lang,
+                )
+                for source_hash, source_lang, target_lang in keys
+            )),
+        )
+        try:
+            async with async_session() as db:
+                rows = (await db.execute(stmt)).scalars().all()
+        except (SQLAlchemyError, OSError):
+            logger.warning("Translation memory: lookup failed", exc_info=True)
+            return {}
+        return {
+            (row.source_hash, row.source_lang, row.target_lang): (
+                row.translated_text, row.created_at.timestamp()
+            )
+            for row in rows
+        }
+
+
+@lru_cache(maxsize=1)
+def get_translation_memory() -> TranslationMemory:
+    """Get the process-wide translation memory."""
+    settings = get_settings()
+    return TranslationMemory(
+        max_entries=settings.TRANSLATION_MEMORY_SIZE,
+        ttl_seconds=settings.TRANSLATION_MEMORY_TTL_DAYS * 86400,
+    )
+
+
+async def preload_translation_memory() -> None:
+    """Warm the translation memory with frequently used phrases."""
+    await get_translation_memory().preload(get_settings().TRANSLATION_MEMORY_PRELOAD)
+
+
+async def flush_translation_memory() -> None:
+    """Persist hit counts accumulated since the last flush."""
+    if get_translation_memory.cache_info().currsize:
+        await get_translation_memory().flush()
@@ -0,0 +1,225 @@
+"""
+Content-addressed cache for synthesized speech.
+"""
+
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from src.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+_MB = 1024 * 1024
+
+
+@dataclass
+class TTSCacheStats:
+    """Lookups served from each tier or a concurrent synthesis, and the audio volume returned."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    shared: int = 0
+    misses: int = 0
+    bytes_served: int = 0
+    bytes_synthesized: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served from the cache (not from a synthesis in flight)."""
+        lookups = self.memory_hits + self.disk_hits + self.shared + self.misses
+        return (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+
+
+class TTSCache:
+    """Two-tier cache of synthesized audio keyed by (text, voice, output format).
+
+    The memory tier is an LRU bounded by total bytes. The disk tier keeps one
+    file per entry under *directory*, evicting least recently used files once
+    the total exceeds *disk_bytes*. Disk hits are served from a read-only
+    memory map, so the audio stays in the page cache instead of the heap, and
+    the mapping is promoted to the memory tier.
+
+    Concurrent requests for the same key share one synthesis, run as a task
+    so that it completes for the others when the caller that started it is
+    cancelled.
+    """
+
+    def __init__(self, memory_bytes: int, directory: str | Path, disk_bytes: int) -> None:
+        self._memory_bytes = memory_bytes
+        self._memory: OrderedDict[str, bytes | memoryview] = OrderedDict()
+        self._memory_size = 0
+        self._directory = Path(directory)
+        self._disk_bytes = disk_bytes
+        self._disk: OrderedDict[str, int] = OrderedDict()
+        self._disk_size = 0
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.stats = TTSCacheStats()
+        if disk_bytes > 0:
+            self._load_disk_index()
+
+    @staticmethod
+    def key(text: str, voice: str, output_format: str) -> str:
+        digest = hashlib.sha256(f"{voice}\0{output_format}\0{text}".encode()).hexdigest()
+        # The format suffix lets a key be checked against a requested format (see key_format)
+        return f"{digest}.{output_format}"
+
+    @staticmethod
+    def key_format(key: str) -> str:
+        """Output format the audio under *key* is encoded in."""
+        return key.rpartition(".")[2]
+
+    async def get_or_synthesize(
+        self,
+        text: str,
+        voice: str,
+        output_format: str,
+        synthesize: Callable[[], Awaitable[bytes]],
+    ) -> bytes | memoryview:
+        """Return cached audio, or run *synthesize* once for all concurrent callers."""
+        key = self.key(text, voice, output_format)
+
+        audio = self._get_memory(key)
+        if audio is not None:
+            self.stats.memory_hits += 1
+            return self._served(audio)
+
+        audio = self._get_disk(key)
+        if audio is not None:
+            self.stats.disk_hits += 1
+            self._put_memory(key, audio)
+            return self._served(audio)
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats.misses += 1
+            task = asyncio.create_task(self._synthesize(key, synthesize))
+            # Mark the exception retrieved when every caller was cancelled
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self._inflight[key] = task
+        else:
+            self.stats.shared += 1
+        return self._served(await asyncio.shield(task))
+
+    async def _synthesize(self, key: str, synthesize: Callable[[], Awaitable[bytes]]) -> bytes:
+        try:
+            audio = await synthesize()
+            self.stats.bytes_synthesized += len(audio)
+            self._put_memory(key, audio)
+            await self._put_disk(key, audio)
+            return audio
+        finally:
+            del self._inflight[key]
+
+    def get(self, key: str) -> bytes | memoryview | None:
+        """Return audio already cached under *key* without synthesizing."""
+        audio = self._get_memory(key)
+        if audio is None:
+            audio = self._get_disk(key)
+            if audio is None:
+                return None
+            self._put_memory(key, audio)
+        return self._served(audio)
+
+    async def put(self, key: str, audio: bytes) -> None:
+        """Store audio produced outside get_or_synthesize (e.g. a completed stream)."""
+        self.stats.bytes_synthesized += len(audio)
+        self._put_memory(key, audio)
+        await self._put_disk(key, audio)
+
+    def _served(self, audio: bytes | memoryview) -> bytes | memoryview:
+        self.stats.bytes_served += len(audio)
+        return audio
+
+    def _get_memory(self, key: str) -> bytes | memoryview | None:
+        audio = self._memory.get(key)
+        if audio is not None:
+            self._memory.move_to_end(key)
+        return audio
+
+    def _put_memory(self, key: str, audio: bytes | memoryview) -> None:
+        if len(audio) > self._memory_bytes or key in self._memory:
+            return
+        self._memory[key] = audio
+        self._memory_size += len(audio)
+        while self._memory_size > self._memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+
+    def _path(self, key: str) -> Path:
+        return self._directory / key[:2] / f"{key}.audio"
+
+    def _load_disk_index(self) -> None:
+        entries = []
+        for path in self._directory.glob("*/*.audio"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_size += size
+        self._evict_disk()
+        if self._disk:
+            logger.info("TTS cache: %d entries (%.1f MB) on disk", len(self._disk), self._disk_size / _MB)
+
+    def _get_disk(self, key: str) -> memoryview | None:
+        if key not in self._disk:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            os.utime(path)
+        except (OSError, ValueError):
+            self._disk_size -= self._disk.pop(key)
+            return None
+        self._disk.move_to_end(key)
+        return memoryview(mapped)
+
+    async def _put_disk(self, key: str, audio: bytes) -> None:
+        if len(audio) > self._disk_bytes or key in self._disk:
+            return
+        try:
+            await asyncio.to_thread(self._write_file, self._path(key), audio)
+        except OSError:
+            logger.warning("TTS cache: failed to write %s", self._path(key), exc_info=True)
+            return
+        self._disk[key] = len(audio)
+        self._disk_size += len(audio)
+        self._evict_disk()
+
+    @staticmethod
+    def _write_file(path: Path, audio: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(audio)
+        os.replace(tmp, path)
+
+    def _evict_disk(self) -> None:
+        while self._disk_size > self._disk_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_size -= size
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+
+@lru_cache(maxsize=1)
+def get_tts_cache() -> TTSCache:
+    """Get the process-wide TTS cache."""
+    settings = get_settings()
+    return TTSCache(
+        memory_bytes=settings.TTS_CACHE_MEMORY_MB * _MB,
+        directory=settings.TTS_CACHE_DIR,
+        disk_bytes=settings.TTS_CACHE_DISK_MB * _MB,
+    )
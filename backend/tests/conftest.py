@@ -0,0 +1,5 @@
+import os
+
+# Settings require the service credentials; tests never reach the services
+for name in ("AZURE_SPEECH_KEY", "AZURE_OPENAI_ENDPOINT", "AZURE_OPENAI_KEY", "AZURE_TRANSLATOR_KEY", "DEEPGRAM_API_KEY"):
+    os.environ.setdefault(name, "test")
@@ -0,0 +1,214 @@
+import asyncio
+
+import pytest
+
+from src.shared.stt import hedged
+from src.shared.stt.audio_queue import AudioQueueConfig
+from src.shared.stt.hedged import HedgedStreamingSession
+from src.shared.stt.streaming import StreamingSTTSession
+
+CHUNK = b"\0" * 3200  # 100 ms
+
+
+class FakeSTTSession(StreamingSTTSession):
+    """Local provider: records the audio it receives; tests emit results through it."""
+
+    def __init__(self, send_delay: float = 0.0, fail_after: int | None = None) -> None:
+        super().__init__(queue_config=AudioQueueConfig(max_ms=200), replay_ms=0)
+        self.send_delay = send_delay
+        self.fail_after = fail_after
+        self.chunks: list[bytes] = []
+        self.started = self.stopped = False
+
+    async def start(self, language, on_interim, on_final, phrase_hints=None) -> None:
+        self.on_interim, self.on_final = on_interim, on_final
+        self.started = True
+
+    async def _write_audio(self, chunk: bytes) -> None:
+        if self.fail_after is not None and len(self.chunks) >= self.fail_after:
+            raise ConnectionError("provider gone")
+        await asyncio.sleep(self.send_delay)
+        self.chunks.append(chunk)
+
+    async def _close(self) -> None:
+        self.stopped = True
+
+
+@pytest.fixture(autouse=True)
+def provider_latency(monkeypatch):
+    latency = {}
+    monkeypatch.setattr(hedged, "_provider_latency", latency)
+    return latency
+
+
+def _hedged(primary: FakeSTTSession, secondary: FakeSTTSession, **kwargs) -> HedgedStreamingSession:
+    return HedgedStreamingSession(("a", lambda: primary), ("b", lambda: secondary), **kwargs)
+
+
+async def _started(session: HedgedStreamingSession) -> tuple[list[str], list[str]]:
+    interims, finals = [], []
+
+    async def on_interim(text):
+        interims.append(text)
+
+    async def on_final(text):
+        finals.append(text)
+
+    await session.start("en-US", on_interim, on_final)
+    return interims, finals
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0.01)
+
+
+def test_first_final_wins_and_the_repeat_is_dropped():
+    async def run():
+        a, b = FakeSTTSession(), FakeSTTSession()
+        session = _hedged(a, b, mode="fanout")
+        _, finals = await _started(session)
+        await session.send_audio(CHUNK)
+        await _settle()
+        await b.on_final("Two coffees please.")
+        await a.on_final("Two coffees, please.")
+        await session.stop()
+        return finals
+
+    assert asyncio.run(run()) == ["Two coffees please."]
+
+
+def test_differently_split_finals_emit_only_the_remainder():
+    async def run():
+        a, b = FakeSTTSession(), FakeSTTSession()
+        session = _hedged(a, b, mode="fanout")
+        _, finals = await _started(session)
+        await a.on_final("Two coffees")
+        await b.on_final("Two coffees and a muffin.")
+        await a.on_final("and a muffin")
+        await session.stop()
+        return finals
+
+    assert asyncio.run(run()) == ["Two coffees", "and a muffin."]
+
+
+def test_genuine_repetition_is_kept():
+    async def run():
+        a, b = FakeSTTSession(), FakeSTTSession()
+        session = _hedged(a, b, mode="fanout")
+        _, finals = await _started(session)
+        await a.on_final("Yes.")
+        await a.on_final("Yes.")
+        await session.stop()
+        return finals
+
+    assert asyncio.run(run()) == ["Yes.", "Yes."]
+
+
+def test_repeat_outside_the_window_is_a_new_utterance():
+    async def run():
+        a, b = FakeSTTSession(), FakeSTTSession()
+        session = _hedged(a, b, mode="fanout", duplicate_window_ms=20)
+        _, finals = await _started(session)
+        await a.on_final("Yes.")
+        await asyncio.sleep(0.05)
+        await b.on_final("Yes.")
+        await session.stop()
+        return finals
+
+    assert asyncio.run(run()) == ["Yes.", "Yes."]
+
+
+def test_interims_follow_the_first_speaker():
+    async def run():
+        a, b = FakeSTTSession(), FakeSTTSession()
+        session = _hedged(a, b, mode="fanout")
+        interims, _ = await _started(session)
+        await b.on_interim("two")
+        await a.on_interim("to")
+        await session.stop()
+        return interims
+
+    assert asyncio.run(run()) == ["two"]
+
+
+def test_late_primary_starts_the_secondary_with_replayed_audio(provider_latency):
+    async def run():
+        a, b = FakeSTTSession(), FakeSTTSession()
+        session = _hedged(a, b, mode="hedge", hedge_after_ms=200)
+        await _started(session)
+        for _ in range(3):
+            await session.send_audio(CHUNK)
+        await _settle()
+        assert not b.started
+        await asyncio.sleep(0.2)
+        await session.send_audio(CHUNK)
+        await _settle()
+        await b.on_interim("hello")
+        await session.stop()
+        return a, b
+
+    a, b = asyncio.run(run())
+    assert len(a.chunks) == len(b.chunks) == 4
+    assert b.stopped
+    assert provider_latency["b"].first_interim.count == 1
+    # Measured from the secondary's own start, not the first audio
+    assert provider_latency["b"].first_interim.total_ms < 150
+
+
+def test_prompt_primary_is_not_hedged():
+    async def run():
+        a, b = FakeSTTSession(), FakeSTTSession()
+        session = _hedged(a, b, mode="hedge", hedge_after_ms=30)
+        await _started(session)
+        await session.send_audio(CHUNK)
+        await a.on_interim("hello")
+        await asyncio.sleep(0.05)
+        await session.stop()
+        return b
+
+    assert not asyncio.run(run()).started
+
+
+def test_failed_primary_fails_over_to_the_secondary():
+    async def run():
+        a, b = FakeSTTSession(fail_after=2), FakeSTTSession()
+        session = _hedged(a, b, mode="hedge", hedge_after_ms=10000)
+        await _started(session)
+        for _ in range(5):
+            await session.send_audio(CHUNK)
+            await _settle()
+        await session.stop()
+        return b
+
+    assert len(asyncio.run(run()).chunks) == 5
+
+
+def test_slow_provider_does_not_hold_back_the_other():
+    async def run():
+        a, b = FakeSTTSession(send_delay=1.0), FakeSTTSession()
+        session = _hedged(a, b, mode="fanout")
+        await _started(session)
+        for _ in range(10):
+            await session.send_audio(CHUNK)
+        await asyncio.sleep(0.1)
+        received = len(b.chunks)
+        a.send_delay = 0
+        await session.stop()
+        return received
+
+    assert asyncio.run(run()) == 10
+
+
+def test_session_fails_when_every_provider_has():
+    async def run():
+        a, b = FakeSTTSession(fail_after=0), FakeSTTSession(fail_after=0)
+        session = _hedged(a, b, mode="fanout")
+        await _started(session)
+        with pytest.raises(ConnectionError):
+            for _ in range(20):
+                await session.send_audio(CHUNK)
+                await _settle()
+        await session.stop()
+
+    asyncio.run(run())
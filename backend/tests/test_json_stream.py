@@ -0,0 +1,66 @@
+import json
+import random
+
+import pytest
+
+from src.shared.json_stream import JSONStreamScanner
+
+DOCUMENTS = [
+    {"metrics": {"anxiety": 7, "stress": 3}, "report": {"summary": "Calm day", "insights": ""}},
+    {"path": "C:\\users\\u", "quote": 'She said "no"', "tab": "a\tb\nc"},
+    {"unicode": "Zkouška č. 5 — ok", "emoji": "pain 😖 today", "escaped": "\\u00e9 is not é"},
+    {"nested": [1, [2.5, None], {"deep": [True, False, "x\\"]}], "empty": {}, "list": []},
+]
+
+
+def _scan(text: str, cuts: list[int]) -> tuple[JSONStreamScanner, list]:
+    scanner = JSONStreamScanner()
+    events = []
+    for start, end in zip([0, *cuts], [*cuts, len(text)]):
+        events.extend(scanner.feed(text[start:end]))
+    return scanner, events
+
+
+def _strings(value, path=()):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _strings(item, (*path, key))
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            yield from _strings(item, (*path, index))
+    elif isinstance(value, str):
+        yield path, value
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_random_chunk_splits(document, ensure_ascii):
+    text = json.dumps(document, ensure_ascii=ensure_ascii)
+    rng = random.Random(f"{text}{ensure_ascii}")
+    for _ in range(200):
+        cuts = sorted(rng.sample(range(1, len(text)), rng.randint(1, min(20, len(text) - 1))))
+        scanner, events = _scan(text, cuts)
+
+        assert scanner.text == text
+        deltas = {}
+        for kind, path, value in events:
+            if kind == "delta":
+                deltas[path] = deltas.get(path, "") + value
+        assert deltas == {path: value for path, value in _strings(document) if value}
+
+        values = {path: json.loads(raw) for kind, path, raw in events if kind == "value"}
+        assert values[()] == document
+        for path, value in _strings(document):
+            assert values[path] == value
+
+
+def test_escaped_backslash_before_u():
+    events = JSONStreamScanner().feed('{"a": "C:\\\\u')
+    assert events == [("delta", ("a",), "C:\\u")]
+
+
+@pytest.mark.parametrize("partial", ['{"a": "x\\u', '{"a": "x\\u00', '{"a": "x\\\\\\u00e', '{"a": "x\\'])
+def test_incomplete_escape_is_held_back(partial):
+    events = JSONStreamScanner().feed(partial)
+    text = "".join(value for kind, _, value in events if kind == "delta")
+    assert text in ("x", "x\\")
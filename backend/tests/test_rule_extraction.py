@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from src.apps.dental.data_models import PeriodontalExam, ToothData
+from src.apps.dental.services import extraction
+from src.apps.dental.services.rule_extraction import extract_with_rules
+
+
+def _pd(tooth: ToothData) -> list[int | None]:
+    return [site.pd for site in tooth.sites.values()]
+
+
+def test_regular_dictation_is_parsed():
+    rules = extract_with_rules("Tooth 17, depths 3-3-3-3-3-3, no bleeding. Tooth 16, depths 4-5-5-3-3-4.")
+    assert rules.remainder == ""
+    assert _pd(rules.teeth["16"]) == [4, 5, 5, 3, 3, 4]
+
+
+@pytest.mark.parametrize("dictation", [
+    "Tooth 11, depths 2-3-4-3-2-3, I mean 2-3-4-3-2-2.",
+    "Tooth 11, depths 2-3-4-3-2-3, sorry, 2-3-4-3-2-2.",
+    "Tooth 11, depths 2-3-4-3-2-3, correction 2-3-4-3-2-2.",
+    "Zahn 11, Sondierungstiefen 2-3-4-3-2-3, nein, 2-3-4-3-2-2.",
+    "Zub 11, hloubky 2-3-4-3-2-3, oprava 2-3-4-3-2-2.",
+    "Zub 11, hloubky 2-3-4-3-2-3, ne, 2-3-4-3-2-2.",
+])
+def test_corrected_tooth_goes_to_llm_whole(dictation):
+    rules = extract_with_rules(f"Tooth 17, depths 3-3-3-3-3-3. {dictation}")
+    assert "11" not in rules.teeth
+    assert rules.remainder == dictation
+    assert _pd(rules.teeth["17"]) == [3] * 6
+
+
+def test_negation_is_not_a_correction():
+    rules = extract_with_rules("Tooth 11, depths 2-3-4-3-2-3, no bleeding.")
+    assert rules.remainder == ""
+    assert [site.bop for site in rules.teeth["11"].sites.values()] == [False] * 6
+
+
+def test_tooth_dictated_twice_goes_to_llm():
+    rules = extract_with_rules("Tooth 11, depths 2-3-4-3-2-3. Tooth 12, depths 3-3-3-3-3-3. Tooth 11, depths 2-2-2-2-2-2.")
+    assert set(rules.teeth) == {"12"}
+    assert rules.remainder == "Tooth 11, depths 2-3-4-3-2-3. Tooth 11, depths 2-2-2-2-2-2."
+
+
+def test_llm_value_stands_for_corrected_tooth(monkeypatch):
+    transcription = "Tooth 16, depths 4-5-5-3-3-4. Tooth 11, depths 2-3-4-3-2-3, I mean 2-3-4-3-2-2."
+    sent = []
+
+    async def llm(text):
+        sent.append(text)
+        corrected = ToothData(tooth_number=11)
+        for site, pd in zip(corrected.sites.values(), [2, 3, 4, 3, 2, 2]):
+            site.pd = pd
+        return PeriodontalExam(raw_transcription=text, teeth={"11": corrected})
+
+    monkeypatch.setattr(extraction, "extract_with_llm_chunked", llm)
+    exam = asyncio.run(extraction.extract_periodontal_data_async(transcription, extract_with_rules(transcription)))
+
+    assert sent == ["Tooth 11, depths 2-3-4-3-2-3, I mean 2-3-4-3-2-2."]
+    assert _pd(exam.teeth["11"]) == [2, 3, 4, 3, 2, 2]
+    assert _pd(exam.teeth["16"]) == [4, 5, 5, 3, 3, 4]
+    assert exam.extraction_notes is None